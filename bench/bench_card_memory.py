@@ -0,0 +1,77 @@
+"""Compares bytes per card of the dict based PokemonCard and the slotted PokemonCardInstance.
+
+Usage: python bench/bench_card_memory.py [--cards 100000]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pokemon_move
+from pokemon_card import PokemonCardDefinition
+from pokemon_card_registry import PokemonCardRegistry
+
+class LegacyPokemonCard:
+    """The PokemonCard class before __slots__, holding definition and game state with a __dict__ and two lists per instance."""
+
+    def __init__(self):
+        self.card_type = None
+        self.name = None
+
+        self.pre_evo = None
+        self.evo_ready = None
+
+        self.health = None
+        self.type = None
+        self.weaknesses = None
+        self.status = None
+
+        self.abilties = []
+        self.moves = []
+
+def bytes_per_card(make_card, count):
+    """Builds count cards and returns the traced bytes allocated per card."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cards = [make_card() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # The list holding the cards is not part of a card
+    return (after - before - sys.getsizeof(cards)) / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    args = parser.parse_args()
+
+    moves = (pokemon_move.PokemonMove("Tackle", ("Colorless",), (), 10),)
+
+    def make_legacy_card():
+        card = LegacyPokemonCard()
+        card.card_type, card.name, card.health, card.type, card.weaknesses = "Pokemon", "Pikachu", 60, "Lightning", "Fighting"
+        card.moves.extend(moves)
+        return card
+
+    definition = PokemonCardDefinition()
+    definition.card_type, definition.name, definition.health, definition.type, definition.weaknesses = "Pokemon", "Pikachu", 60, "Lightning", "Fighting"
+    definition.moves = moves
+
+    registry = PokemonCardRegistry(10)
+    definition_id = registry.add(definition)
+
+    def make_slotted_card():
+        return registry.new_instance(definition_id)
+
+    legacy = bytes_per_card(make_legacy_card, args.cards)
+    slotted = bytes_per_card(make_slotted_card, args.cards)
+
+    print(f"cards:    {args.cards}")
+    print(f"dict:     {legacy:.0f} bytes/card")
+    print(f"instance: {slotted:.0f} bytes/card ({legacy / slotted:.2f}x smaller)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compares lines per second of the legacy nested split move parser and pokemon_line_parser.
+
+Usage: python bench/bench_line_parser.py [--lines 1000000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pokemon_move
+from pokemon_file_reader import PokemonFileReader
+
+TYPES = ["Fire", "Fighting", "Lightning", "Water", "Grass", "Psychic", "Metal", "Darkness", "Dragon", "Colorless"]
+
+def synthetic_move_lines(count, seed=0):
+    """Returns count valid move lines with random names, energies and damage."""
+    rng = random.Random(seed)
+    lines = []
+
+    for i in range(count):
+        energies = "; ".join(rng.choice(TYPES) for _ in range(rng.randint(1, 4)))
+        lines.append(f"Move Name: Move {i}, Energies: {energies}, Damage: {rng.randint(0, 25) * 10}, Effect Function: None\n")
+
+    return lines
+
+def legacy_read_move(types, move_text):
+    """The nested split move parser that read_move used before pokemon_line_parser, without effect lookup."""
+    move_elements = move_text.split(", ")
+
+    if len(move_elements) != 4:
+        return None
+
+    move_name_split = move_elements[0].split("Move Name:")
+
+    if len(move_name_split) != 2 or len(move_name_split[1].strip()) == 0:
+        return None
+
+    name = move_name_split[1].strip()
+
+    move_energy_split = move_elements[1].split("Energies:")
+
+    if len(move_energy_split) != 2:
+        return None
+
+    energy_list = []
+
+    if move_energy_split[1].strip() != "None":
+        for energy in move_energy_split[1].strip().split(";"):
+            energy = energy.strip()
+
+            if energy not in types:
+                return None
+
+            energy_list.append(energy)
+
+
+    move_damage_split = move_elements[2].split("Damage:")
+
+    if len(move_damage_split) != 2 or not move_damage_split[1].strip().isdigit():
+        return None
+
+    damage = int(move_damage_split[1].strip())
+
+    move_effect_split = move_elements[3].split("Effect Function:")
+
+    if len(move_effect_split) != 2:
+        return None
+
+    return pokemon_move.PokemonMove(name, energy_list, (), damage, None)
+
+def lines_per_second(parse, lines):
+    """Parses every line and returns the number of lines parsed per second."""
+    start = time.perf_counter()
+
+    for line in lines:
+        parse(line)
+
+    return len(lines) / (time.perf_counter() - start)
+
+def new_reader():
+    """Returns a reader with the benchmark's types and nothing cached."""
+    reader = PokemonFileReader()
+    reader.types = set(TYPES)
+
+    return reader
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each parser, alternating, the best is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    reader = new_reader()
+    lines = synthetic_move_lines(args.lines)
+
+    for new, old in zip(map(reader.read_move, lines[:1000]), (legacy_read_move(reader.types, line) for line in lines[:1000])):
+        assert new == old
+
+    old_rate = new_rate = 0
+
+    # Each run reads the lines once with a new reader, like reading a file
+    for _ in range(args.repeat):
+        old_rate = max(old_rate, lines_per_second(lambda line: legacy_read_move(reader.types, line), lines))
+        new_rate = max(new_rate, lines_per_second(new_reader().read_move, lines))
+
+    print(f"lines:    {args.lines}")
+    print(f"legacy:   {old_rate:,.0f} lines/s")
+    print(f"parser:   {new_rate:,.0f} lines/s ({new_rate / old_rate:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Measures the file reader and emulator hot paths and writes the results as JSON.
+
+Covers read_move and read_ability lines per second, read_all_moves and read_all_abilities on
+synthetic files, emulator clone cost, coin flips per second and full games per second on
+reference decks. The JSON holds machine info, so runs can be compared; --compare prints each
+result against an earlier JSON file. --profile also plays the games with a profiler, prints the
+time per phase and writes it as a pstats file.
+
+Usage: python bench/run_benchmarks.py [--output bench_results.json] [--sizes 1000 1000000] [--compare old.json] [--profile games.prof]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bench_line_parser import TYPES, synthetic_move_lines
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_coin import PokemonCoin
+from pokemon_file_reader import PokemonFileReader
+from pokemon_parse_cache import CACHE_SIZE
+from pokemon_profiler import PokemonProfiler
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+FILE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT = 5
+
+# Reference card pool and decks the game benchmarks are played with
+REFERENCE_MOVES = [
+    "Move Name: Gnaw, Energies: Lightning, Damage: 20, Effect Function: None",
+    "Move Name: Thunder Shock, Energies: Lightning; Lightning, Damage: 60, Effect Function: None",
+    "Move Name: Low Kick, Energies: Fighting, Damage: 20, Effect Function: None",
+    "Move Name: Seismic Toss, Energies: Fighting; Fighting; Colorless, Damage: 90, Effect Function: None",
+    "Move Name: Ember, Energies: Fire, Damage: 30, Effect Function: None",
+    "Move Name: Flamethrower, Energies: Fire; Fire; Colorless, Damage: 110, Effect Function: None",
+]
+REFERENCE_CARDS = [
+    "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Lightning, Weakness: Fighting, Abilities: None, Moves: Gnaw",
+    "Card Name: Raichu, Card Type: Pokemon, Pre Evolution: Pikachu, Health: 120, Type: Lightning, Weakness: Fighting, Abilities: None, Moves: Thunder Shock",
+    "Card Name: Machop, Card Type: Pokemon, Pre Evolution: None, Health: 70, Type: Fighting, Weakness: Psychic, Abilities: None, Moves: Low Kick",
+    "Card Name: Machamp, Card Type: Pokemon, Pre Evolution: Machop, Health: 150, Type: Fighting, Weakness: Psychic, Abilities: None, Moves: Seismic Toss",
+    "Card Name: Charmander, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Fire, Weakness: Water, Abilities: None, Moves: Ember",
+    "Card Name: Charizard ex, Card Type: Pokemon, Pre Evolution: Charmander, Health: 180, Type: Fire, Weakness: Water, Abilities: None, Moves: Flamethrower",
+]
+REFERENCE_DECKS = {
+    "Lightning": ["Pikachu"] * 12 + ["Raichu"] * 8,
+    "Fighting": ["Machop"] * 12 + ["Machamp"] * 8,
+    "Fire": ["Charmander"] * 12 + ["Charizard ex"] * 8,
+}
+
+def synthetic_ability_lines(count, seed=0):
+    """Returns count valid ability lines with random names and kinds."""
+    rng = random.Random(seed)
+
+    return [f"Ability Name: Ability {i}, Type: {rng.choice(('Active', 'Passive'))}, Activation Function: None, Effect Function: None\n" for i in range(count)]
+
+def machine_info():
+    """Returns a dictionary describing the machine, interpreter and commit the benchmarks ran on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "commit": commit,
+    }
+
+def best_rate(run, operations, repeat=REPEAT):
+    """Calls run repeat times and returns the best number of operations per second."""
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return operations / best
+
+def result(value, unit, **parameters):
+    """Returns the JSON entry of one measurement."""
+    return {"value": value, "unit": unit, "parameters": parameters}
+
+def new_reader(cache_size=CACHE_SIZE):
+    """Returns a reader that knows TYPES, with the default parse cache unless cache_size is given."""
+    reader = PokemonFileReader(cache_size=cache_size)
+    reader.types = set(TYPES)
+
+    for name in TYPES:
+        reader.type_table.add(name)
+
+    return reader
+
+def bench_read_lines(lines):
+    """Measures read_move and read_ability lines per second with the default parse cache, which
+    misses on every line when there are more lines than it holds, and with the cache off and
+    large enough to hit on every line."""
+    move_lines = synthetic_move_lines(lines)
+    ability_lines = synthetic_ability_lines(lines)
+    reader = new_reader()
+    uncached = new_reader(cache_size=0)
+    cached = new_reader(cache_size=lines)
+
+    return {
+        "read_move": result(best_rate(lambda: [reader.read_move(line) for line in move_lines], lines), "lines/s", lines=lines, cache_size=CACHE_SIZE),
+        "read_ability": result(best_rate(lambda: [reader.read_ability(line) for line in ability_lines], lines), "lines/s", lines=lines, cache_size=CACHE_SIZE),
+        "read_move_uncached": result(best_rate(lambda: [uncached.read_move(line) for line in move_lines], lines), "lines/s", lines=lines, cache_size=0),
+        "read_move_cached": result(best_rate(lambda: [cached.read_move(line) for line in move_lines], lines), "lines/s", lines=lines, cache_size=lines),
+    }
+
+def bench_read_all(sizes):
+    """Measures read_all_moves and read_all_abilities on synthetic standard files of each size."""
+    results = dict()
+    working_directory = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        try:
+            Path("pokemon_standard_types.txt").write_text("\n".join(TYPES))
+
+            for size in sizes:
+                Path("pokemon_standard_moves.txt").write_text("".join(synthetic_move_lines(size)))
+                Path("pokemon_standard_abilities.txt").write_text("".join(synthetic_ability_lines(size)))
+                repeat = 1 if size >= 100_000 else REPEAT
+
+                def read(kind):
+                    reader = PokemonFileReader()
+                    reader.read_all_types()
+                    getattr(reader, f"read_all_{kind}")()
+
+                results[f"read_all_moves[{size}]"] = result(best_rate(lambda: read("moves"), size, repeat), "lines/s", lines=size)
+                results[f"read_all_abilities[{size}]"] = result(best_rate(lambda: read("abilities"), size, repeat), "lines/s", lines=size)
+        finally:
+            os.chdir(working_directory)
+
+    return results
+
+def reference_registry():
+    """Reads the reference card pool into a registry."""
+    reader = new_reader()
+
+    for line in REFERENCE_MOVES:
+        move = reader.read_move(line)
+        reader.moves[move.name] = move
+
+    for line in REFERENCE_CARDS:
+        card = reader.read_card(line)
+        reader.cards[card.name] = card
+
+    return PokemonCardRegistry.from_reader(reader)
+
+def reference_decks(registry):
+    """Returns the reference decks as lists of definition ids, by deck name."""
+    return {name: [registry.id_of(card) for card in cards] for name, cards in REFERENCE_DECKS.items()}
+
+def bench_clone(registry, clones):
+    """Measures clones per second of an emulator a few turns into a reference game."""
+    decks = list(reference_decks(registry).values())
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.start_game(decks[0], decks[1])
+
+    for _ in range(6):
+        emulator.play_turn()
+
+    return {"clone": result(best_rate(lambda: [emulator.clone() for _ in range(clones)], clones), "clones/s", clones=clones)}
+
+def bench_coin(flips):
+    """Measures single and batched coin flips per second."""
+    coin = PokemonCoin(1)
+
+    return {
+        "flip_coin": result(best_rate(lambda: [coin.flip_coin() for _ in range(flips)], flips), "flips/s", flips=flips),
+        "flip_many": result(best_rate(lambda: [coin.flip_many(64) for _ in range(flips // 64)], flips // 64 * 64), "flips/s", flips=flips),
+    }
+
+def bench_games(registry, games):
+    """Measures full heuristic games per second between every pair of reference decks."""
+    decks = list(reference_decks(registry).values())
+    pairings = [(first, second) for first in decks for second in decks if first is not second]
+
+    def play():
+        for game in range(games):
+            first, second = pairings[game % len(pairings)]
+            PokemonTCGPocketEmulator(registry, game).play_game(first, second)
+
+    return {"play_game": result(best_rate(play, games), "games/s", games=games, decks=sorted(REFERENCE_DECKS))}
+
+def profile_games(registry, games, path):
+    """Plays the reference games with a profiler, prints its report and writes it to path as a pstats file."""
+    decks = list(reference_decks(registry).values())
+    pairings = [(first, second) for first in decks for second in decks if first is not second]
+    profiler = PokemonProfiler()
+
+    for game in range(games):
+        emulator = PokemonTCGPocketEmulator(registry, game)
+        emulator.enable_profiling(profiler)
+        emulator.play_game(*pairings[game % len(pairings)])
+
+    print(profiler.format_report())
+    profiler.dump_stats(path)
+
+def compare(results, previous):
+    """Prints each result next to the same result of an earlier run."""
+    for name, entry in results.items():
+        old = previous.get("results", {}).get(name)
+
+        if old is None or old["value"] == 0:
+            print(f"{name:<28} {entry['value']:>14,.0f} {entry['unit']:<9} (new)")
+        else:
+            print(f"{name:<28} {entry['value']:>14,.0f} {entry['unit']:<9} {entry['value'] / old['value']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json", help="JSON file the results are written to")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(FILE_SIZES), help="line counts of the synthetic files")
+    parser.add_argument("--lines", type=int, default=20_000, help="lines per read_move and read_ability measurement")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare with")
+    parser.add_argument("--profile", default=None, help="pstats file the phase times of the reference games are written to")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    registry = reference_registry()
+    results = dict()
+    results.update(bench_read_lines(args.lines))
+    results.update(bench_read_all(args.sizes))
+    results.update(bench_clone(registry, 10_000))
+    results.update(bench_coin(1_000_000))
+    results.update(bench_games(registry, args.games))
+
+    report = {"machine": machine_info(), "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(), "results": results}
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as file:
+            compare(results, json.load(file))
+    else:
+        compare(results, {})
+
+    if args.profile is not None:
+        profile_games(registry, args.games, args.profile)
+
+if __name__ == "__main__":
+    main()
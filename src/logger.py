@@ -1,17 +1,170 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+
+LOG_FILE = "app.log"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 3
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Most records the listener of asynchronous mode writes before flushing the log file
+BATCH_SIZE = 256
+
+# Shared output of every logger from get_logger, created by configure_logging
+settings = {"levels": dict(), "options": dict(), "handler": None, "listener": None}
+loggers = dict()
+
+class BatchFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that can write a batch of records with a single flush.
+
+    Attributes:
+        batching: A boolean that is True while a batch is written, flush does nothing until it ends.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the handler like a logging.handlers.RotatingFileHandler."""
+        super().__init__(*args, **kwargs)
+        self.batching = False
+
+    def flush(self):
+        if not self.batching:
+            super().flush()
+
+    def handle_batch(self, records):
+        """Writes every record at or above the handler's level, then flushes once."""
+        self.batching = True
+
+        try:
+            for record in records:
+                if record.levelno >= self.level:
+                    self.handle(record)
+        finally:
+            self.batching = False
+            self.flush()
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """Queue listener that hands its handlers the records in batches instead of one at a time.
+
+    A batch ends when the queue is empty or batch_size records are taken, so records are written
+    as soon as the loggers pause, and a burst of records costs one flush per batch instead of one
+    per record.
+
+    Attributes:
+        batch_size: An int that holds the most records in a batch.
+        batch: A list of the records taken from the queue and not written yet.
+    """
+
+    def __init__(self, records, *handlers, batch_size=BATCH_SIZE):
+        """Initializes the listener with BatchFileHandler handlers, each only given the records at or above its level."""
+        super().__init__(records, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.batch = []
+
+    def handle(self, record):
+        self.batch.append(self.prepare(record))
+
+        if len(self.batch) >= self.batch_size or self.queue.empty():
+            self.write_batch()
+
+    def write_batch(self):
+        """Writes and clears the current batch."""
+        batch, self.batch = self.batch, []
+
+        for handler in self.handlers:
+            handler.handle_batch(batch)
+
+    def stop(self):
+        """Stops the thread, then writes the records still in the batch."""
+        super().stop()
+        self.write_batch()
+
+def configure_logging(levels=None, asynchronous=False, path=LOG_FILE, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+    """Sets up the output and levels of every logger from get_logger.
+
+    Records go to a size capped log file that rotates into backup_count old files. In asynchronous
+    mode loggers only put records on a queue, and a BatchQueueListener thread formats them and
+    writes them to the file in batches, so logging does not block on disk writes. Loggers already
+    created are moved to the new output and levels.
+
+    The listener thread only runs in this process, so process pool workers set up their own
+    logging with configure_worker_logging.
+
+    Args:
+        levels: A dictionary of logger name -> level, for example {"tcg_pocket_emulator": logging.WARNING}
+            so that hot simulation code skips lower records before any formatting. Loggers that are
+            not listed log at DEBUG.
+        asynchronous: A boolean, True, to write through a queue and a background thread.
+        path: A string that holds the path of the log file.
+        max_bytes: An int that holds the size the log file rotates at, 0 to never rotate.
+        backup_count: An int that holds the number of rotated log files kept.
+    """
+    stop_logging()
+
+    file_handler = BatchFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    if asynchronous:
+        records = queue.SimpleQueue()
+        settings["handler"] = logging.handlers.QueueHandler(records)
+        settings["listener"] = BatchQueueListener(records, file_handler)
+        settings["listener"].start()
+    else:
+        settings["handler"] = file_handler
+
+    settings["levels"] = dict(levels or {})
+    settings["options"] = {"levels": settings["levels"], "path": str(path), "max_bytes": max_bytes, "backup_count": backup_count}
+
+    for name, logger in loggers.items():
+        logger.handlers.clear()
+        logger.addHandler(settings["handler"])
+        logger.setLevel(settings["levels"].get(name, logging.DEBUG))
+
+def stop_logging():
+    """Writes out queued records and stops the background thread of asynchronous mode, if it is running.
+
+    The output is removed from every logger, so no record is put on a queue nobody reads, until
+    configure_logging is called again or get_logger sets the same output up again.
+    """
+    if settings["listener"] is not None:
+        settings["listener"].stop()
+        settings["listener"] = None
+
+    if settings["handler"] is not None:
+        for logger in loggers.values():
+            logger.removeHandler(settings["handler"])
+
+        settings["handler"].close()
+        settings["handler"] = None
+
+def logging_options():
+    """Returns the options of the current setup, to hand to configure_worker_logging in a process pool initializer."""
+    return dict(settings["options"])
+
+def configure_worker_logging(options=None):
+    """Sets up logging in a process pool worker, writing synchronously to the same log file.
+
+    A forked worker inherits the QueueHandler of asynchronous mode but not the listener thread, so
+    its records would stay on a queue nobody reads, and a spawned worker starts without any setup.
+
+    Args:
+        options: A dictionary from logging_options in the parent process, the worker's own current options if None.
+    """
+    configure_logging(asynchronous=False, **(settings["options"] if options is None else options))
+
+atexit.register(stop_logging)
 
 def get_logger(name):
     logger = logging.getLogger(name)
 
-    if not logger.hasHandlers():
-        logger.setLevel(logging.DEBUG)
-
-        file_handler = logging.FileHandler("app.log")
-        file_handler.setLevel(logging.DEBUG)
+    if settings["handler"] is None:
+        configure_logging(**settings["options"])
 
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
+    if name not in loggers:
 
-        logger.addHandler(file_handler)
+        logger.setLevel(settings["levels"].get(name, logging.DEBUG))
+        logger.addHandler(settings["handler"])
+        loggers[name] = logger
 
-    return logger
\ No newline at end of file
+    return logger
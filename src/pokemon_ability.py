@@ -1,21 +1,63 @@
+# Parts of the game state an activation condition can depend on
+STATE_PARTS = frozenset(("active", "bench", "energy", "health", "hand", "coin", "points", "turn"))
+
+def depends_on(*parts):
+    """Declares the parts of the game state an activation condition reads, for example @depends_on("energy", "hand").
+
+    The emulator only calls the condition again after one of those parts changes; conditions
+    without a declaration are called again after any change.
+
+    Raises:
+        ValueError: A part is not in STATE_PARTS.
+    """
+    unknown = set(parts) - STATE_PARTS
+
+    if len(unknown) > 0:
+        raise ValueError(f"Unknown state parts: {', '.join(sorted(unknown))}")
+
+    def declare(function):
+        function.depends_on = frozenset(parts)
+        return function
+
+    return declare
+
 class PokemonAbility:
     """Holds data for a single pokemon move.
 
+    Abilities are read-only once created, since the reader returns the same ability for every
+    line with the same text and every card with the ability shares it. Whether an ability can be
+    used during a game is kept by the emulator, see pokemon_action_index.
+
     Attributes:
         name: A string that holds ability name
         passive: A boolean that is True if ability is passive, False if it is active
         activation_condition: A function that returns True if ability can be used at the current state, else False
-        usable: A boolean that is True if the ability can be used at the current state
+        usable: A boolean that is True if the ability could be used when it was read, always False for read abilities
         effect: A function that does the effect of the ability
+        depends_on: A frozenset of the STATE_PARTS the activation condition depends on, None if it may depend on anything
     """
 
-    def __init__(self):
-        """Initializes the instance with default values."""
-        self.name = None
-        self.passive = None
-        self.activation_condition = None
-        self.usable = None
-        self.effect = None 
+    __slots__ = ("name", "passive", "activation_condition", "usable", "effect", "depends_on")
+
+    def __init__(self, name=None, passive=None, activation_condition=None, usable=None, effect=None, depends_on=None):
+        """Initializes the instance with the given values."""
+        set_slot = object.__setattr__
+        set_slot(self, "name", name)
+        set_slot(self, "passive", passive)
+        set_slot(self, "activation_condition", activation_condition)
+        set_slot(self, "usable", usable)
+        set_slot(self, "effect", effect)
+        set_slot(self, "depends_on", depends_on)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"PokemonAbility is read-only, cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"PokemonAbility is read-only, cannot delete {name}")
+
+    def __reduce__(self):
+        """Pickles and copies the ability through __init__, since its attributes cannot be set."""
+        return PokemonAbility, (self.name, self.passive, self.activation_condition, self.usable, self.effect, self.depends_on)
 
     def __eq__(self, other):
         """Compares contents of self with contents of other ability.
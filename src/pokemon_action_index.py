@@ -0,0 +1,256 @@
+from array import array
+import pokemon_ability
+import pokemon_profiler
+
+# Kinds of action, stored in the high bits of an action id
+END_TURN = 0
+ATTACK = 1
+ATTACH_ENERGY = 2
+BENCH = 3
+EVOLVE = 4
+USE_ABILITY = 5
+
+ACTION_NAMES = ("End Turn", "Attack", "Attach Energy", "Bench", "Evolve", "Use Ability")
+
+# Number of bits of an action id that hold its argument, the kinds take the other 3 bits of the
+# 16 bit ids pokemon_action_log stores, so EVOLVE fits hands of up to 2048 cards with a full bench
+ARGUMENT_BITS = 13
+ARGUMENT_MASK = (1 << ARGUMENT_BITS) - 1
+
+# Parts of the state the evolutions of a player depend on: the hand cards, the pokemon in each
+# slot and whether they can evolve, which changes when a turn ends
+EVOLUTION_PARTS = frozenset(("hand", "active", "bench", "turn"))
+
+def encode_action(kind, argument=0):
+    """Packs a kind of action and its argument into one int action id.
+
+    The argument is the move index for ATTACK, the board slot for ATTACH_ENERGY and
+    USE_ABILITY, the hand index for BENCH and hand index * slot_count + slot for EVOLVE, see
+    evolve_argument.
+
+    Raises:
+        ValueError: The argument does not fit in ARGUMENT_BITS bits.
+    """
+    if not 0 <= argument <= ARGUMENT_MASK:
+        raise ValueError(f"Action argument {argument} does not fit in {ARGUMENT_BITS} bits")
+
+    return kind << ARGUMENT_BITS | argument
+
+def decode_action(action):
+    """Returns the (kind, argument) of an action id."""
+    return action >> ARGUMENT_BITS, action & ARGUMENT_MASK
+
+def evolve_argument(hand_index, slot, slot_count):
+    """Returns the argument of an EVOLVE action."""
+    return hand_index * slot_count + slot
+
+class PokemonActionIndex:
+    """Enumerates the legal actions of the current player of a PokemonTCGPocketEmulator.
+
+    Per definition facts are computed once when the index is created: which definitions are
+    basic pokemon, which definition each one evolves from and which of their abilities are
+    active. Which moves a pokemon can pay for is cached by definition id and attached energy,
+    since the same pairs come up again and again, so a pokemon's moves are only checked against
+    its energy the first time that pair is seen.
+
+    Activation conditions are called as activation_condition(emulator, player, slot) and ability
+    effects as effect(emulator, player, slot). Whether a pokemon's abilities are usable is cached
+    until a part of the state its conditions depend on changes (see pokemon_ability.depends_on),
+    or a different pokemon is put in its slot, so conditions are not called again after every
+    action. The evolutions of each player are likewise kept until the hand or board changes, see
+    EVOLUTION_PARTS.
+
+    Attributes:
+        emulator: The PokemonTCGPocketEmulator whose actions are listed.
+        is_basic: A list of booleans, indexed by definition id, True for cards without a pre evolution.
+        evolves_from: A list of the definition id each definition evolves from, indexed by definition id, None for basic cards.
+        active_abilities: A list, indexed by definition id, of tuples of the definition's active abilities.
+        affordable: A dictionary of (definition id, energy tuple) -> int bitmask of the moves that can be paid for.
+        usable: A dictionary of (player, slot) -> (card instance, boolean), True if the card in the slot had
+            a usable active ability when it was last checked; removed when a part it depends on changes.
+        dependents: A dictionary of state part -> set of (player, slot) whose usable entry depends on it.
+        evolution_pairs: A dictionary of player -> list of (hand index, slot) pairs from evolutions, removed
+            when a part in EVOLUTION_PARTS changes.
+        evaluations: An int that holds the number of activation conditions called.
+    """
+
+    def __init__(self, emulator):
+        """Initializes the index and its per definition tables from the emulator's registry."""
+        self.emulator = emulator
+        self.is_basic = []
+        self.evolves_from = []
+        self.active_abilities = []
+        self.affordable = dict()
+        self.usable = dict()
+        self.dependents = {part: set() for part in pokemon_ability.STATE_PARTS}
+        self.evolution_pairs = dict()
+        self.evaluations = 0
+
+        if emulator.registry is None:
+            return
+
+        for definition in emulator.registry.definitions:
+            self.is_basic.append(definition.pre_evo is None)
+            self.evolves_from.append(emulator.registry.id_of(definition.pre_evo) if definition.pre_evo is not None else None)
+            self.active_abilities.append(tuple(ability for ability in definition.abilties or () if not ability.passive))
+
+    def copy_for(self, emulator):
+        """Returns an index for a copy of the emulator that shares this index's per definition tables and affordable cache."""
+        copy = PokemonActionIndex.__new__(PokemonActionIndex)
+        copy.emulator = emulator
+        copy.is_basic = self.is_basic
+        copy.evolves_from = self.evolves_from
+        copy.active_abilities = self.active_abilities
+        copy.affordable = self.affordable
+        copy.usable = dict()
+        copy.dependents = {part: set() for part in pokemon_ability.STATE_PARTS}
+        copy.evolution_pairs = dict()
+        copy.evaluations = 0
+
+        return copy
+
+    def affordable_moves(self, card):
+        """Returns an int bitmask of the moves of a card instance that its attached energy can pay for."""
+        key = (card.definition_id, card.energy)
+        mask = self.affordable.get(key)
+
+        if mask is None:
+            type_table = self.emulator.registry.type_table
+            moves = self.emulator.registry.get(card.definition_id).moves
+            mask = 0
+
+            for index, move in enumerate(moves):
+                if type_table.can_pay(move.energy_cost, card.energy):
+                    mask |= 1 << index
+
+            self.affordable[key] = mask
+
+        return mask
+
+    def state_changed(self, part):
+        """Marks the usable entries and evolutions that depend on a part of the state as out of date, every entry if part is None."""
+        if part is None:
+            self.usable.clear()
+            self.evolution_pairs.clear()
+            return
+
+        if part in EVOLUTION_PARTS:
+            self.evolution_pairs.clear()
+
+        for key in self.dependents[part]:
+            self.usable.pop(key, None)
+
+        self.dependents[part].clear()
+
+    def usable_abilities(self, player, slot):
+        """Returns True if the pokemon in a slot has an active ability whose activation condition is true, else False."""
+        card = self.emulator.slot(player, slot)
+        entry = self.usable.get((player, slot))
+
+        if entry is not None and entry[0] is card:
+            return entry[1]
+
+        usable = False
+
+        for ability in self.active_abilities[card.definition_id]:
+            for part in ability.depends_on if ability.depends_on is not None else pokemon_ability.STATE_PARTS:
+                self.dependents[part].add((player, slot))
+
+            if ability.activation_condition is None:
+                usable = True
+                break
+
+            self.evaluations += 1
+
+            if self.emulator.profiler is None:
+                condition = ability.activation_condition(self.emulator, player, slot)
+            else:
+                condition = self.emulator.profiler.call(pokemon_profiler.ABILITY_CHECK, ability.activation_condition, self.emulator, player, slot)
+
+            if condition:
+                usable = True
+                break
+
+        self.usable[(player, slot)] = (card, usable)
+
+        return usable
+
+    def evolutions(self, player):
+        """Returns a list of (hand index, slot) pairs where the hand card can evolve the pokemon in the slot.
+
+        The list is kept in self.evolution_pairs until the hand or board changes and must not be changed.
+        """
+        pairs = self.evolution_pairs.get(player)
+
+        if pairs is not None:
+            return pairs
+
+        emulator = self.emulator
+        pairs = self.evolution_pairs[player] = []
+        slot_count = 1 + len(emulator.bench(player))
+        targets = [(slot, emulator.slot(player, slot)) for slot in range(slot_count)]
+
+        for hand_index, card in enumerate(emulator.hand(player)):
+            pre_evo = self.evolves_from[card.definition_id]
+
+            if pre_evo is None:
+                continue
+
+            for slot, target in targets:
+                if target is not None and target.evo_ready and target.definition_id == pre_evo:
+                    pairs.append((hand_index, slot))
+
+        return pairs
+
+    def legal_actions(self):
+        """Lists every action the current player can take.
+
+        Returns:
+            An array.array of int action ids, see encode_action, empty if the game is over. END_TURN
+            is always last.
+        """
+        emulator = self.emulator
+        actions = array("i")
+
+        if emulator.finished:
+            return actions
+
+        player = emulator.current_player
+        active = emulator.active(player)
+        bench = emulator.bench(player)
+        slot_count = 1 + len(bench)
+
+        if active is not None and emulator.active(1 - player) is not None:
+            mask = self.affordable_moves(active)
+            index = 0
+
+            while mask:
+                if mask & 1:
+                    actions.append(encode_action(ATTACK, index))
+
+                mask >>= 1
+                index += 1
+
+        for slot in range(slot_count):
+            card = emulator.slot(player, slot)
+
+            if card is None:
+                continue
+
+            if not emulator.energy_attached:
+                actions.append(encode_action(ATTACH_ENERGY, slot))
+
+            if slot not in emulator.abilities_used and self.usable_abilities(player, slot):
+                actions.append(encode_action(USE_ABILITY, slot))
+
+        if None in bench:
+            for hand_index, card in enumerate(emulator.hand(player)):
+                if self.is_basic[card.definition_id]:
+                    actions.append(encode_action(BENCH, hand_index))
+
+        for hand_index, slot in self.evolutions(player):
+            actions.append(encode_action(EVOLVE, evolve_argument(hand_index, slot, slot_count)))
+
+        actions.append(encode_action(END_TURN))
+
+        return actions
@@ -0,0 +1,102 @@
+import struct
+from array import array
+
+MAGIC = b"PTCL"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sBB")
+SEED = struct.Struct("<Q")
+COUNT = struct.Struct("<I")
+
+# Flags in the header
+FLAG_SEED = 1
+
+class PokemonActionLog:
+    """Compact record of one game: its seed, both decks and every action and coin flip in order.
+
+    Actions are the action ids of pokemon_action_index, which fit in 16 bits, and each coin flip
+    is one 0 or 1, so a game of a few hundred actions takes well under a kilobyte. Together with
+    the registry the game was played with, the log is enough to play the game again, see
+    pokemon_replay.
+
+    Attributes:
+        seed: The seed of the emulator that played the game.
+        decks: A list of both players' decks in their shuffled order, each a list of definition ids, top card first, None before the game starts.
+        actions: An array.array of the action ids taken, in order.
+        flips: An array.array with one 0 (tails) or 1 (heads) per coin flip, in order.
+    """
+
+    def __init__(self, seed=None, decks=None, actions=None, flips=None):
+        """Initializes the log with the given values."""
+        self.seed = seed
+        self.decks = decks
+        self.actions = array("H") if actions is None else actions
+        self.flips = array("B") if flips is None else flips
+
+    def __len__(self):
+        return len(self.actions)
+
+    def to_bytes(self):
+        """Encodes the log as bytes that from_bytes reads back.
+
+        Raises:
+            ValueError: The seed is not an unsigned 64 bit int or None, or the game has not started.
+        """
+        if self.decks is None:
+            raise ValueError("Cannot encode the log of a game that has not started")
+
+        if self.seed is not None and not (isinstance(self.seed, int) and 0 <= self.seed < 1 << 64):
+            raise ValueError(f"Cannot encode seed {self.seed!r}, only unsigned 64 bit ints are supported")
+
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_SEED if self.seed is not None else 0)]
+
+        if self.seed is not None:
+            parts.append(SEED.pack(self.seed))
+
+        for values, typecode in ((self.decks[0], "H"), (self.decks[1], "H"), (self.actions, "H"), (self.flips, "B")):
+            parts.append(COUNT.pack(len(values)))
+            parts.append(array(typecode, values).tobytes())
+
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodes a log encoded by to_bytes.
+
+        Raises:
+            ValueError: The data is not an encoded log, has an unknown version or is cut short.
+        """
+        view = memoryview(data)
+
+        try:
+            magic, version, flags = HEADER.unpack_from(view, 0)
+            offset = HEADER.size
+
+            if magic != MAGIC:
+                raise ValueError("Data is not an encoded action log")
+
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unknown action log version {version}")
+
+            seed = None
+
+            if flags & FLAG_SEED:
+                seed = SEED.unpack_from(view, offset)[0]
+                offset += SEED.size
+
+            values = []
+
+            for typecode in ("H", "H", "H", "B"):
+                count = COUNT.unpack_from(view, offset)[0]
+                offset += COUNT.size
+                size = count * array(typecode).itemsize
+
+                if offset + size > len(view):
+                    raise ValueError("Action log is cut short")
+
+                values.append(array(typecode, view[offset:offset + size].tobytes()))
+                offset += size
+        except struct.error as error:
+            raise ValueError(f"Action log is cut short: {error}") from error
+
+        return cls(seed, [values[0].tolist(), values[1].tolist()], values[2], values[3])
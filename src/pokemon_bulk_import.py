@@ -0,0 +1,163 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pokemon_effect_resolver
+import pokemon_error_report
+import pokemon_file_reader
+from logger import configure_worker_logging, get_logger, logging_options
+
+CHUNK_SIZE = 2000
+
+# File name endings of each kind of data file
+FILE_KINDS = {"_types.txt": "types", "_moves.txt": "moves", "_abilities.txt": "abilities", "_cards.txt": "cards"}
+
+# Reader of a worker process, created once by init_worker with the effect functions already indexed
+worker_reader = None
+
+def find_files(sources):
+    """Finds the data files of each kind in directories, glob patterns or file paths.
+
+    Files are returned in the order their entries are applied, so a later entry overrides an
+    earlier one with the same name: files with "standard" in their name first, then every other
+    file, each group sorted by path.
+
+    Args:
+        sources: A string, or list of strings, each a directory, a glob pattern or a file path.
+
+    Returns:
+        A dictionary of kind ("types", "moves", "abilities" or "cards") -> list of paths.
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+
+    paths = set()
+
+    for source in sources:
+        if Path(source).is_dir():
+            paths.update(str(path) for path in Path(source).glob("*.txt"))
+        else:
+            paths.update(glob.glob(str(source)))
+
+    files = {kind: [] for kind in FILE_KINDS.values()}
+
+    for path in sorted(paths, key=lambda path: ("standard" not in Path(path).name, path)):
+        for ending, kind in FILE_KINDS.items():
+            if path.endswith(ending):
+                files[kind].append(path)
+
+    return files
+
+def read_chunks(paths, chunk_size=CHUNK_SIZE):
+    """Splits files into chunks of lines.
+
+    Yields:
+        A tuple of the file path, the line number of the chunk's first line and a list of at most chunk_size lines.
+    """
+    for path in paths:
+        with open(path, 'r') as file:
+            lines = []
+            first_line = 1
+
+            for line in file:
+                lines.append(line)
+
+                if len(lines) == chunk_size:
+                    yield path, first_line, lines
+                    first_line += len(lines)
+                    lines = []
+
+            if len(lines) > 0:
+                yield path, first_line, lines
+
+def create_reader(type_names):
+    """Creates a reader that knows the given types and has every effect module indexed."""
+    reader = pokemon_file_reader.PokemonFileReader()
+
+    for name in type_names:
+        reader.types.add(name)
+        reader.type_table.add(name)
+
+    for module_names in (pokemon_effect_resolver.MOVE_EFFECT_MODULES, pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES, pokemon_effect_resolver.ABILITY_EFFECT_MODULES):
+        reader.effect_resolver.index_modules(module_names)
+
+    return reader
+
+def init_worker(type_names, log_options=None):
+    """Process pool initializer, sets up the worker's logging, see logger.configure_worker_logging, and builds the worker's reader and effect function index once."""
+    global worker_reader
+    configure_worker_logging(log_options)
+    worker_reader = create_reader(type_names)
+
+def read_chunk(kind, path, first_line, lines, reader=None):
+    """Reads a chunk of move or ability lines with the worker's reader.
+
+    Returns:
+        A list of the record, or pokemon_error_report.PokemonLineError, of each line in order.
+    """
+    reader = worker_reader if reader is None else reader
+    read_line = reader.read_move if kind == "moves" else reader.read_ability
+
+    return list(reader.iter_records_from(lines, path, read_line, None, first_line))
+
+def bulk_import(sources, workers=None, chunk_size=CHUNK_SIZE, max_errors=None):
+    """Reads every type, move, ability and card file of many directories or globs.
+
+    Types are read first in this process, then the move and ability files are split into chunks
+    of lines that are read across a process pool. Chunks are merged in file and line order, so
+    the result is the same for any number of workers and a later entry with the same name
+    overrides an earlier one, as custom files override standard ones. Cards are read last in
+    this process, since they refer to the merged moves and abilities.
+
+    Args:
+        sources: A string, or list of strings, each a directory, a glob pattern or a file path, see find_files.
+        workers: An int that holds the number of worker processes, os.cpu_count() if None, and 0
+            to read every chunk in this process.
+        chunk_size: An int that holds the number of lines sent to a worker at a time.
+        max_errors: An int that holds the number of invalid lines allowed per kind before the import stops, None for no limit.
+
+    Raises:
+        pokemon_error_report.PokemonImportError: A kind of file has more than max_errors invalid lines.
+
+    Returns:
+        A pokemon_file_reader.PokemonFileReader with the types, moves, abilities and cards read,
+        and an error report for moves, abilities and cards in error_reports.
+    """
+    logger = get_logger(__name__)
+    files = find_files(sources)
+    type_names = []
+
+    for path in files["types"]:
+        with open(path, 'r') as file:
+            type_names.extend(line.strip() for line in file)
+
+    reader = create_reader(type_names)
+    executor = None if workers == 0 else ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(reader.type_table.names, logging_options()))
+
+    try:
+        for kind, records in (("moves", reader.moves), ("abilities", reader.abilities)):
+            chunks = list(read_chunks(files[kind], chunk_size))
+
+            if executor is None:
+                results = (read_chunk(kind, path, first_line, lines, reader) for path, first_line, lines in chunks)
+            else:
+                results = executor.map(read_chunk, [kind] * len(chunks), *zip(*chunks)) if len(chunks) > 0 else []
+
+            with reader.collect_errors(kind, max_errors) as report:
+                for result in results:
+                    for record in result:
+                        if isinstance(record, pokemon_error_report.PokemonLineError):
+                            report.record(record)
+                        else:
+                            records[record.name] = record
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    with reader.collect_errors("cards", max_errors):
+        for path in files["cards"]:
+            reader.read_lines(path, reader.read_card, reader.cards)
+
+    logger.info(f"Imported {len(reader.types)} types, {len(reader.moves)} moves, {len(reader.abilities)} abilities and {len(reader.cards)} cards")
+
+    return reader
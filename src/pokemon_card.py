@@ -1,15 +1,80 @@
-class PokemonCard:
+class PokemonCardDefinition:
+    """Holds the data of a card that does not change during a game.
+
+    Definitions are loaded once into a pokemon_card_registry and shared read-only by every game,
+    so they must not be modified after loading.
+
+    Attributes:
+        card_type: A string that holds the kind of card
+        name: A string that holds card name
+        pre_evo: A string that holds the name of the card this card evolves from, None if it is a basic card
+        health: An int that holds maximum health
+        type: A string that holds the card's type
+        weaknesses: A string that holds the type the card is weak to, None if it has no weakness
+        abilties: A tuple of pokemon_ability objects
+        moves: A tuple of pokemon_move objects
+    """
+
+    __slots__ = ("card_type", "name", "pre_evo", "health", "type", "weaknesses", "abilties", "moves")
+
     def __init__(self):
+        """Initializes the instance with default values."""
         self.card_type = None
         self.name = None
 
         self.pre_evo = None
-        self.evo_ready = None
 
         self.health = None
         self.type = None
         self.weaknesses = None
-        self.status = None
 
-        self.abilties = []
-        self.moves = []
\ No newline at end of file
+        self.abilties = ()
+        self.moves = ()
+
+    def __eq__(self, other):
+        """Compares contents of self with contents of other definition.
+
+        Returns:
+            A boolean, True, if both definition's contents are the same, else False"""
+        if not isinstance(other, PokemonCardDefinition):
+            return False
+
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute in PokemonCardDefinition.__slots__)
+
+class PokemonCardInstance:
+    """Holds the state of one copy of a card in a game.
+
+    Everything that does not change during a game is kept in the shared PokemonCardDefinition,
+    which is referenced by id, so copying an instance copies a few integers.
+
+    Attributes:
+        definition_id: An int that holds the id of the card's definition in the pokemon_card_registry
+        health: An int that holds current health
+        status: A string that holds the card's special condition, None if it has none
+        evo_ready: A boolean that is True if the card can evolve this turn
+        energy: A tuple that counts attached energies by type id
+    """
+
+    __slots__ = ("definition_id", "health", "status", "evo_ready", "energy")
+
+    def __init__(self, definition_id=None, health=None, status=None, evo_ready=False, energy=()):
+        """Initializes the instance with the given values."""
+        self.definition_id = definition_id
+        self.health = health
+        self.status = status
+        self.evo_ready = evo_ready
+        self.energy = energy
+
+    def copy(self):
+        """Returns a new instance with the same state."""
+        return PokemonCardInstance(self.definition_id, self.health, self.status, self.evo_ready, self.energy)
+
+    def __eq__(self, other):
+        """Compares contents of self with contents of other instance.
+
+        Returns:
+            A boolean, True, if both instance's contents are the same, else False"""
+        if not isinstance(other, PokemonCardInstance):
+            return False
+
+        return self.definition_id == other.definition_id and self.health == other.health and self.status == other.status and self.evo_ready == other.evo_ready and self.energy == other.energy
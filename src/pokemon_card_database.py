@@ -0,0 +1,391 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import pokemon_move
+import pokemon_ability
+import pokemon_effect_resolver
+import pokemon_type_table
+from pokemon_file_reader import PokemonFileReader
+from logger import get_logger
+
+DATABASE_FILE = "pokemon_card_database.bin"
+
+MAGIC = b"PTCGPDB\0"
+VERSION = 2
+
+# Files the database is compiled from, a change to any of them makes the database stale
+SOURCE_FILES = (
+    "pokemon_standard_types.txt",
+    "pokemon_custom_types.txt",
+    "pokemon_standard_moves.txt",
+    "pokemon_custom_moves.txt",
+    "pokemon_standard_abilities.txt",
+    "pokemon_custom_abilities.txt",
+    "pokemon_standard_cards.txt",
+    "pokemon_custom_cards.txt",
+) + tuple(module_name + ".py" for module_name in
+          pokemon_effect_resolver.MOVE_EFFECT_MODULES
+          + pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES
+          + pokemon_effect_resolver.ABILITY_EFFECT_MODULES)
+
+MAX_MOVE_ENERGIES = 8
+NO_STRING = 0xFFFFFFFF
+NO_TYPE = 0xFF
+
+# Record layouts, all little-endian and unpadded
+HEADER = struct.Struct("<8sHHIIIII")  # magic, version, max move energies, source, string, type, move and ability counts
+SOURCE = struct.Struct("<Iqq32s")  # path string id, mtime in ns and size in bytes (both -1 if missing), sha256 of contents
+STRING = struct.Struct("<II")  # offset into string data, length in bytes
+TYPE = struct.Struct("<I")  # name string id
+MOVE = struct.Struct(f"<IIIB{MAX_MOVE_ENERGIES}B")  # name string id, damage, effect string id, energy count, energy type ids
+ABILITY = struct.Struct("<IBII")  # name string id, passive, activation string id, effect string id
+
+def source_stat(path):
+    """Returns the mtime in ns and size in bytes of a file; (-1, -1) if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return -1, -1
+
+    return stat.st_mtime_ns, stat.st_size
+
+def source_digest(path):
+    """Returns the sha256 digest of a file's contents; a zeroed digest if it does not exist."""
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).digest()
+    except FileNotFoundError:
+        return bytes(32)
+
+def file_id(file):
+    """Returns the inode and device of an open file, which tell a file apart from one that replaced it."""
+    stat = os.fstat(file.fileno())
+    return stat.st_ino, stat.st_dev
+
+def source_fingerprint(path):
+    """Returns the mtime in ns, size in bytes and sha256 digest of a file; (-1, -1, zeroed digest) if it does not exist."""
+    return (*source_stat(path), source_digest(path))
+
+def compile_database(path=DATABASE_FILE, reader=None):
+    """Validates the card data files once and writes them into a binary database.
+
+    Types, moves and abilities are read through a PokemonFileReader, so invalid lines are
+    skipped and logged exactly as when reading the text files. The database holds interned
+    type ids, fixed-width move and ability records sorted by name, and a string table with
+    every name and effect function name. The file is written to a temporary file first and
+    moved into place, so processes loading the database never see a partial file.
+
+    Args:
+        path: A string that holds the path of the database to write.
+        reader: A PokemonFileReader to read the files with; a new one is created if None.
+
+    Returns:
+        A string, the path of the written database.
+
+    Raises:
+        ValueError: A move needs more than MAX_MOVE_ENERGIES energies, or there are more than 255 types.
+    """
+
+    if reader is None:
+        reader = PokemonFileReader()
+
+    reader.read_all_types()
+    moves = reader.read_all_moves()
+    abilities = reader.read_all_abilities()
+
+    # Type ids are the reader's, so stored energy costs line up with the energy_cost vectors it builds
+    types = list(reader.type_table.names)
+
+    if len(types) >= NO_TYPE:
+        raise ValueError(f"Card database supports at most {NO_TYPE - 1} types, got {len(types)}")
+
+    # Functions are stored by the name the resolver indexed them under
+    function_names = dict()
+
+    for module_names in (pokemon_effect_resolver.MOVE_EFFECT_MODULES,
+                         pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES,
+                         pokemon_effect_resolver.ABILITY_EFFECT_MODULES):
+        for function_name, function in reader.effect_resolver.index_modules(module_names)[0].items():
+            function_names.setdefault((module_names, function), function_name)
+
+    strings = []
+    string_ids = dict()
+
+    def intern(text):
+        """Returns the string table id of text, adding it if it is new."""
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text.encode())
+
+        return string_ids[text]
+
+    def intern_function(module_names, function):
+        """Returns the string table id of a function's name, or NO_STRING if there is no function."""
+        return NO_STRING if function is None else intern(function_names[(module_names, function)])
+
+    type_ids = {name: index for index, name in enumerate(types)}
+
+    source_records = [SOURCE.pack(intern(source), *source_fingerprint(source)) for source in SOURCE_FILES]
+    type_records = [TYPE.pack(intern(name)) for name in types]
+
+    move_records = []
+
+    for name in sorted(moves):
+        move = moves[name]
+
+        if len(move.energy) > MAX_MOVE_ENERGIES:
+            raise ValueError(f"Move {name} needs {len(move.energy)} energies, card database supports at most {MAX_MOVE_ENERGIES}")
+
+        energies = [type_ids[energy] for energy in move.energy] + [NO_TYPE] * (MAX_MOVE_ENERGIES - len(move.energy))
+        effect_id = intern_function(pokemon_effect_resolver.MOVE_EFFECT_MODULES, move.effect)
+        move_records.append(MOVE.pack(intern(name), move.damage, effect_id, len(move.energy), *energies))
+
+    ability_records = []
+
+    for name in sorted(abilities):
+        ability = abilities[name]
+        activation_id = intern_function(pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES, ability.activation_condition)
+        effect_id = intern_function(pokemon_effect_resolver.ABILITY_EFFECT_MODULES, ability.effect)
+        ability_records.append(ABILITY.pack(intern(name), ability.passive, activation_id, effect_id))
+
+    string_records = []
+    offset = 0
+
+    for text in strings:
+        string_records.append(STRING.pack(offset, len(text)))
+        offset += len(text)
+
+    header = HEADER.pack(MAGIC, VERSION, MAX_MOVE_ENERGIES, len(source_records), len(strings), len(types), len(move_records), len(ability_records))
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(header)
+
+        for records in (source_records, string_records, type_records, move_records, ability_records, strings):
+            file.write(b"".join(records))
+
+    os.replace(temporary_path, path)
+
+    get_logger(__name__).info(f"Compiled card database {path} with {len(types)} types, {len(move_records)} moves and {len(ability_records)} abilities")
+
+    return path
+
+class PokemonCardDatabase:
+    """Read-only view over a compiled card database.
+
+    The database file is memory-mapped, so every process that opens the same file shares
+    one page-cached copy. Records are decoded only when they are asked for.
+
+    Attributes:
+        path: A string that holds the path of the database file.
+        types: A list of type names, indexed by type id.
+        type_table: A pokemon_type_table object built from types.
+        move_count: An int that holds the number of moves.
+        ability_count: An int that holds the number of abilities.
+        effect_resolver: A pokemon_effect_resolver object that turns stored function names back into functions.
+        file_id: A tuple of the inode and device of the mapped file, so a recompiled file is not written to.
+    """
+
+    def __init__(self, path=DATABASE_FILE):
+        """Opens and memory-maps the database.
+
+        Raises:
+            ValueError: The file is not a card database or was written by another version.
+        """
+
+        self.path = path
+        self.effect_resolver = pokemon_effect_resolver.PokemonEffectResolver()
+
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.file_id = file_id(file)
+
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a card database")
+
+        magic, version, max_energies, source_count, string_count, type_count, self.move_count, self.ability_count = HEADER.unpack_from(self.buffer, 0)
+
+        if magic != MAGIC or version != VERSION or max_energies != MAX_MOVE_ENERGIES:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} card database")
+
+        self.sources_offset = HEADER.size
+        self.strings_offset = self.sources_offset + source_count * SOURCE.size
+        self.types_offset = self.strings_offset + string_count * STRING.size
+        self.moves_offset = self.types_offset + type_count * TYPE.size
+        self.abilities_offset = self.moves_offset + self.move_count * MOVE.size
+        self.string_data_offset = self.abilities_offset + self.ability_count * ABILITY.size
+        self.source_count = source_count
+
+        self.types = [self.string(TYPE.unpack_from(self.buffer, self.types_offset + index * TYPE.size)[0]) for index in range(type_count)]
+        self.type_table = pokemon_type_table.PokemonTypeTable(self.types)
+
+    def close(self):
+        """Unmaps the database file."""
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def string(self, string_id):
+        """Returns the string with the given id from the string table, or None for NO_STRING."""
+        if string_id == NO_STRING:
+            return None
+
+        offset, length = STRING.unpack_from(self.buffer, self.strings_offset + string_id * STRING.size)
+        start = self.string_data_offset + offset
+
+        return self.buffer[start:start + length].decode()
+
+    def is_stale(self):
+        """Returns True if any source file's contents changed since the database was compiled, else False.
+
+        A file is only hashed if its mtime or size changed, so checking unchanged files costs one
+        stat each. A file that was only touched does not make the database stale, and its new
+        mtime and size are stored, see refresh_source, so it is not hashed again.
+        """
+        for index in range(self.source_count):
+            offset = self.sources_offset + index * SOURCE.size
+            path_id, mtime, size, digest = SOURCE.unpack_from(self.buffer, offset)
+            path = self.string(path_id)
+            stat = source_stat(path)
+
+            if stat == (mtime, size):
+                continue
+
+            if source_digest(path) != digest:
+                return True
+
+            self.refresh_source(offset, path_id, stat, digest)
+
+        return False
+
+    def refresh_source(self, offset, path_id, stat, digest):
+        """Writes the new mtime and size of a source whose contents did not change into its record.
+
+        The record is written through the file, which the map shares, unless the file was
+        replaced since it was opened. A database that cannot be written is left as it is.
+        """
+        try:
+            with open(self.path, "r+b") as file:
+                if file_id(file) != self.file_id:
+                    return
+
+                file.seek(offset)
+                file.write(SOURCE.pack(path_id, *stat, digest))
+        except OSError as error:
+            get_logger(__name__).debug(f"Could not refresh source {self.string(path_id)} of card database {self.path}: {error}")
+
+    def move(self, index):
+        """Decodes the move record at index into a pokemon_move object."""
+        record = MOVE.unpack_from(self.buffer, self.moves_offset + index * MOVE.size)
+
+        energy = tuple(self.types[type_id] for type_id in record[4:4 + record[3]])
+        effect = None if record[2] == NO_STRING else self.effect_resolver.resolve(pokemon_effect_resolver.MOVE_EFFECT_MODULES, self.string(record[2]))
+
+        return pokemon_move.PokemonMove(self.string(record[0]), energy, self.type_table.cost_vector(energy), record[1], effect)
+
+    def ability(self, index):
+        """Decodes the ability record at index into a pokemon_ability object."""
+        name_id, passive, activation_id, effect_id = ABILITY.unpack_from(self.buffer, self.abilities_offset + index * ABILITY.size)
+
+        activation_condition = None if activation_id == NO_STRING else self.effect_resolver.resolve(pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES, self.string(activation_id))
+        effect = None if effect_id == NO_STRING else self.effect_resolver.resolve(pokemon_effect_resolver.ABILITY_EFFECT_MODULES, self.string(effect_id))
+
+        return pokemon_ability.PokemonAbility(self.string(name_id), bool(passive), activation_condition, False, effect, getattr(activation_condition, "depends_on", None))
+
+    def find_index(self, name, offset, record, count):
+        """Binary searches a table of records sorted by name, returns the index of name or -1."""
+        low, high = 0, count
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_name = self.string(record.unpack_from(self.buffer, offset + middle * record.size)[0])
+
+            if middle_name == name:
+                return middle
+            elif middle_name < name:
+                low = middle + 1
+            else:
+                high = middle
+
+        return -1
+
+    def find_move(self, name):
+        """Returns the move with the given name as a pokemon_move object, or None if there is none."""
+        index = self.find_index(name, self.moves_offset, MOVE, self.move_count)
+        return None if index == -1 else self.move(index)
+
+    def find_ability(self, name):
+        """Returns the ability with the given name as a pokemon_ability object, or None if there is none."""
+        index = self.find_index(name, self.abilities_offset, ABILITY, self.ability_count)
+        return None if index == -1 else self.ability(index)
+
+    def fill_reader(self, reader):
+        """Gives a PokemonFileReader the types, moves and abilities of the database, as if it had read their files.
+
+        Only the cards are left to read, with reader.read_all_cards.
+
+        Returns:
+            The reader.
+        """
+        reader.types = self.types
+        reader.type_table = self.type_table
+        reader.moves = self.read_all_moves()
+        reader.abilities = self.read_all_abilities()
+
+        return reader
+
+    def read_all_types(self):
+        """Returns a set of all types, like PokemonFileReader.read_all_types."""
+        return set(self.types)
+
+    def read_all_moves(self):
+        """Returns a dictionary of move name -> pokemon_move object, like PokemonFileReader.read_all_moves."""
+        return {move.name: move for move in map(self.move, range(self.move_count))}
+
+    def read_all_abilities(self):
+        """Returns a dictionary of ability name -> pokemon_ability object, like PokemonFileReader.read_all_abilities."""
+        return {ability.name: ability for ability in map(self.ability, range(self.ability_count))}
+
+def load_database(path=DATABASE_FILE):
+    """Opens the card database, compiling it first if it is missing, unreadable or stale.
+
+    Args:
+        path: A string that holds the path of the database file.
+
+    Returns:
+        A PokemonCardDatabase.
+    """
+
+    try:
+        database = PokemonCardDatabase(path)
+    except (FileNotFoundError, ValueError):
+        database = None
+
+    if database is not None and not database.is_stale():
+        return database
+
+    if database is not None:
+        database.close()
+        get_logger(__name__).info(f"Card database {path} is stale, recompiling")
+
+    compile_database(path)
+
+    return PokemonCardDatabase(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiles the card data files in the current directory into a binary card database.")
+    parser.add_argument("command", choices=["compile"])
+    parser.add_argument("--output", default=DATABASE_FILE)
+    args = parser.parse_args()
+
+    compile_database(args.output)
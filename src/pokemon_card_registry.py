@@ -0,0 +1,74 @@
+import pokemon_card
+
+class PokemonCardRegistry:
+    """Holds every card definition, indexed by a dense integer id.
+
+    The registry is loaded once from a PokemonFileReader and shared read-only by every game.
+    Games only store PokemonCardInstance objects that refer to a definition by id.
+
+    Attributes:
+        definitions: A list of pokemon_card.PokemonCardDefinition objects, indexed by definition id.
+        ids: A dictionary of card name -> definition id.
+        type_count: An int that holds the number of types, the length of an instance's energy vector.
+        type_table: The pokemon_type_table.PokemonTypeTable energy vectors are indexed by, None if unknown.
+        no_energy: A tuple of type_count zeros, shared by every new instance.
+    """
+
+    def __init__(self, type_count=0, type_table=None):
+        """Initializes the instance with default values, type_count is taken from type_table if one is given."""
+        self.definitions = []
+        self.ids = dict()
+        self.type_table = type_table
+        self.type_count = type_count if type_table is None else len(type_table)
+        self.no_energy = (0,) * self.type_count
+
+    def __len__(self):
+        return len(self.definitions)
+
+    @classmethod
+    def from_reader(cls, reader):
+        """Creates a registry from the cards a PokemonFileReader has read.
+
+        Args:
+            reader: A PokemonFileReader whose read_all_cards has been called.
+
+        Returns:
+            A PokemonCardRegistry with the reader's cards, in the reader's order.
+        """
+        registry = cls(type_table=reader.type_table)
+
+        for definition in reader.cards.values():
+            registry.add(definition)
+
+        return registry
+
+    def add(self, definition):
+        """Adds a definition, replacing any definition with the same name.
+
+        Returns:
+            An int, the id of the definition.
+        """
+        if definition.name in self.ids:
+            self.definitions[self.ids[definition.name]] = definition
+        else:
+            self.ids[definition.name] = len(self.definitions)
+            self.definitions.append(definition)
+
+        return self.ids[definition.name]
+
+    def get(self, definition_id):
+        """Returns the definition with the given id."""
+        return self.definitions[definition_id]
+
+    def id_of(self, name):
+        """Returns the id of the definition with the given name, None if there is none."""
+        return self.ids.get(name)
+
+    def new_instance(self, definition_id):
+        """Creates the in-game state of a fresh copy of a card.
+
+        Returns:
+            A pokemon_card.PokemonCardInstance at full health with no status or attached energy.
+        """
+        definition = self.definitions[definition_id]
+        return pokemon_card.PokemonCardInstance(definition_id, definition.health, None, False, self.no_energy)
@@ -1,13 +1,155 @@
+import enum
+import hashlib
 import random
 
+class CoinSide(enum.IntEnum):
+    """Result of a coin flip, truthy for heads."""
+
+    TAILS = 0
+    HEADS = 1
+
+def derive_seed(seed, *keys):
+    """Derives an independent seed from a seed and any number of keys.
+
+    The derived seed only depends on its arguments, so the same seed and keys give the same
+    stream in any process.
+
+    Returns:
+        An int, a 64 bit seed.
+    """
+    text = ":".join(str(part) for part in (seed,) + keys)
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+def copy_generator(generator, state=None):
+    """Returns a random.Random in the same state as generator, without seeding it first.
+
+    Args:
+        generator: The random.Random to copy.
+        state: The generator's getstate(), if it is already known, since reading it takes most of the time.
+    """
+    copy = random.Random.__new__(random.Random)
+    copy.setstate(generator.getstate() if state is None else state)
+    return copy
+
 class PokemonCoin:
-    def __init__(self):
+    """Seeded coin used for every coin flip in a game.
+
+    Attributes:
+        seed: The seed the coin was created with, None for a seed from the operating system.
+        random: A random.Random that the flips are drawn from.
+        state: The CoinSide of the last flip_coin, None before the first flip.
+        position: An int that holds the number of 32 bit words drawn from random, so a seeded coin
+            can be moved back to the same point with seek.
+        flips: An array.array that every flip is appended to as 0 or 1, None to not record flips.
+        saved_state: The getstate() of random kept by copy until the coin draws again, None if there is none.
+    """
+
+    def __init__(self, seed=None):
+        """Initializes the instance with a generator seeded with seed."""
+        self.seed = seed
+        self.random = random.Random(seed)
         self.state = None
+        self.position = 0
+        self.flips = None
+        self.saved_state = None
 
     def flip_coin(self):
-        num = random.randint(0, 1)
+        """Flips the coin once.
+
+        Returns:
+            A CoinSide, also stored in self.state.
+        """
+        self.state = CoinSide(self.random.getrandbits(1))
+        self.position += 1
+        self.saved_state = None
+
+        if self.flips is not None:
+            self.flips.append(self.state)
+
+        return self.state
+
+    def flip_many(self, count):
+        """Flips the coin count times at once, for moves like "flip 3 coins, 20 damage for each heads".
+
+        Returns:
+            An int where bit i is set if flip i was heads, count_heads gives the number of heads.
+        """
+        if count <= 0:
+            return 0
+
+        self.position += (count + 31) // 32
+        self.saved_state = None
+        flips = self.random.getrandbits(count)
+
+        if self.flips is not None:
+            self.flips.extend(flips >> index & 1 for index in range(count))
+
+        return flips
+
+    @staticmethod
+    def count_heads(flips):
+        """Returns the number of heads in the result of flip_many."""
+        return flips.bit_count()
+
+    def split(self, *keys):
+        """Creates an independent coin for keys, for example one per game or per search rollout.
+
+        Coins split from the same seed with the same keys flip the same; a coin without a seed
+        splits from a seed drawn from its own generator.
+        """
+        if self.seed is None:
+            self.position += 2
+            self.saved_state = None
+
+        seed = self.seed if self.seed is not None else self.random.getrandbits(64)
+        return PokemonCoin(derive_seed(seed, *keys))
+
+    def getstate(self):
+        """Returns the generator state, setstate rewinds the coin to it."""
+        return self.random.getstate(), self.state, self.position
+
+    def setstate(self, state):
+        """Rewinds the coin to a state returned by getstate."""
+        generator_state, self.state, self.position = state
+        self.random.setstate(generator_state)
+        self.saved_state = None
+
+    def copy(self):
+        """Returns an independent coin in the same state, which flips the same as this one from here on.
+
+        Flips are not recorded by the copy. The generator state is kept until this coin draws
+        again, so copying it repeatedly, for example once per search playout from one game
+        state, reads the state once.
+        """
+        if self.saved_state is None:
+            self.saved_state = self.random.getstate()
+
+        coin = PokemonCoin.__new__(PokemonCoin)
+        coin.seed = self.seed
+        coin.random = copy_generator(self.random, self.saved_state)
+        coin.state = self.state
+        coin.position = self.position
+        coin.flips = None
+        coin.saved_state = self.saved_state
+
+        return coin
+
+    def seek(self, position):
+        """Moves a seeded coin to the point where position words have been drawn since it was created.
+
+        This is a much shorter way to store where a coin is than getstate, see
+        pokemon_state_codec.
+
+        Raises:
+            ValueError: The coin has no seed.
+        """
+        if self.seed is None:
+            raise ValueError("Only a seeded coin can seek")
+
+        self.random.seed(self.seed)
+        self.saved_state = None
+
+        for _ in range(position):
+            self.random.getrandbits(32)
 
-        if num == 0:
-            self.state = "Heads"
-        else:
-            self.state = "Tails"
\ No newline at end of file
+        self.position = position
@@ -0,0 +1,319 @@
+import argparse
+import importlib
+import random
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+import pokemon_effect_resolver
+from logger import get_logger
+
+STANDARD_TYPES = ("Fire", "Fighting", "Lightning", "Water", "Grass", "Psychic", "Metal", "Darkness", "Dragon", "Colorless")
+
+# Size of the real card pool, multiplied by the scale of a generated pool
+REFERENCE_POOL = {"moves": 450, "abilities": 60, "cards": 300}
+
+DECK_SIZE = 20
+MAX_COPIES = 2
+MAX_MOVE_ENERGIES = 4
+
+# Ways a generated line is made invalid, each producing a different error of the reader
+ERROR_KINDS = ("format", "number", "type", "function")
+
+EFFECT_MODULES = pokemon_effect_resolver.MOVE_EFFECT_MODULES + pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES + pokemon_effect_resolver.ABILITY_EFFECT_MODULES
+
+@contextmanager
+def generated_effect_modules(directory):
+    """Makes effect resolvers import the effect list modules written to a directory.
+
+    Effect resolvers import effect modules by name, so without this they get the modules of the
+    same name already imported or first on sys.path. Inside the block the directory comes first
+    on sys.path and the effect modules are dropped from sys.modules; afterwards both are put
+    back. Readers must be created inside the block, or have effect_resolver.clear() called.
+
+    Args:
+        directory: A string or pathlib.Path of a directory written by PokemonDataGenerator.write.
+    """
+    path = str(Path(directory).resolve())
+    saved = {name: sys.modules.pop(name) for name in EFFECT_MODULES if name in sys.modules}
+    sys.path.insert(0, path)
+    importlib.invalidate_caches()
+
+    try:
+        yield
+    finally:
+        sys.path.remove(path)
+
+        for name in EFFECT_MODULES:
+            sys.modules.pop(name, None)
+
+        sys.modules.update(saved)
+
+class PokemonDataGenerator:
+    """Generates synthetic card pools and decks for load testing the reader, database and emulator.
+
+    Move, ability and card lines follow the exact grammars of the data files. Standard files
+    hold most entries; the custom files hold custom_share as many, of which overlap reuse names
+    from the standard files, which the custom entries then override. A share error_rate of the
+    lines is made invalid in one of the ways in ERROR_KINDS. Effect functions named by the lines
+    are written to matching effect list modules, which are read with generated_effect_modules,
+    and decks only use valid cards.
+
+    Attributes:
+        moves: An int that holds the number of standard moves.
+        abilities: An int that holds the number of standard abilities.
+        cards: An int that holds the number of standard cards.
+        types: A tuple of the type names, STANDARD_TYPES followed by generated ones.
+        error_rate: A float, the share of lines that are invalid.
+        custom_share: A float, the number of custom entries as a share of the standard entries.
+        overlap: A float, the share of custom entries that override a standard entry.
+        effect_share: A float, the share of moves and abilities that name effect functions.
+        random: A random.Random every choice is drawn from.
+        functions: A dictionary of effect module name -> list of the function names the lines use.
+        valid: A dictionary of kind ("moves", "abilities" or "cards") -> dictionary of name -> True if the final entry with that name is valid.
+        basics: A list of the names of valid basic cards.
+        evolutions: A dictionary of basic card name -> list of the names of valid cards that evolve from it.
+    """
+
+    def __init__(self, moves=REFERENCE_POOL["moves"], abilities=REFERENCE_POOL["abilities"], cards=REFERENCE_POOL["cards"], types=len(STANDARD_TYPES),
+                 error_rate=0.0, custom_share=0.1, overlap=0.5, effect_share=0.2, seed=0):
+        """Initializes the generator, nothing is generated until the line methods are called."""
+        self.moves = moves
+        self.abilities = abilities
+        self.cards = cards
+        self.types = STANDARD_TYPES[:types] + tuple(f"Synthetic{index}" for index in range(len(STANDARD_TYPES), types))
+        self.error_rate = error_rate
+        self.custom_share = custom_share
+        self.overlap = overlap
+        self.effect_share = effect_share
+        self.random = random.Random(seed)
+        self.functions = {name: [] for name in EFFECT_MODULES}
+        self.valid = {"moves": dict(), "abilities": dict(), "cards": dict()}
+        self.basics = []
+        self.evolutions = dict()
+
+    @classmethod
+    def scaled(cls, scale, **options):
+        """Creates a generator for a pool scale times the size of REFERENCE_POOL."""
+        return cls(*(int(REFERENCE_POOL[kind] * scale) for kind in ("moves", "abilities", "cards")), **options)
+
+    def names(self, prefix, count):
+        """Returns the standard and custom entry names of a kind, each a list of names in file order."""
+        standard = [f"{prefix} {index}" for index in range(count)]
+        custom_count = int(count * self.custom_share)
+        overlapping = min(int(custom_count * self.overlap), count)
+        custom = self.random.sample(standard, overlapping) + [f"Custom {prefix} {index}" for index in range(custom_count - overlapping)]
+
+        return standard, custom
+
+    def function(self, module, name, chance):
+        """Returns a new effect function name in module with the given chance, else None."""
+        if self.random.random() >= chance:
+            return None
+
+        function_name = f"{name.lower().replace(' ', '_')}_{module.rsplit('_', 2)[-2]}"
+        self.functions[module].append(function_name)
+
+        return function_name
+
+    def make_error(self, kind, line, keys):
+        """Returns a copy of line made invalid in one of the ways in ERROR_KINDS."""
+        error = self.random.choice(ERROR_KINDS)
+
+        if error == "format":
+            return line.replace(self.random.choice(keys), "", 1)
+
+        if error == "number" and kind != "abilities":
+            key = "Damage:" if kind == "moves" else "Health:"
+            start = line.index(key) + len(key)
+            end = line.index(",", start) if "," in line[start:] else len(line)
+            return line[:start] + " lots" + line[end:]
+
+        if error == "type" and kind != "abilities":
+            key = "Energies:" if kind == "moves" else ", Type:"
+            start = line.index(key) + len(key)
+            end = line.index(",", start)
+            return line[:start] + " Nuclear" + line[end:]
+
+        key = {"moves": "Effect Function:", "abilities": "Activation Function:", "cards": "Moves:"}[kind]
+        start = line.index(key) + len(key)
+        end = line.index(",", start) if "," in line[start:] else len(line)
+
+        return line[:start] + " missing_function" + line[end:]
+
+    def finish(self, kind, name, line, keys):
+        """Makes a share error_rate of lines invalid and records whether the entry with name is valid.
+
+        The reader keeps a standard entry when the custom line overriding it is invalid, so a name
+        stays valid if any of its lines is.
+        """
+        invalid = self.random.random() < self.error_rate
+        self.valid[kind][name] = self.valid[kind].get(name, False) or not invalid
+
+        return (self.make_error(kind, line, keys) if invalid else line) + "\n"
+
+    def move_line(self, name, standard):
+        """Returns one move line."""
+        energies = "; ".join(self.random.choice(self.types) for _ in range(self.random.randint(1, MAX_MOVE_ENERGIES)))
+        module = pokemon_effect_resolver.MOVE_EFFECT_MODULES[0 if standard else 1]
+        effect = self.function(module, name, self.effect_share)
+        line = f"Move Name: {name}, Energies: {energies}, Damage: {self.random.randint(0, 20) * 10}, Effect Function: {effect}"
+
+        return self.finish("moves", name, line, ("Move Name:", "Energies:", "Damage:", "Effect Function:"))
+
+    def ability_line(self, name, standard):
+        """Returns one ability line."""
+        index = 0 if standard else 1
+        passive = self.random.random() < 0.5
+        activation = None if passive else self.function(pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES[index], name, self.effect_share)
+        effect = self.function(pokemon_effect_resolver.ABILITY_EFFECT_MODULES[index], name, self.effect_share)
+        line = f"Ability Name: {name}, Type: {'Passive' if passive else 'Active'}, Activation Function: {activation}, Effect Function: {effect}"
+
+        return self.finish("abilities", name, line, ("Ability Name:", "Type:", "Activation Function:", "Effect Function:"))
+
+    def pick(self, kind, count):
+        """Returns up to count distinct names of valid entries of a kind, or "None" if there are none."""
+        names = [name for name, valid in self.valid[kind].items() if valid]
+        picked = self.random.sample(names, min(count, len(names)))
+
+        return "; ".join(picked) if len(picked) > 0 else "None"
+
+    def card_line(self, name, pre_evo):
+        """Returns one card line, a basic card if pre_evo is None, else an evolution of pre_evo."""
+        card_type = self.random.choice(self.types)
+        weakness = self.random.choice(self.types + (None,))
+        abilities = self.pick("abilities", 1) if self.random.random() < 0.2 else "None"
+        moves = self.pick("moves", self.random.randint(1, 2))
+        health = self.random.randint(4, 10) * 10 + (0 if pre_evo is None else 50)
+        line = f"Card Name: {name}, Card Type: Pokemon, Pre Evolution: {pre_evo}, Health: {health}, Type: {card_type}, Weakness: {weakness}, Abilities: {abilities}, Moves: {moves}"
+        line = self.finish("cards", name, line, ("Card Name:", "Card Type:", "Pre Evolution:", "Health:", ", Type:", "Weakness:", "Abilities:", "Moves:"))
+
+        if self.valid["cards"][name] and moves != "None":
+            if pre_evo is None:
+                self.basics.append(name)
+                self.evolutions[name] = []
+            elif pre_evo in self.evolutions:
+                self.evolutions[pre_evo].append(name)
+
+        return line
+
+    def type_lines(self):
+        """Returns the lines of the standard and custom types files."""
+        standard = [f"{name}\n" for name in self.types if name in STANDARD_TYPES]
+        custom = [f"{name}\n" for name in self.types if name not in STANDARD_TYPES]
+
+        return standard, custom
+
+    def move_lines(self):
+        """Returns the lines of the standard and custom moves files."""
+        standard, custom = self.names("Move", self.moves)
+
+        return [self.move_line(name, True) for name in standard], [self.move_line(name, False) for name in custom]
+
+    def ability_lines(self):
+        """Returns the lines of the standard and custom abilities files."""
+        standard, custom = self.names("Ability", self.abilities)
+
+        return [self.ability_line(name, True) for name in standard], [self.ability_line(name, False) for name in custom]
+
+    def card_lines(self):
+        """Returns the lines of the standard and custom cards files, call after move_lines and ability_lines.
+
+        About a third of the cards evolve from an earlier basic card, and about one in ten is an "ex" card.
+        """
+        files = []
+
+        for prefix, count in (("Card", self.cards), ("Custom Card", int(self.cards * self.custom_share))):
+            lines = []
+
+            for index in range(count):
+                name = f"{prefix} {index}" + (" ex" if self.random.random() < 0.1 else "")
+                pre_evo = self.random.choice(self.basics) if len(self.basics) > 0 and self.random.random() < 0.33 else None
+                lines.append(self.card_line(name, pre_evo))
+
+            files.append(lines)
+
+        return files[0], files[1]
+
+    def effect_module(self, module):
+        """Returns the source of an effect list module with every function the lines name in it."""
+        if module in pokemon_effect_resolver.MOVE_EFFECT_MODULES:
+            signature, body = "emulator", "    pass\n"
+        elif module in pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES:
+            signature, body = "emulator, player, slot", "    return True\n"
+        else:
+            signature, body = "emulator, player, slot", "    pass\n"
+
+        return "".join(f"def {name}({signature}):\n{body}\n" for name in self.functions[module])
+
+    def deck(self):
+        """Returns a random legal deck: DECK_SIZE card names, at most MAX_COPIES of each, where every evolution's basic card is included.
+
+        Raises:
+            ValueError: The pool has too few valid cards for a deck.
+        """
+        deck = []
+
+        for basic in self.random.sample(self.basics, len(self.basics)):
+            line = [basic] + self.random.sample(self.evolutions[basic], min(len(self.evolutions[basic]), 2))
+
+            for name in line:
+                copies = min(MAX_COPIES, DECK_SIZE - len(deck))
+                deck.extend([name] * copies)
+
+            if len(deck) >= DECK_SIZE:
+                return deck
+
+        raise ValueError("Not enough valid cards to build a deck")
+
+    def write(self, directory, decks=0):
+        """Writes a whole data directory: types, moves, abilities, cards, effect list modules and decks.
+
+        Args:
+            directory: A string or pathlib.Path of the directory, created if missing.
+            decks: An int that holds the number of random decks written to pokemon_decks.txt, in
+                the format tcg_pocket_tournament.read_decks reads.
+
+        Returns:
+            A dictionary of file name -> number of lines written.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        files = dict()
+
+        for kind, lines in (("types", self.type_lines()), ("moves", self.move_lines()), ("abilities", self.ability_lines()), ("cards", self.card_lines())):
+            files[f"pokemon_standard_{kind}.txt"] = lines[0]
+            files[f"pokemon_custom_{kind}.txt"] = lines[1]
+
+        for file_name, lines in files.items():
+            (directory / file_name).write_text("".join(lines))
+
+        for module in self.functions:
+            (directory / f"{module}.py").write_text(self.effect_module(module))
+
+        counts = {file_name: len(lines) for file_name, lines in files.items()}
+
+        if decks > 0:
+            deck_lines = [f"Deck Name: Deck {index}, Cards: {'; '.join(self.deck())}\n" for index in range(decks)]
+            (directory / "pokemon_decks.txt").write_text("".join(deck_lines))
+            counts["pokemon_decks.txt"] = decks
+
+        get_logger(__name__).info(f"Generated {sum(counts.values())} lines in {directory}")
+
+        return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Writes a synthetic card pool, effect list modules and decks for load testing.")
+    parser.add_argument("directory", help="directory the data files are written to")
+    parser.add_argument("--scale", type=float, default=1.0, help="size of the pool compared to the real card pool")
+    parser.add_argument("--types", type=int, default=len(STANDARD_TYPES))
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of invalid lines")
+    parser.add_argument("--custom-share", type=float, default=0.1, help="custom entries as a share of standard entries")
+    parser.add_argument("--overlap", type=float, default=0.5, help="share of custom entries that override standard ones")
+    parser.add_argument("--decks", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = PokemonDataGenerator.scaled(args.scale, types=args.types, error_rate=args.error_rate, custom_share=args.custom_share, overlap=args.overlap, seed=args.seed)
+
+    for file_name, count in generator.write(args.directory, args.decks).items():
+        print(f"{file_name}: {count} lines")
@@ -0,0 +1,82 @@
+import importlib
+from pathlib import Path
+
+# Effect module names for each kind of effect function, in lookup order (standard before custom)
+MOVE_EFFECT_MODULES = ("pokemon_standard_move_effect_list", "pokemon_custom_move_effect_list")
+ABILITY_ACTIVATION_MODULES = ("pokemon_standard_ability_activation_list", "pokemon_custom_ability_activation_list")
+ABILITY_EFFECT_MODULES = ("pokemon_standard_ability_effect_list", "pokemon_custom_ability_effect_list")
+
+class PokemonEffectResolver:
+    """Resolves effect function names to the functions in the effect list modules.
+
+    Each group of effect modules is imported a single time, the first time a function from
+    that group is requested, and its callables are indexed into a dictionary. Later lookups
+    are a single dictionary access. When a name exists in both the standard and custom
+    module, the standard function is returned.
+
+    Attributes:
+        indexes: A dictionary of module group -> (dictionary of function name -> function,
+            boolean that is True if any module of the group exists).
+    """
+
+    def __init__(self):
+        """Initializes the instance with default values."""
+        self.indexes = dict()
+
+    def index_modules(self, module_names):
+        """Imports a group of effect modules and indexes their callables.
+
+        Args:
+            module_names: A tuple of module names, ordered from highest to lowest precedence.
+
+        Returns:
+            A tuple of a dictionary, function name -> function, and a boolean that is True if any
+            module of the group exists.
+        """
+
+        if module_names in self.indexes:
+            return self.indexes[module_names]
+
+        index = dict()
+        modules_exist = False
+
+        # Lowest precedence first so that standard functions overwrite custom ones
+        for module_name in reversed(module_names):
+            if not Path(module_name + ".py").exists():
+                continue
+
+            module = importlib.import_module(module_name)
+            modules_exist = True
+
+            for function_name in dir(module):
+                if function_name.startswith("__"):
+                    continue
+
+                function = getattr(module, function_name)
+
+                if callable(function):
+                    index[function_name] = function
+
+        self.indexes[module_names] = (index, modules_exist)
+
+        return self.indexes[module_names]
+
+    def modules_exist(self, module_names):
+        """Returns True if any module of the group exists, else False."""
+        return self.index_modules(module_names)[1]
+
+    def resolve(self, module_names, function_name):
+        """Finds an effect function by name.
+
+        Args:
+            module_names: A tuple of module names, ordered from highest to lowest precedence.
+            function_name: A string that holds the name of the function.
+
+        Returns:
+            The function with the given name; None is returned if no module of the group has it.
+        """
+        return self.index_modules(module_names)[0].get(function_name)
+
+    def clear(self):
+        """Drops all indexed modules so they are imported again on the next lookup."""
+        self.indexes.clear()
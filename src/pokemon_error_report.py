@@ -0,0 +1,117 @@
+SAMPLE_SIZE = 5
+
+def error_code(description):
+    """Returns the error code of an error description, for example "no_name_is_given_for_move"."""
+    return "_".join(description.lower().split())
+
+class PokemonImportError(ValueError):
+    """Raised when an import stops because it found more errors than its report allows.
+
+    Attributes:
+        report: The PokemonErrorReport with the errors found before stopping.
+    """
+
+    def __init__(self, report):
+        """Initializes the error with the report that reached its limit."""
+        super().__init__(f"Stopped import after {report.total} invalid lines")
+        self.report = report
+
+class PokemonLineError:
+    """One invalid line of a data file.
+
+    Attributes:
+        code: A string that identifies the kind of error, see error_code.
+        description: A string that describes the error, for example "No name is given for move".
+        file: A string that holds the name of the file, None if the line was not read from a file.
+        line: An int that holds the 1-based line number, None if the line was not read from a file.
+        column: An int that holds the 0-based column of the offending field, None if unknown.
+        field: A string that holds the offending field, None if unknown.
+        text: A string that holds the whole line.
+    """
+
+    __slots__ = ("code", "description", "file", "line", "column", "field", "text")
+
+    def __init__(self, description, file, line, column, text):
+        """Initializes the error, the field is the text from column to the next field delimiter."""
+        self.code = error_code(description)
+        self.description = description
+        self.file = file
+        self.line = line
+        self.column = column
+        self.field = text[column:].split(", ", 1)[0].strip() if column is not None and column < len(text) else None
+        self.text = text.rstrip("\n")
+
+    def __repr__(self):
+        return f"PokemonLineError({self.code!r}, {self.file!r}, {self.line}, {self.column})"
+
+class PokemonErrorReport:
+    """Collects the invalid lines of an import, grouped by error code.
+
+    Every error is counted, but only the first sample_size errors of each code are kept, so a
+    file with many invalid lines keeps a bounded number of errors and logs one line per code.
+
+    Attributes:
+        max_errors: An int that holds the number of errors allowed before add raises PokemonImportError, None for no limit.
+        sample_size: An int that holds the number of errors kept per code.
+        counts: A dictionary of error code -> number of errors, in the order the codes were first seen.
+        samples: A dictionary of error code -> list of the first PokemonLineError objects with that code.
+        total: An int that holds the number of errors.
+        file: A string that holds the file of the line being read.
+        line: An int that holds the line number of the line being read.
+        last: The PokemonLineError of the most recent add, None if there is none.
+    """
+
+    def __init__(self, max_errors=None, sample_size=SAMPLE_SIZE):
+        """Initializes an empty report."""
+        self.max_errors = max_errors
+        self.sample_size = sample_size
+        self.counts = dict()
+        self.samples = dict()
+        self.total = 0
+        self.file = None
+        self.line = None
+        self.last = None
+
+    def at(self, file, line):
+        """Sets the file and line number of the line being read, used for errors added next."""
+        self.file = file
+        self.line = line
+
+    def add(self, description, text, column=None):
+        """Records an invalid line at the current file and line number.
+
+        Raises:
+            PokemonImportError: The report has more than max_errors errors.
+        """
+        self.record(PokemonLineError(description, self.file, self.line, column, text))
+
+    def record(self, error):
+        """Records a PokemonLineError, for example one found by another process.
+
+        Raises:
+            PokemonImportError: The report has more than max_errors errors.
+        """
+        self.total += 1
+        self.counts[error.code] = self.counts.get(error.code, 0) + 1
+        self.last = error
+
+        samples = self.samples.setdefault(error.code, [])
+
+        if len(samples) < self.sample_size:
+            samples.append(error)
+
+        if self.max_errors is not None and self.total > self.max_errors:
+            raise PokemonImportError(self)
+
+    def __len__(self):
+        return self.total
+
+    def summary(self):
+        """Returns a dictionary of error code -> (count, samples), in the order the codes were first seen."""
+        return {code: (count, self.samples[code]) for code, count in self.counts.items()}
+
+    def log(self, logger):
+        """Logs one error line per error code with its count and first sample."""
+        for code, count in self.counts.items():
+            first = self.samples[code][0]
+            logger.error(f"{first.description}: {first.text} ({count} lines with {code}, first at {first.file}:{first.line}, column {first.column})")
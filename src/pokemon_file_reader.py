@@ -1,6 +1,14 @@
 import pokemon_move
 import pokemon_ability
-import importlib
+import pokemon_card
+import pokemon_effect_resolver
+import pokemon_error_report
+import pokemon_line_parser
+import pokemon_parse_cache
+import pokemon_profiler
+import pokemon_type_table
+import os
+from contextlib import contextmanager
 from pathlib import Path
 from logger import get_logger
 
@@ -8,24 +16,51 @@ class PokemonFileReader:
     """Loads standard and custom pokemon data from files.
 
     Attributes:
-        types: A set of allowed types.
+        types: A pokemon_parse_cache.PokemonTypeSet of allowed types, assigning any set of names replaces it.
+        type_table: A pokemon_type_table object that gives each allowed type a dense integer id, types assigned without one get theirs in energy_cost.
         moves: A dictionary of allowed moves where the key is the name and the value a pokemon_move object.
+        abilities: A dictionary of allowed abilities where the key is the name and the value a pokemon_ability object.
+        cards: A dictionary of allowed cards where the key is the name and the value a pokemon_card.PokemonCardDefinition object.
+        effect_resolver: A pokemon_effect_resolver object that looks up effect functions by name.
+        error_report: The pokemon_error_report.PokemonErrorReport invalid lines are added to while a
+            read_all function runs, None otherwise, when every invalid line is logged.
+        error_reports: A dictionary of "moves", "abilities" or "cards" -> the error report of the last read_all function.
+        parse_cache: A pokemon_parse_cache.PokemonParseCache of the moves and abilities read, by line text and types.
+        error_capture: A list that the errors of the line being parsed are added to, None if they are not captured.
+        profiler: A pokemon_profiler.PokemonProfiler parsing and effect resolution are timed in, None unless enable_profiling was called.
         logger: A general logger passed from logger.py.
     """
 
-    def __init__(self):
-        """Initializes the instance with default values."""
+    def __init__(self, cache_size=pokemon_parse_cache.CACHE_SIZE):
+        """Initializes the instance with default values, cache_size is the number of move and ability lines cached."""
 
-        self.types = set()
+        self.types = pokemon_parse_cache.PokemonTypeSet()
+        self.type_table = pokemon_type_table.PokemonTypeTable()
         self.moves = dict()
         self.abilities = dict()
+        self.cards = dict()
+        self.effect_resolver = pokemon_effect_resolver.PokemonEffectResolver()
+        self.error_report = None
+        self.error_reports = dict()
+        self.parse_cache = pokemon_parse_cache.PokemonParseCache(cache_size)
+        self.error_capture = None
+        self.profiler = None
         self.logger = get_logger(__name__)
 
+    @property
+    def types(self):
+        return self.allowed_types
+
+    @types.setter
+    def types(self, names):
+        self.allowed_types = pokemon_parse_cache.PokemonTypeSet(names)
+
     def read_all_types(self):
         """Reads allowed types from files.
 
         Reads allowed types from pokemon_standard_types.txt and pokemon_custom_types.txt 
-        and stores in self.types. 
+        and stores in self.types. Each type is also given an id in self.type_table, standard
+        types first, in file order.
         
         - If no standard file is provided, it does not read from
         any file.
@@ -42,6 +77,7 @@ class PokemonFileReader:
             with open("pokemon_standard_types.txt", 'r') as file:
                 for line in file:
                     self.types.add(line.strip())
+                    self.type_table.add(line.strip())
 
             self.logger.info("Imported standard types from file")
         else:
@@ -53,6 +89,7 @@ class PokemonFileReader:
             with open("pokemon_custom_types.txt", 'r') as file:
                 for line in file:
                     self.types.add(line.strip())
+                    self.type_table.add(line.strip())
 
             self.logger.info("Imported custom types from file")
         else:
@@ -60,87 +97,326 @@ class PokemonFileReader:
 
         return self.types
     
-    def read_all_moves(self):
+    def read_all_moves(self, max_errors=None):
         """Reads valid moves from files.
         
         Reads valid moves from pokemon_standard_moves.txt and pokemon_custom_moves.txt
         and stores in self.moves. If a file doesn't exist, or contains invalid moves,
         skips file/all invalid moves.
 
+        Invalid lines are collected in self.error_reports["moves"] and logged once per kind
+        of error when reading ends.
+
+        Args:
+            max_errors: An int that holds the number of invalid lines allowed before the import stops, None for no limit.
+
+        Raises:
+            pokemon_error_report.PokemonImportError: There are more than max_errors invalid lines.
+
         Returns:
             A dictionary, self.moves, which stores move name -> pokemon_move object.
         """
 
-        # Reads from pokemon_standard_moves.txt
-        if Path("pokemon_standard_moves.txt").exists():
-            with open("pokemon_standard_moves.txt", 'r') as file:
-                for line in file:
-                    move = self.read_move(line)
-
-                    if move is not None:
-                        self.moves[move.name] = move 
-
-            self.logger.info("Imported standard moves from file")
-        else:
-            self.logger.error("Cannot locate standard moves file, pokemon_standard_moves.txt, did not import any moves")
-            return dict()
+        with self.collect_errors("moves", max_errors):
+            # Reads from pokemon_standard_moves.txt
+            if Path("pokemon_standard_moves.txt").exists():
+                self.use_cache()
+                self.read_lines("pokemon_standard_moves.txt", self.read_move, self.moves)
 
-        # Reads from pokemon_custom_moves.txt
-        if Path("pokemon_custom_moves.txt").exists():
-            with open("pokemon_custom_moves.txt", 'r') as file:
-                for line in file:
-                    move = self.read_move(line)
+                self.logger.info("Imported standard moves from file")
+            else:
+                self.logger.error("Cannot locate standard moves file, pokemon_standard_moves.txt, did not import any moves")
+                return dict()
 
-                    if move is not None:
-                       self.moves[move.name] = move 
+            # Reads from pokemon_custom_moves.txt
+            if Path("pokemon_custom_moves.txt").exists():
+                self.use_cache()
+                self.read_lines("pokemon_custom_moves.txt", self.read_move, self.moves)
 
-            self.logger.info("Imported custom moves from file")
-        else:
-            self.logger.info("Cannot locate custom moves file, pokemon_custom_moves.txt, did not import any custom moves")
+                self.logger.info("Imported custom moves from file")
+            else:
+                self.logger.info("Cannot locate custom moves file, pokemon_custom_moves.txt, did not import any custom moves")
 
-        return self.moves
+            return self.moves
 
-    def read_all_abilities(self):
+    def read_all_abilities(self, max_errors=None):
         """Reads valid abilities from files.
         
         Reads valid abilities from pokemon_standard_abilities.txt and pokemon_custom_abilities.txt
         and stores in self.abilities. If a file doesn't exist, or contains invalid abilities,
         skips file/all invalid abilities.
 
+        Invalid lines are collected in self.error_reports["abilities"] and logged once per kind
+        of error when reading ends.
+
+        Args:
+            max_errors: An int that holds the number of invalid lines allowed before the import stops, None for no limit.
+
+        Raises:
+            pokemon_error_report.PokemonImportError: There are more than max_errors invalid lines.
+
         Returns:
             A dictionary, self.abilities, which stores ability name -> pokemon_ability object.
         """
 
-        # Reads from pokemon_standard_abilities.txt
-        if Path("pokemon_standard_abilities.txt").exists():
-            with open("pokemon_standard_abilities.txt", 'r') as file:
-                for line in file:
-                    ability = self.read_ability(line)
+        with self.collect_errors("abilities", max_errors):
+            # Reads from pokemon_standard_abilities.txt
+            if Path("pokemon_standard_abilities.txt").exists():
+                self.use_cache()
+                self.read_lines("pokemon_standard_abilities.txt", self.read_ability, self.abilities)
 
-                    if ability is not None:
-                        self.abilities[ability.name] = ability 
+                self.logger.info("Imported standard abilities from file")
+            else:
+                self.logger.error("Cannot locate standard abilities file, pokemon_standard_abilities.txt, did not import any abilities")
+                return dict()
+
+            # Reads from pokemon_custom_abilities.txt
+            if Path("pokemon_custom_abilities.txt").exists():
+                self.use_cache()
+                self.read_lines("pokemon_custom_abilities.txt", self.read_ability, self.abilities)
+
+                self.logger.info("Imported custom abilities from file")
+            else:
+                self.logger.info("Cannot locate custom abilities file, pokemon_custom_abilities.txt, did not import any custom abilities")
+
+            return self.abilities
+
+    def read_all_cards(self, max_errors=None):
+        """Reads valid cards from files.
+        
+        Reads valid cards from pokemon_standard_cards.txt and pokemon_custom_cards.txt
+        and stores in self.cards. If a file doesn't exist, or contains invalid cards,
+        skips file/all invalid cards. Moves, abilities and types must be read first.
+
+        Invalid lines are collected in self.error_reports["cards"] and logged once per kind
+        of error when reading ends.
+
+        Args:
+            max_errors: An int that holds the number of invalid lines allowed before the import stops, None for no limit.
+
+        Raises:
+            pokemon_error_report.PokemonImportError: There are more than max_errors invalid lines.
+
+        Returns:
+            A dictionary, self.cards, which stores card name -> pokemon_card.PokemonCardDefinition object.
+        """
+
+        with self.collect_errors("cards", max_errors):
+            # Reads from pokemon_standard_cards.txt
+            if Path("pokemon_standard_cards.txt").exists():
+                self.read_lines("pokemon_standard_cards.txt", self.read_card, self.cards)
+
+                self.logger.info("Imported standard cards from file")
+            else:
+                self.logger.error("Cannot locate standard cards file, pokemon_standard_cards.txt, did not import any cards")
+                return dict()
+
+            # Reads from pokemon_custom_cards.txt
+            if Path("pokemon_custom_cards.txt").exists():
+                self.read_lines("pokemon_custom_cards.txt", self.read_card, self.cards)
+
+                self.logger.info("Imported custom cards from file")
+            else:
+                self.logger.info("Cannot locate custom cards file, pokemon_custom_cards.txt, did not import any custom cards")
 
-            self.logger.info("Imported standard abilities from file")
+            return self.cards
+
+    @contextmanager
+    def collect_errors(self, kind, max_errors=None):
+        """Collects the invalid lines read inside the block in a new error report, then logs it.
+
+        Args:
+            kind: A string, the key of the report in self.error_reports.
+            max_errors: An int that holds the number of invalid lines allowed, None for no limit.
+        """
+        self.error_report = pokemon_error_report.PokemonErrorReport(max_errors)
+        self.error_reports[kind] = self.error_report
+
+        try:
+            yield self.error_report
+        finally:
+            self.error_report.log(self.logger)
+            self.error_report = None
+
+    def read_lines(self, file_name, read_line, records):
+        """Reads every line of a file with read_line and stores the valid records by name."""
+        for record in self.iter_records(file_name, read_line, self.error_report):
+            if not isinstance(record, pokemon_error_report.PokemonLineError):
+                records[record.name] = record
+
+    def iter_records(self, source, read_line, report=None):
+        """Reads records one line at a time, yielding each record or error as soon as its line is read.
+
+        Args:
+            source: A path to open, or any iterable of lines such as an open file, sys.stdin or a
+                text stream from gzip.open. Byte lines are decoded as UTF-8.
+            read_line: A function that reads one line, such as self.read_move.
+            report: A pokemon_error_report.PokemonErrorReport the errors are also added to, a new
+                report without a limit if None.
+
+        Raises:
+            pokemon_error_report.PokemonImportError: The report has more than its max_errors errors.
+
+        Yields:
+            The record read from each valid line, or a pokemon_error_report.PokemonLineError for each
+            invalid line.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r') as file:
+                yield from self.iter_records_from(file, str(source), read_line, report)
         else:
-            self.logger.error("Cannot locate standard abilities file, pokemon_standard_abilities.txt, did not import any abilities")
-            return dict()
+            yield from self.iter_records_from(source, getattr(source, "name", None), read_line, report)
 
-        # Reads from pokemon_custom_abilities.txt
-        if Path("pokemon_custom_abilities.txt").exists():
-            with open("pokemon_custom_abilities.txt", 'r') as file:
-                for line in file:
-                    ability = self.read_ability(line)
+    def iter_records_from(self, lines, file_name, read_line, report, first_line=1):
+        """Yields the records and errors of an iterable of lines, see iter_records.
+
+        Args:
+            first_line: An int that holds the line number of the first line, for lines taken from the middle of a file.
+        """
+        report = pokemon_error_report.PokemonErrorReport() if report is None else report
+        outer_report = self.error_report
+
+        for line_number, line in enumerate(lines, first_line):
+            if isinstance(line, bytes):
+                line = line.decode()
+
+            report.at(file_name, line_number)
+            errors = report.total
+            self.error_report = report
+
+            try:
+                record = read_line(line)
+            finally:
+                self.error_report = outer_report
+
+            if record is not None:
+                yield record
+            elif report.total > errors:
+                yield report.last
+
+    def iter_moves(self, source, report=None):
+        """Yields the moves, or pokemon_error_report.PokemonLineError objects, of a path or iterable of lines, see iter_records."""
+        self.use_cache()
 
-                    if ability is not None:
-                       self.abilities[ability.name] = ability 
+        return self.iter_records(source, self.read_move, report)
 
-            self.logger.info("Imported custom abilities from file")
+    def iter_abilities(self, source, report=None):
+        """Yields the abilities, or pokemon_error_report.PokemonLineError objects, of a path or iterable of lines, see iter_records."""
+        self.use_cache()
+
+        return self.iter_records(source, self.read_ability, report)
+
+    def iter_cards(self, source, report=None):
+        """Yields the cards, or pokemon_error_report.PokemonLineError objects, of a path or iterable of lines, see iter_records."""
+        return self.iter_records(source, self.read_card, report)
+
+    def enable_profiling(self, profiler=None):
+        """Starts timing read_move, read_ability and read_card as parsing, and effect function lookups as effect resolution.
+
+        Parsing includes effect resolution, and lines returned from the parse cache are counted too.
+
+        Args:
+            profiler: A pokemon_profiler.PokemonProfiler to add to, a new one if None.
+
+        Returns:
+            The profiler, also stored in self.profiler.
+        """
+        self.profiler = pokemon_profiler.PokemonProfiler() if profiler is None else profiler
+
+        for name in ("read_move", "read_ability", "read_card"):
+            setattr(self, name, self.profiler.timed(pokemon_profiler.PARSE, getattr(type(self), name).__get__(self)))
+
+        resolver = self.effect_resolver
+        resolver.resolve = self.profiler.timed(pokemon_profiler.EFFECT_RESOLUTION, type(resolver).resolve.__get__(resolver))
+
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stops timing and removes the timed wrappers, the profiler keeps its counters."""
+        for name in ("read_move", "read_ability", "read_card"):
+            self.__dict__.pop(name, None)
+
+        self.effect_resolver.__dict__.pop("resolve", None)
+        self.profiler = None
+
+    def line_error(self, description, text, column=None):
+        """Adds an invalid line to the current error report, or logs it if no report is being collected."""
+        if self.error_capture is not None:
+            self.error_capture.append((description, column))
+
+        if self.error_report is None:
+            self.logger.error(f"{description}: {text}")
         else:
-            self.logger.info("Cannot locate custom abilities file, pokemon_custom_abilities.txt, did not import any custom abilities")
+            self.error_report.add(description, text, column)
+
+    def use_cache(self):
+        """Looks lines up in the parse cache again if it went cold, called before each file is read."""
+        self.parse_cache.warm()
 
-        return self.abilities
+    def read_cached(self, kind, text, parse):
+        """Reads a line through the parse cache.
 
-    def read_move(self, move_text):
+        On a hit the cached record is returned and the errors the line produced when it was parsed
+        are reported again, so a cached invalid line is logged or added to the error report just
+        like a parsed one. A disabled cache calls parse directly.
+
+        Args:
+            kind: A string, the kind of record, part of the cache key.
+            text: A string that holds the line.
+            parse: A function that reads the line without the cache.
+
+        Returns:
+            The record, shared with every other line with the same text, or None if the line is invalid.
+        """
+        parse_cache = self.parse_cache
+
+        if parse_cache.max_size <= 0:
+            return parse(text)
+
+        if parse_cache.types_version != self.allowed_types.version:
+            parse_cache.use_types(self.allowed_types.version)
+
+        # Lines are keyed without their line ending, a hit in the previous generation moves the entry back
+        key = (kind, text.rstrip("\r\n"))
+        entry = parse_cache.entries.get(key)
+
+        if entry is None:
+            entry = parse_cache.previous.pop(key, None)
+
+            if entry is not None:
+                parse_cache.store(key, entry)
+
+        if entry is not None:
+            parse_cache.hits += 1
+            parse_cache.misses_since_hit = 0
+            record, errors = entry
+
+            for description, column in errors:
+                self.line_error(description, text, column)
+
+            return record
+
+        parse_cache.misses += 1
+        parse_cache.misses_since_hit += 1
+
+        # Once more than max_size lines in a row missed, the line is not stored and the next ones are not looked up
+        if parse_cache.misses_since_hit > parse_cache.max_size:
+            parse_cache.cold = True
+            return parse(text)
+
+        outer_capture = self.error_capture
+        capture = self.error_capture = []
+
+        try:
+            record = parse(text)
+        finally:
+            self.error_capture = outer_capture
+
+        parse_cache.store(key, (record, tuple(capture)))
+
+        return record
+
+    def read_move(self, move_text, cache=True):
         """Reads a move from a text string
 
         Reads a move from a string in the form "Move Name: [Name], Energies: [Types seperated by the delimiter '; '], 
@@ -154,105 +430,85 @@ class PokemonFileReader:
         If formatting of string is incorrect, no name is given, an illegal type is used for energy, move
         damage value isn't a number, or the effect function does not exist, then returns None.
 
+        Lines read before with the same types are returned from self.parse_cache, see read_cached.
+
         Args:
             move_text: A string that contains an encoded move
+            cache: A bool, False to read the line without self.parse_cache.
         
         Returns:
             A pokemon_move object that stores the move's details; None is returned if invalid input
         """
 
-        move_elements = move_text.split(", ")
+        # A cold cache is not looked up until the next file, checked here since it runs for every line
+        if cache and not self.parse_cache.cold:
+            return self.read_cached("moves", move_text, self.parse_move)
 
-        if len(move_elements) != 4:
-            self.logger.error(f"Error in formatting of move: {move_text}")
-            return None
-
-        move = pokemon_move.PokemonMove()
+        values, error = pokemon_line_parser.parse_move_line(move_text)
 
-        # Reads move name
-        move_name_split = move_elements[0].split("Move Name:")
+        # Energies are checked against the allowed types before any later formatting error is reported
+        if len(values) > 1:
+            energies = tuple(values[1])
+            energy_cost = self.allowed_types.costs.get(energies)
 
-        if len(move_name_split) != 2:
-            self.logger.error(f"Error in formatting of move name for move: {move_text}")
-            return None
-        elif len(move_name_split[1].strip()) == 0:
-            self.logger.error(f"No name is given for move: {move_text}")
-            return None
-        
-        move.name = move_name_split[1].strip()
+            if energy_cost is None:
+                energy_cost = self.energy_cost(energies)
 
-        # Reads move energies
-        move_energy_split = move_elements[1].split("Energies:")
+                if energy_cost is None:
+                    self.line_error("Illegal energy type used in move", move_text, pokemon_line_parser.field_column(move_text, pokemon_line_parser.MOVE_KEYS, 1))
+                    return None
 
-        if len(move_energy_split) != 2:
-            self.logger.error(f"Error in formatting of move energy for move: {move_text}")
+        if error is not None:
+            self.line_error(error.description, move_text, error.column)
             return None
 
-        energy_list = []
-
-        if move_energy_split[1].strip() != "None":
-            for energy in move_energy_split[1].strip().split(";"):
-                energy = energy.strip()
+        name, energy, damage, effect_name = values
 
-                if energy not in self.types:
-                    self.logger.error(f"Illegal energy type used in move: {move_text}")
-                    return None
-                
-                energy_list.append(energy)
+        # Reads move effect
+        if effect_name is None:
+            return pokemon_move.PokemonMove(name, energy, energy_cost, damage)
 
-        move.energy = energy_list
+        if not self.effect_resolver.modules_exist(pokemon_effect_resolver.MOVE_EFFECT_MODULES):
+            self.line_error("Move effect modules are not present", move_text, pokemon_line_parser.field_column(move_text, pokemon_line_parser.MOVE_KEYS, 3))
+            return None
 
-        # Reads move damage
-        move_damage_split = move_elements[2].split("Damage:")
+        effect = self.effect_resolver.resolve(pokemon_effect_resolver.MOVE_EFFECT_MODULES, effect_name)
 
-        if len(move_damage_split) != 2:
-            self.logger.error(f"Error in formatting of move damage for move: {move_text}")
+        if effect is None:
+            self.line_error("Move effect function does not exist for move", move_text, pokemon_line_parser.field_column(move_text, pokemon_line_parser.MOVE_KEYS, 3))
             return None
-        elif not move_damage_split[1].strip().isdigit():
-            self.logger.error(f"Move damage value is not digit for move: {move_text}")
+
+        return pokemon_move.PokemonMove(name, energy, energy_cost, damage, effect)
+    
+    def parse_move(self, move_text):
+        """Reads a move without the parse cache, see read_move."""
+        # The read_move of the class, since enable_profiling times the one of the instance
+        return type(self).read_move(self, move_text, False)
+
+    def energy_cost(self, energies):
+        """Returns the cost vector of a tuple of energy names, None if one of them is not an allowed type.
+
+        If an energy has no id in self.type_table yet, every allowed type without one is given an
+        id, in name order. Moves share a few energy lists, so the vector is kept in
+        self.types.costs, which read_move looks in first and which is dropped whenever the
+        allowed types change.
+        """
+        if not self.allowed_types.issuperset(energies):
             return None
 
-        move.damage = int(move_damage_split[1].strip())
+        try:
+            cost = self.type_table.cost_vector(energies)
+        except ValueError:
+            for name in sorted(self.allowed_types.difference(self.type_table.ids)):
+                self.type_table.add(name)
 
-        # Reads move effect
-        move_effect_split = move_elements[3].split("Effect Function:")
+            cost = self.type_table.cost_vector(energies)
 
-        if len(move_effect_split) != 2:
-            self.logger.error(f"Error in formatting of move function for move: {move_text}")
-            return None
-        elif move_effect_split[1].strip() == "None":
-            move.effect = None
-            return move
-        
-        standard_function_list = None
-        custom_function_list = None
-        
-        standard_exists = False
-        custom_exists = False
-        
-        if Path.exists("pokemon_standard_move_effect_list.py"):
-            standard_function_list = importlib.import_module("pokemon_standard_move_effect_list")
-            standard_exists = True
-       
-        if Path.exists("pokemon_custom_move_effect_list.py"):
-            custom_function_list = importlib.import_module("pokemon_custom_move_effect_list")
-            custom_exists = True
-
-        if not (standard_exists or custom_exists):
-            self.logger.error("Move effect modules are not present")
-            return None
-        
-        if standard_exists and move_effect_split[1].strip() in dir(standard_function_list):
-            move.effect = getattr(standard_function_list, move_effect_split[1].strip())
-        elif custom_exists and move_effect_split[1].strip() in dir(custom_function_list):
-            move.effect = getattr(custom_function_list, move_effect_split[1].strip())
-        else:
-            self.logger.error(f"Move effect function does not exist for move: {move_text}")
-            return None
+        self.allowed_types.costs[energies] = cost
 
-        return move
-    
-    def read_ability(self, ability_text):
+        return cost
+
+    def read_ability(self, ability_text, cache=True):
         """Reads an ability from a text string.
 
         Reads a ability from a string in the form "Ability Name: [Name], Type: [Active or Passive], Activation Function: [Name of Activation Function], Effect Function: [Name of Effect Function]".
@@ -268,112 +524,104 @@ class PokemonFileReader:
         If formatting of string is incorrect, no name is given, the type is not Active or Passive, or the activation or 
         effect function does not exist, then returns None.
 
+        Lines read before are returned from self.parse_cache, see read_cached.
+
         Args:
             ability_text: A string that contains an encoded ability.
+            cache: A bool, False to read the line without self.parse_cache.
         
         Returns:
             A pokemon_ability object that stores the ability's details; None is returned if invalid input.
         """
 
-        ability_elements = ability_text.split(", ")
+        # A cold cache is not looked up until the next file, checked here since it runs for every line
+        if cache and not self.parse_cache.cold:
+            return self.read_cached("abilities", ability_text, self.parse_ability)
+
+        values, error = pokemon_line_parser.parse_ability_line(ability_text)
+        activation_condition = None
+
+        # Activation function is checked before any later formatting error is reported
+        if len(values) > 2 and values[2] is not None:
+            activation_condition = self.effect_resolver.resolve(pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES, values[2])
+
+            if activation_condition is None:
+                self.line_error("Ability activation function does not exist for ability", ability_text, pokemon_line_parser.field_column(ability_text, pokemon_line_parser.ABILITY_KEYS, 2))
+                return None
 
-        if len(ability_elements) != 4:
-            self.logger.error(f"Error in formatting of ability: {ability_text}")
+        if error is not None:
+            self.line_error(error.description, ability_text, error.column)
             return None
 
-        ability = pokemon_ability.PokemonAbility()
+        name, passive, _, effect_name = values
+        depends_on = getattr(activation_condition, "depends_on", None)
 
-        ability.usable = False
+        # Reads ability effect
+        if effect_name is None:
+            return pokemon_ability.PokemonAbility(name, passive, activation_condition, False, None, depends_on)
 
-        # Reads ability name
-        ability_name_split = ability_elements[0].split("Ability Name:")
+        effect = self.effect_resolver.resolve(pokemon_effect_resolver.ABILITY_EFFECT_MODULES, effect_name)
 
-        if len(ability_name_split) != 2:
-            self.logger.error(f"Error in formatting of ability name for ability: {ability_text}")
-            return None
-        elif len(ability_name_split[1].strip()) == 0:
-            self.logger.error(f"No name is given for ability: {ability_text}")
+        if effect is None:
+            self.line_error("Ability effect function does not exist for ability", ability_text, pokemon_line_parser.field_column(ability_text, pokemon_line_parser.ABILITY_KEYS, 3))
             return None
+
+        return pokemon_ability.PokemonAbility(name, passive, activation_condition, False, effect, depends_on)
+    
+    def parse_ability(self, ability_text):
+        """Reads an ability without the parse cache, see read_ability."""
+        # The read_ability of the class, since enable_profiling times the one of the instance
+        return type(self).read_ability(self, ability_text, False)
+
+    def read_card(self, card_text):
+        """Reads a card from a text string.
+
+        Reads a card from a string in the form "Card Name: [Name], Card Type: [Kind of card], Pre Evolution: [Name or None],
+        Health: [Numerical Amount], Type: [Type], Weakness: [Type or None], Abilities: [Ability names seperated by the
+        delimiter '; ' or None], Moves: [Move names seperated by the delimiter '; ' or None]".
+
+        For example: "Card Name: Raichu, Card Type: Pokemon, Pre Evolution: Pikachu, Health: 120, Type: Lightning, Weakness: Fighting, Abilities: None, Moves: Thunderbolt".
+
+        If formatting of string is incorrect, no name is given, health isn't a number, an illegal type is used for
+        the type or weakness, or a move or ability has not been read, then returns None.
+
+        Args:
+            card_text: A string that contains an encoded card.
         
-        ability.name = ability_name_split[1].strip()
+        Returns:
+            A pokemon_card.PokemonCardDefinition object that stores the card's details; None is returned if invalid input.
+        """
 
-        # Reads ability type
-        ability_type_split = ability_elements[1].split("Type:")
+        values, error = pokemon_line_parser.parse_card_line(card_text)
 
-        if len(ability_type_split) != 2:
-            self.logger.error(f"Error in formatting of ability type for ability: {ability_text}")
+        # Types, abilities and moves are checked before any later formatting error is reported
+        if len(values) > 4 and values[4] not in self.types:
+            self.line_error("Illegal type used in card", card_text, pokemon_line_parser.field_column(card_text, pokemon_line_parser.CARD_KEYS, 4))
             return None
-        elif ability_type_split[1].strip().lower() not in ("passive", "active"):
-            self.logger.error(f"Type value for ability is not passive or active in ability: {ability_text}")
+
+        if len(values) > 5 and values[5] is not None and values[5] not in self.types:
+            self.line_error("Illegal weakness type used in card", card_text, pokemon_line_parser.field_column(card_text, pokemon_line_parser.CARD_KEYS, 5))
             return None
 
-        ability.passive = True if ability_type_split[1].strip().lower() == "passive" else False
+        if len(values) > 6 and not all(name in self.abilities for name in values[6]):
+            self.line_error("Card ability does not exist for card", card_text, pokemon_line_parser.field_column(card_text, pokemon_line_parser.CARD_KEYS, 6))
+            return None
 
-        # Reads ability activation function
-        ability_activation_split = ability_elements[2].split("Activation Function:")
+        if len(values) > 7 and not all(name in self.moves for name in values[7]):
+            self.line_error("Card move does not exist for card", card_text, pokemon_line_parser.field_column(card_text, pokemon_line_parser.CARD_KEYS, 7))
+            return None
 
-        if len(ability_activation_split) != 2:
-            self.logger.error(f"Error in formatting of ability activation function for ability: {ability_text}")
+        if error is not None:
+            self.line_error(error.description, card_text, error.column)
             return None
-        elif ability_activation_split[1].strip() == "None":
-            ability.activation_condition = None
-        else:
-            standard_function_list = None
-            custom_function_list = None
-            
-            standard_exists = False
-            custom_exists = False
-            
-            if Path.exists("pokemon_standard_ability_activation_list.py"):
-                standard_function_list = importlib.import_module("pokemon_standard_ability_activation_list")
-                standard_exists = True
-        
-            if Path.exists("pokemon_custom_ability_activation_list.py"):
-                custom_function_list = importlib.import_module("pokemon_custom_ability_activation_list")
-                custom_exists = True
-            
-            if standard_exists and ability_activation_split[1].strip() in dir(standard_function_list):
-                ability.activation_condition = getattr(standard_function_list, ability_activation_split[1].strip())
-            elif custom_exists and ability_activation_split[1].strip() in dir(custom_function_list):
-                ability.activation_condition = getattr(custom_function_list, ability_activation_split[1].strip())
-            else:
-                self.logger.error(f"Ability activation function does not exist for ability: {ability_text}")
-                return None
 
-        # Reads ability effect
-        ability_effect_split = ability_elements[3].split("Effect Function:")
+        card = pokemon_card.PokemonCardDefinition()
+        card.name, card.card_type, card.pre_evo, card.health, card.type, card.weaknesses, ability_names, move_names = values
+        card.abilties = tuple(self.abilities[name] for name in ability_names)
+        card.moves = tuple(self.moves[name] for name in move_names)
 
-        if len(ability_effect_split) != 2:
-            self.logger.error(f"Error in formatting of ability effect function for ability: {ability_text}")
-            return None
-        elif ability_effect_split[1].strip() == "None":
-            ability.effect = None
-            return ability
-        
-        standard_function_list = None
-        custom_function_list = None
-        
-        standard_exists = False
-        custom_exists = False
-        
-        if Path.exists("pokemon_standard_ability_effect_list.py"):
-            standard_function_list = importlib.import_module("pokemon_standard_ability_effect_list")
-            standard_exists = True
-       
-        if Path.exists("pokemon_custom_ability_effect_list.py"):
-            custom_function_list = importlib.import_module("pokemon_custom_ability_effect_list")
-            custom_exists = True
-        
-        if standard_exists and ability_effect_split[1].strip() in dir(standard_function_list):
-            ability.effect = getattr(standard_function_list, ability_effect_split[1].strip())
-        elif custom_exists and ability_effect_split[1].strip() in dir(custom_function_list):
-            ability.effect = getattr(custom_function_list, ability_effect_split[1].strip())
-        else:
-            self.logger.error(f"Ability effect function does not exist for ability: {ability_text}")
-            return None
+        return card
 
-        return ability
-    
     # NOTE: Create abilities to import
     #   - Passive or active
     #   - Activation condition function
@@ -0,0 +1,291 @@
+import functools
+import re
+
+# Number of distinct energies fields whose split names are kept, see split_energies
+ENERGY_CACHE_SIZE = 16384
+
+MOVE_KEYS = ("Move Name:", "Energies:", "Damage:", "Effect Function:")
+MOVE_LABELS = ("move name", "move energy", "move damage", "move function")
+
+ABILITY_KEYS = ("Ability Name:", "Type:", "Activation Function:", "Effect Function:")
+ABILITY_LABELS = ("ability name", "ability type", "ability activation function", "ability effect function")
+
+# Valid lines in the usual format, one space after each key, no comma or surrounding whitespace in a
+# value and no space in a function name, matched in one pass by the fast paths of the parse functions
+MOVE_LINE = re.compile(r"Move Name: ([^,\s](?:[^,]*[^,\s])?), Energies: ([^,]*), Damage: ([0-9]+), Effect Function: ([^,\s]+)\s*")
+ABILITY_LINE = re.compile(r"Ability Name: ([^,\s](?:[^,]*[^,\s])?), Type: ([A-Za-z]+), Activation Function: ([^,\s]+), Effect Function: ([^,\s]+)\s*")
+
+CARD_KEYS = ("Card Name:", "Card Type:", "Pre Evolution:", "Health:", "Type:", "Weakness:", "Abilities:", "Moves:")
+CARD_LABELS = ("card name", "card type", "card pre evolution", "card health", "card pokemon type", "card weakness", "card abilities", "card moves")
+
+class PokemonParseError:
+    """Holds the reason and location a line failed to parse.
+
+    Attributes:
+        description: A string that describes the error, for example "Error in formatting of move damage for move"
+        column: An int that holds the 0-based column of the line where the error was found
+    """
+
+    def __init__(self, description, column):
+        """Initializes the instance with the given values."""
+        self.description = description
+        self.column = column
+
+    def __eq__(self, other):
+        """Compares contents of self with contents of other error.
+
+        Returns:
+            A boolean, True, if both error's contents are the same, else False"""
+        if not isinstance(other, PokemonParseError):
+            return False
+
+        return self.description == other.description and self.column == other.column
+
+    def __repr__(self):
+        return f"PokemonParseError({self.description!r}, {self.column})"
+
+def split_fields(text, keys):
+    """Splits a line into its raw field values, stopping at the first malformed field.
+
+    Args:
+        text: A string that holds the line.
+        keys: A tuple of the keys each field must start with, in order.
+
+    Returns:
+        A tuple of a list of the raw field values, a list of the columns each value starts at, and
+        the index of the first malformed field (-1 if every field is well formed, len(keys) if the
+        line does not have exactly len(keys) fields). The column of the malformed field is the
+        column the field starts at.
+    """
+
+    elements = text.split(", ")
+    values = []
+    columns = []
+    offset = 0
+
+    if len(elements) != len(keys):
+        return values, columns, len(keys)
+
+    for key, element in zip(keys, elements):
+        stripped = element.lstrip()
+
+        if not stripped.startswith(key):
+            columns.append(offset)
+            return values, columns, len(values)
+
+        columns.append(offset + len(element) - len(stripped) + len(key))
+        values.append(stripped[len(key):])
+        offset += len(element) + 2
+
+    return values, columns, -1
+
+def field_column(text, keys, index):
+    """Returns the column the value of field index starts at, None if the line is malformed before that field."""
+    _, columns, _ = split_fields(text, keys)
+
+    return columns[index] if index < len(columns) else None
+
+def format_error_column(text, keys):
+    """Returns the column of the delimiter past the last expected field, or the end of the line if there are too few fields."""
+    position = -2
+
+    for _ in range(len(keys)):
+        position = text.find(", ", position + 2)
+
+        if position == -1:
+            return len(text)
+
+    return position
+
+@functools.lru_cache(maxsize=ENERGY_CACHE_SIZE)
+def split_energies(energies):
+    """Splits the value of an energies field into a tuple of energy names, () for "None".
+
+    Moves repeat a few energy lists, so the names are cached by the text of the field.
+    """
+    energies = energies.strip()
+
+    if energies == "None":
+        return ()
+
+    return tuple([energy.strip() for energy in energies.split(";")])
+
+def parse_move_line(text):
+    """Parses a move line with one regular expression match, or a split on the field delimiter.
+
+    Parses a string in the form "Move Name: [Name], Energies: [Types seperated by the delimiter '; '],
+    Damage: [Numerical Amount], Effect Function: [Name of effect function]".
+
+    The fields are checked in order and parsing stops at the first invalid field. Checks that need
+    the reader's state, such as allowed types and effect functions, are left to the caller.
+
+    Args:
+        text: A string that contains an encoded move.
+
+    Returns:
+        A tuple of a list of parsed values and a PokemonParseError, or None if the line is valid.
+        The values are the name (string), energies (list of strings), damage (int) and effect
+        function name (string, or None), and only the values before the invalid field are given.
+    """
+
+    match = MOVE_LINE.fullmatch(text)
+
+    # Fast path for valid lines, anything else is checked field by field below to find the error
+    if match is not None:
+        name, energies, damage, effect = match.groups()
+        return [name, list(split_energies(energies)), int(damage), None if effect == "None" else effect], None
+
+    raw, columns, bad_field = split_fields(text, MOVE_KEYS)
+
+    if bad_field == len(MOVE_KEYS):
+        return [], PokemonParseError("Error in formatting of move", format_error_column(text, MOVE_KEYS))
+
+    values = []
+
+    # Reads move name
+    if len(raw) > 0:
+        name = raw[0].strip()
+
+        if len(name) == 0:
+            return values, PokemonParseError("No name is given for move", columns[0])
+
+        values.append(name)
+
+    # Reads move energies
+    if len(raw) > 1:
+        values.append(list(split_energies(raw[1])))
+
+    # Reads move damage
+    if len(raw) > 2:
+        damage = raw[2].strip()
+
+        if not damage.isdecimal():
+            return values, PokemonParseError("Move damage value is not digit for move", columns[2])
+
+        values.append(int(damage))
+
+    if bad_field != -1:
+        return values, PokemonParseError(f"Error in formatting of {MOVE_LABELS[bad_field]} for move", columns[bad_field])
+
+    # Reads move effect
+    effect = raw[3].strip()
+    values.append(None if effect == "None" else effect)
+
+    return values, None
+
+def parse_ability_line(text):
+    """Parses an ability line with one regular expression match, or a split on the field delimiter.
+
+    Parses a string in the form "Ability Name: [Name], Type: [Active or Passive], Activation Function:
+    [Name of Activation Function], Effect Function: [Name of Effect Function]".
+
+    The fields are checked in order and parsing stops at the first invalid field. Checks that need
+    the reader's state, such as activation and effect functions, are left to the caller.
+
+    Args:
+        text: A string that contains an encoded ability.
+
+    Returns:
+        A tuple of a list of parsed values and a PokemonParseError, or None if the line is valid.
+        The values are the name (string), passive (boolean), activation function name (string, or
+        None) and effect function name (string, or None), and only the values before the invalid
+        field are given.
+    """
+
+    match = ABILITY_LINE.fullmatch(text)
+
+    # Fast path for valid lines, anything else is checked field by field below to find the error
+    if match is not None:
+        name, ability_type, activation, effect = match.groups()
+        ability_type = ability_type.lower()
+
+        if ability_type in ("passive", "active"):
+            return [name, ability_type == "passive", None if activation == "None" else activation, None if effect == "None" else effect], None
+
+    raw, columns, bad_field = split_fields(text, ABILITY_KEYS)
+
+    if bad_field == len(ABILITY_KEYS):
+        return [], PokemonParseError("Error in formatting of ability", format_error_column(text, ABILITY_KEYS))
+
+    values = []
+
+    # Reads ability name
+    if len(raw) > 0:
+        name = raw[0].strip()
+
+        if len(name) == 0:
+            return values, PokemonParseError("No name is given for ability", columns[0])
+
+        values.append(name)
+
+    # Reads ability type
+    if len(raw) > 1:
+        ability_type = raw[1].strip().lower()
+
+        if ability_type not in ("passive", "active"):
+            return values, PokemonParseError("Type value for ability is not passive or active in ability", columns[1])
+
+        values.append(ability_type == "passive")
+
+    # Reads ability activation function
+    if len(raw) > 2:
+        activation = raw[2].strip()
+        values.append(None if activation == "None" else activation)
+
+    if bad_field != -1:
+        return values, PokemonParseError(f"Error in formatting of {ABILITY_LABELS[bad_field]} for ability", columns[bad_field])
+
+    # Reads ability effect
+    effect = raw[3].strip()
+    values.append(None if effect == "None" else effect)
+
+    return values, None
+
+def parse_card_line(text):
+    """Parses a card line with a single split on the field delimiter.
+
+    Parses a string in the form "Card Name: [Name], Card Type: [Kind of card], Pre Evolution: [Name or None],
+    Health: [Numerical Amount], Type: [Type], Weakness: [Type or None], Abilities: [Ability names seperated
+    by the delimiter '; ' or None], Moves: [Move names seperated by the delimiter '; ' or None]".
+
+    The fields are checked in order and parsing stops at the first invalid field. Checks that need
+    the reader's state, such as allowed types, moves and abilities, are left to the caller.
+
+    Args:
+        text: A string that contains an encoded card.
+
+    Returns:
+        A tuple of a list of parsed values and a PokemonParseError, or None if the line is valid.
+        The values are the name, card type, pre evolution name (or None), health (int), type,
+        weakness (or None), ability names (list) and move names (list), and only the values before
+        the invalid field are given.
+    """
+
+    raw, columns, bad_field = split_fields(text, CARD_KEYS)
+
+    if bad_field == len(CARD_KEYS):
+        return [], PokemonParseError("Error in formatting of card", format_error_column(text, CARD_KEYS))
+
+    values = []
+
+    for index, field in enumerate(raw):
+        value = field.strip()
+
+        if index in (0, 1, 4) and len(value) == 0:
+            return values, PokemonParseError(f"No {CARD_LABELS[index]} is given for card", columns[index])
+        elif index == 3:
+            if not value.isdecimal():
+                return values, PokemonParseError("Card health value is not digit for card", columns[index])
+
+            value = int(value)
+        elif index in (2, 5) and value == "None":
+            value = None
+        elif index in (6, 7):
+            value = [] if value == "None" else [name.strip() for name in value.split(";")]
+
+        values.append(value)
+
+    if bad_field != -1:
+        return values, PokemonParseError(f"Error in formatting of {CARD_LABELS[bad_field]} for card", columns[bad_field])
+
+    return values, None
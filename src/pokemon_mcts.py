@@ -0,0 +1,258 @@
+import math
+import random
+from collections import OrderedDict
+import pokemon_coin
+from tcg_pocket_emulator import POINTS_TO_WIN
+
+PLAYOUTS = 10000
+EXPLORATION = 1.4
+TABLE_SIZE = 200000
+ROLLOUT_TURNS = 20
+
+class PokemonSearchNode:
+    """Search statistics of one game state, shared by every path that reaches it.
+
+    Attributes:
+        player: An int, the player to act in the state.
+        actions: An array.array of the legal action ids in the state.
+        visits: A list of the number of playouts through each action, indexed like actions.
+        values: A list of the summed scores of those playouts for player, indexed like actions.
+        total: An int that holds the number of playouts through the state.
+    """
+
+    __slots__ = ("player", "actions", "visits", "values", "total")
+
+    def __init__(self, player, actions):
+        """Initializes the node with no playouts."""
+        self.player = player
+        self.actions = actions
+        self.visits = [0] * len(actions)
+        self.values = [0.0] * len(actions)
+        self.total = 0
+
+class PokemonTranspositionTable:
+    """Least recently used table of search nodes, keyed by state hash.
+
+    Attributes:
+        max_size: An int that holds the number of nodes kept.
+        nodes: An OrderedDict of state hash -> PokemonSearchNode, least recently used first.
+        hits: An int that holds the number of lookups that found a node.
+        misses: An int that holds the number of lookups that did not.
+    """
+
+    def __init__(self, max_size=TABLE_SIZE):
+        """Initializes an empty table."""
+        self.max_size = max_size
+        self.nodes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get(self, key):
+        """Returns the node of a state hash, None if it is not in the table."""
+        node = self.nodes.get(key)
+
+        if node is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.nodes.move_to_end(key)
+
+        return node
+
+    def put(self, key, node):
+        """Stores the node of a state hash, dropping the least recently used node when full."""
+        self.nodes[key] = node
+        self.nodes.move_to_end(key)
+
+        if len(self.nodes) > self.max_size:
+            self.nodes.popitem(last=False)
+
+    def clear(self):
+        """Drops every node. The counters are kept."""
+        self.nodes.clear()
+
+def score(emulator):
+    """Returns the score of a state for player one: 1.0 for a win, 0.0 for a loss and 0.5 for a draw.
+
+    Games that are still running are scored from the points difference, between 0.0 and 1.0.
+    """
+    if emulator.finished:
+        return 0.5 if emulator.winner == -1 else 1.0 - emulator.winner
+
+    return min(1.0, max(0.0, 0.5 + (emulator.points(0) - emulator.points(1)) / (2 * POINTS_TO_WIN)))
+
+class PokemonMCTSAgent:
+    """Monte Carlo Tree Search player for PokemonTCGPocketEmulator.
+
+    Each playout starts from a clone of the game with both decks shuffled and a new coin, so
+    draws and coin flips are sampled again on every playout. Actions are picked with UCT while
+    the state is in the transposition table; the first state that is not is added, and the game
+    is then played out with PokemonTCGPocketEmulator.play_turn for at most rollout_turns turns.
+
+    Nodes are keyed by PokemonTCGPocketEmulator.state_hash, which hashes decks as multisets, so
+    the same position reached by different actions, draws or playouts shares its statistics, and
+    the table is kept between moves. An action's statistics average over the draws and coin flips
+    that follow it, which makes each action a chance node over the states it can lead to.
+
+    Attributes:
+        playouts: An int that holds the number of playouts per move.
+        exploration: A float, the UCT exploration constant.
+        rollout_turns: An int that holds the number of turns played after leaving the table, None to play to the end.
+        table: A PokemonTranspositionTable of the nodes searched so far.
+        random: A random.Random used to shuffle decks and seed coins in playouts.
+    """
+
+    def __init__(self, playouts=PLAYOUTS, exploration=EXPLORATION, table_size=TABLE_SIZE, rollout_turns=ROLLOUT_TURNS, seed=None):
+        """Initializes the agent with an empty table.
+
+        Args:
+            playouts: An int that holds the number of playouts per move.
+            exploration: A float, the UCT exploration constant.
+            table_size: An int that holds the number of nodes kept in the transposition table.
+            rollout_turns: An int that holds the number of turns played after leaving the table, None to play to the end.
+            seed: A seed for the playouts; searches with the same seed and state pick the same action.
+        """
+        self.playouts = playouts
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.table = PokemonTranspositionTable(table_size)
+        self.random = random.Random(seed)
+
+    def determinize(self, emulator):
+        """Returns a clone of the game with both decks shuffled and a new coin."""
+        clone = emulator.clone(pokemon_coin.PokemonCoin(self.random.getrandbits(64)))
+
+        for player in (0, 1):
+            self.random.shuffle(clone.deck(player))
+
+        return clone
+
+    def select(self, node):
+        """Returns the index of the action to try in a node: the first untried action, else the one with the highest UCT value."""
+        if node.total < len(node.actions):
+            return node.visits.index(0)
+
+        log_total = math.log(node.total)
+
+        return max(range(len(node.actions)), key=lambda index: node.values[index] / node.visits[index] + self.exploration * math.sqrt(log_total / node.visits[index]))
+
+    def rollout(self, emulator):
+        """Plays the game on with play_turn and returns its score, see score."""
+        last_turn = None if self.rollout_turns is None else emulator.turn + self.rollout_turns
+
+        while not emulator.finished and (last_turn is None or emulator.turn < last_turn):
+            emulator.play_turn()
+
+        return score(emulator)
+
+    def descend(self, emulator):
+        """Picks actions from a determinized clone of the game until it leaves the table or the game ends.
+
+        The visits of every action taken are counted right away, so the next descend before
+        backpropagate is steered to other actions; this is what lets search_batched collect
+        several different leaves at once.
+
+        Returns:
+            A tuple of the path, a list of (node, action index) pairs, and the clone at the leaf.
+        """
+        emulator = self.determinize(emulator)
+        path = []
+
+        while not emulator.finished:
+            key = emulator.state_hash()
+            node = self.table.get(key)
+            new = node is None
+
+            if new:
+                node = PokemonSearchNode(emulator.current_player, emulator.legal_actions())
+                self.table.put(key, node)
+
+            index = self.select(node)
+            node.total += 1
+            node.visits[index] += 1
+            path.append((node, index))
+            emulator.apply_action(node.actions[index])
+
+            if new:
+                break
+
+        return path, emulator
+
+    @staticmethod
+    def backpropagate(path, result):
+        """Adds the score of a playout, for player one, to the actions on its path."""
+        for node, index in path:
+            node.values[index] += result if node.player == 0 else 1.0 - result
+
+    def playout(self, emulator):
+        """Runs one playout from a determinized clone of the game and updates the nodes it passed through."""
+        path, leaf = self.descend(emulator)
+        self.backpropagate(path, self.rollout(leaf))
+
+    def root(self, emulator):
+        """Returns the node of the current state, adding it to the table if it is not there."""
+        key = emulator.state_hash()
+        node = self.table.get(key)
+
+        if node is None:
+            node = PokemonSearchNode(emulator.current_player, emulator.legal_actions())
+            self.table.put(key, node)
+
+        return node
+
+    def search(self, emulator):
+        """Runs self.playouts playouts from the current state.
+
+        Returns:
+            The PokemonSearchNode of the current state.
+        """
+        root = self.root(emulator)
+
+        for _ in range(self.playouts):
+            self.playout(emulator)
+
+        return root
+
+    def search_batched(self, emulator, service, batch_size):
+        """Runs self.playouts playouts from the current state, rolling out batch_size leaves at a time with a rollout service.
+
+        Args:
+            emulator: The PokemonTCGPocketEmulator to search from.
+            service: A pokemon_rollout_service.PokemonRolloutService that plays the rollouts.
+            batch_size: An int that holds the number of leaves sent to the service at once.
+
+        Returns:
+            The PokemonSearchNode of the current state.
+        """
+        root = self.root(emulator)
+        remaining = self.playouts
+
+        while remaining > 0:
+            leaves = [self.descend(emulator) for _ in range(min(batch_size, remaining))]
+            running = [leaf for _, leaf in leaves if not leaf.finished]
+            results = iter(service.rollouts(running, rollout_turns=self.rollout_turns, seed=self.random.getrandbits(64)))
+
+            for path, leaf in leaves:
+                self.backpropagate(path, score(leaf) if leaf.finished else next(results).mean())
+
+            remaining -= len(leaves)
+
+        return root
+
+    def choose_action(self, emulator):
+        """Searches the current state and returns the action id with the most playouts."""
+        root = self.search(emulator)
+
+        return root.actions[max(range(len(root.actions)), key=root.visits.__getitem__)]
+
+    def play_turn(self, emulator):
+        """Plays the rest of the current player's turn with choose_action."""
+        player = emulator.current_player
+        turn = emulator.turn
+
+        while not emulator.finished and emulator.current_player == player and emulator.turn == turn:
+            emulator.apply_action(self.choose_action(emulator))
@@ -1,19 +1,37 @@
 class PokemonMove:
     """Holds data for a single pokemon move.
 
+    Moves are read-only once created, since the reader returns the same move for every line with
+    the same text and every card with the move shares it.
+
     Attributes:
         name: A string that holds move name
-        energy: A list that lists required energy types
+        energy: A tuple that lists required energy types
+        energy_cost: A tuple that counts required energies by type id of the reader's pokemon_type_table
         damage: An int that holds damage value of move
         effect: A function that does the effect of the move
     """
 
-    def __init__(self):
-        """Initializes the instance with default values."""
-        self.name = None
-        self.energy = []
-        self.damage = None
-        self.effect = None
+    __slots__ = ("name", "energy", "energy_cost", "damage", "effect")
+
+    def __init__(self, name=None, energy=(), energy_cost=(), damage=None, effect=None):
+        """Initializes the instance with the given values, energy is stored as a tuple."""
+        set_slot = object.__setattr__
+        set_slot(self, "name", name)
+        set_slot(self, "energy", tuple(energy))
+        set_slot(self, "energy_cost", energy_cost)
+        set_slot(self, "damage", damage)
+        set_slot(self, "effect", effect)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"PokemonMove is read-only, cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"PokemonMove is read-only, cannot delete {name}")
+
+    def __reduce__(self):
+        """Pickles and copies the move through __init__, since its attributes cannot be set."""
+        return PokemonMove, (self.name, self.energy, self.energy_cost, self.damage, self.effect)
 
     def __eq__(self, other):
         """Compares contents of self with contents of other move.
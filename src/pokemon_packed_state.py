@@ -0,0 +1,315 @@
+from array import array
+import pokemon_card
+
+BENCH_SIZE = 3
+SLOT_COUNT = 1 + BENCH_SIZE
+PLAYER_COUNT = 2
+
+NO_CARD = -1
+
+# Stored as the winner while the game is running
+NO_WINNER = -2
+
+# Status codes, the index of each status is stored in the state
+STATUSES = (None, "Asleep", "Burned", "Confused", "Paralyzed", "Poisoned")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Fields of a board slot before its energy counts
+SLOT_DEFINITION = 0
+SLOT_HEALTH = 1
+SLOT_STATUS = 2
+SLOT_EVO_READY = 3
+SLOT_ENERGY = 4
+
+class PokemonStateLayout:
+    """Offsets of every field in a packed game state.
+
+    The state is one flat array of ints: the turn, current player, whether energy was attached
+    this turn, a bit mask of the board slots whose ability was used this turn, whether the game is
+    finished and the winner (NO_WINNER while running), then for each player the points, the number
+    of cards in the deck and in the hand and SLOT_COUNT board slots (active first), where each slot
+    is a definition id, health, status code, evo ready flag and one energy count per type. The
+    definition ids of the decks and hands follow these size entries, in the order player one's
+    deck, player one's hand, player two's deck, player two's hand, so they can have any length.
+
+    Attributes:
+        type_count: An int that holds the number of types, the length of each slot's energy counts.
+        slot_size: An int that holds the number of entries in a board slot.
+        player_size: An int that holds the number of entries for one player, without their cards.
+        size: An int that holds the number of entries before the cards.
+    """
+
+    TURN = 0
+    CURRENT_PLAYER = 1
+    ENERGY_ATTACHED = 2
+    ABILITIES_USED = 3
+    FINISHED = 4
+    WINNER = 5
+    HEADER_SIZE = 6
+
+    POINTS = 0
+    DECK = 1
+    HAND = 2
+    SLOTS = 3
+
+    # Fields of the card lists, in the order their cards are stored
+    CARD_LISTS = ((0, DECK), (0, HAND), (1, DECK), (1, HAND))
+
+    def __init__(self, type_count):
+        """Initializes the layout for the given number of types."""
+        self.type_count = type_count
+        self.slot_size = SLOT_ENERGY + type_count
+        self.player_size = self.SLOTS + SLOT_COUNT * self.slot_size
+        self.size = self.HEADER_SIZE + PLAYER_COUNT * self.player_size
+
+    def player(self, player):
+        """Returns the offset of a player's fields."""
+        return self.HEADER_SIZE + player * self.player_size
+
+    def slot(self, player, slot):
+        """Returns the offset of a board slot, slot 0 is the active pokemon and 1 to BENCH_SIZE the bench."""
+        return self.player(player) + self.SLOTS + slot * self.slot_size
+
+class PokemonPackedState:
+    """Whole game state packed into one array, see PokemonStateLayout.
+
+    Copying, hashing and comparing a state each work on the single underlying buffer instead of
+    walking the emulator's lists and card objects.
+
+    Attributes:
+        layout: A PokemonStateLayout that gives the offset of every field.
+        data: An array.array of ints that holds the state.
+    """
+
+    __slots__ = ("layout", "data")
+
+    def __init__(self, layout, data=None):
+        """Initializes the instance with the given data, or an empty board without cards if data is None."""
+        self.layout = layout
+
+        if data is None:
+            data = array("i", [0]) * layout.size
+            data[layout.WINNER] = NO_WINNER
+
+            for player in range(PLAYER_COUNT):
+                for slot in range(SLOT_COUNT):
+                    data[layout.slot(player, slot) + SLOT_DEFINITION] = NO_CARD
+
+        self.data = data
+
+    def copy(self):
+        """Returns an independent copy of the state."""
+        return PokemonPackedState(self.layout, self.data[:])
+
+    def __eq__(self, other):
+        """Compares the buffers of self and other state.
+
+        Returns:
+            A boolean, True, if both states are the same, else False"""
+        if not isinstance(other, PokemonPackedState):
+            return False
+
+        return self.data == other.data
+
+    def __hash__(self):
+        return hash(self.data.tobytes())
+
+    def cards_start(self, player, field):
+        """Returns the offset of the first card of a player's deck or hand, after the cards of the lists before it."""
+        start = self.layout.size
+
+        for other, other_field in self.layout.CARD_LISTS:
+            if (other, other_field) == (player, field):
+                return start
+
+            start += self.data[self.layout.player(other) + other_field]
+
+    def cards(self, player, field):
+        """Returns the definition ids of a player's deck or hand, field is PokemonStateLayout.DECK or HAND."""
+        start = self.cards_start(player, field)
+        return self.data[start:start + self.data[self.layout.player(player) + field]].tolist()
+
+    def set_cards(self, player, field, definition_ids):
+        """Stores definition ids as a player's deck or hand, moving the cards of the lists after it."""
+        start = self.cards_start(player, field)
+        count = self.layout.player(player) + field
+
+        self.data[start:start + self.data[count]] = array("i", definition_ids)
+        self.data[count] = len(definition_ids)
+
+    def deck(self, player):
+        """Returns the definition ids of a player's deck, top card first."""
+        return self.cards(player, self.layout.DECK)
+
+    def set_deck(self, player, definition_ids):
+        """Stores the definition ids of a player's deck, top card first."""
+        self.set_cards(player, self.layout.DECK, definition_ids)
+
+    def hand(self, player):
+        """Returns the definition ids of a player's hand."""
+        return self.cards(player, self.layout.HAND)
+
+    def set_hand(self, player, definition_ids):
+        """Stores the definition ids of a player's hand."""
+        self.set_cards(player, self.layout.HAND, definition_ids)
+
+    def points(self, player):
+        """Returns a player's points."""
+        return self.data[self.layout.player(player) + self.layout.POINTS]
+
+    def set_points(self, player, points):
+        """Stores a player's points."""
+        self.data[self.layout.player(player) + self.layout.POINTS] = points
+
+    def slot(self, player, slot):
+        """Unpacks a board slot.
+
+        Returns:
+            A pokemon_card.PokemonCardInstance, or None if the slot is empty.
+        """
+        offset = self.layout.slot(player, slot)
+        definition_id = self.data[offset + SLOT_DEFINITION]
+
+        if definition_id == NO_CARD:
+            return None
+
+        return pokemon_card.PokemonCardInstance(
+            definition_id,
+            self.data[offset + SLOT_HEALTH],
+            STATUSES[self.data[offset + SLOT_STATUS]],
+            bool(self.data[offset + SLOT_EVO_READY]),
+            tuple(self.data[offset + SLOT_ENERGY:offset + self.layout.slot_size]),
+        )
+
+    def set_slot(self, player, slot, instance):
+        """Packs a pokemon_card.PokemonCardInstance, or None for an empty slot, into a board slot."""
+        offset = self.layout.slot(player, slot)
+
+        if instance is None:
+            self.data[offset:offset + self.layout.slot_size] = array("i", [NO_CARD] + [0] * (self.layout.slot_size - 1))
+            return
+
+        energy = list(instance.energy) + [0] * (self.layout.type_count - len(instance.energy))
+        self.data[offset:offset + self.layout.slot_size] = array("i", [instance.definition_id, instance.health, STATUS_CODES[instance.status], int(bool(instance.evo_ready))] + energy)
+
+    @property
+    def turn(self):
+        """An int that holds the number of turns played."""
+        return self.data[self.layout.TURN]
+
+    @turn.setter
+    def turn(self, turn):
+        self.data[self.layout.TURN] = turn
+
+    @property
+    def current_player(self):
+        """An int that is 0 on player one's turn and 1 on player two's turn."""
+        return self.data[self.layout.CURRENT_PLAYER]
+
+    @current_player.setter
+    def current_player(self, player):
+        self.data[self.layout.CURRENT_PLAYER] = player
+
+    @property
+    def energy_attached(self):
+        """A boolean that is True once the current player has attached energy this turn."""
+        return bool(self.data[self.layout.ENERGY_ATTACHED])
+
+    @energy_attached.setter
+    def energy_attached(self, energy_attached):
+        self.data[self.layout.ENERGY_ATTACHED] = int(bool(energy_attached))
+
+    @property
+    def abilities_used(self):
+        """A set of the board slots whose ability the current player has used this turn."""
+        mask = self.data[self.layout.ABILITIES_USED]
+        return {slot for slot in range(SLOT_COUNT) if mask & (1 << slot)}
+
+    @abilities_used.setter
+    def abilities_used(self, slots):
+        self.data[self.layout.ABILITIES_USED] = sum(1 << slot for slot in set(slots))
+
+    @property
+    def finished(self):
+        """A boolean that is True once the game has ended."""
+        return bool(self.data[self.layout.FINISHED])
+
+    @finished.setter
+    def finished(self, finished):
+        self.data[self.layout.FINISHED] = int(bool(finished))
+
+    @property
+    def winner(self):
+        """An int that holds the winning player, -1 for a draw, None while the game is running."""
+        winner = self.data[self.layout.WINNER]
+        return None if winner == NO_WINNER else winner
+
+    @winner.setter
+    def winner(self, winner):
+        self.data[self.layout.WINNER] = NO_WINNER if winner is None else winner
+
+    @classmethod
+    def from_emulator(cls, emulator, layout):
+        """Packs the state of a PokemonTCGPocketEmulator.
+
+        Args:
+            emulator: A PokemonTCGPocketEmulator whose decks, hands and board hold pokemon_card.PokemonCardInstance objects.
+            layout: A PokemonStateLayout for the number of types in the game.
+
+        Returns:
+            A PokemonPackedState with the emulator's state.
+        """
+        state = cls(layout)
+        state.turn = emulator.turn
+        state.current_player = emulator.current_player
+        state.energy_attached = emulator.energy_attached
+        state.abilities_used = emulator.abilities_used
+        state.finished = emulator.finished
+        state.winner = emulator.winner
+
+        for player, (deck, hand, active, bench, points) in enumerate(emulator_players(emulator)):
+            state.set_deck(player, [card.definition_id for card in deck])
+            state.set_hand(player, [card.definition_id for card in hand])
+            state.set_points(player, points)
+
+            for slot, instance in enumerate([active] + list(bench)):
+                state.set_slot(player, slot, instance)
+
+        return state
+
+    def to_emulator(self, emulator, registry):
+        """Unpacks the state into a PokemonTCGPocketEmulator.
+
+        Args:
+            emulator: A PokemonTCGPocketEmulator whose state is replaced, its action index and hash are told everything changed.
+            registry: The pokemon_card_registry.PokemonCardRegistry the definition ids refer to,
+                used to create the deck and hand cards.
+        """
+        emulator.turn = self.turn
+        emulator.current_player = self.current_player
+        emulator.energy_attached = self.energy_attached
+        emulator.abilities_used = self.abilities_used
+        emulator.finished = self.finished
+        emulator.winner = self.winner
+
+        emulator.deck_one = [registry.new_instance(definition_id) for definition_id in self.deck(0)]
+        emulator.deck_two = [registry.new_instance(definition_id) for definition_id in self.deck(1)]
+        emulator.hand_one = [registry.new_instance(definition_id) for definition_id in self.hand(0)]
+        emulator.hand_two = [registry.new_instance(definition_id) for definition_id in self.hand(1)]
+
+        emulator.board_one_active = self.slot(0, 0)
+        emulator.board_one_passive = [self.slot(0, slot) for slot in range(1, SLOT_COUNT)]
+        emulator.board_two_active = self.slot(1, 0)
+        emulator.board_two_passive = [self.slot(1, slot) for slot in range(1, SLOT_COUNT)]
+
+        emulator.points_one = self.points(0)
+        emulator.points_two = self.points(1)
+
+        emulator.state_changed(None)
+
+def emulator_players(emulator):
+    """Returns the (deck, hand, active, bench, points) of both players of a PokemonTCGPocketEmulator."""
+    return (
+        (emulator.deck_one, emulator.hand_one, emulator.board_one_active, emulator.board_one_passive, emulator.points_one),
+        (emulator.deck_two, emulator.hand_two, emulator.board_two_active, emulator.board_two_passive, emulator.points_two),
+    )
@@ -0,0 +1,163 @@
+import itertools
+
+CACHE_SIZE = 4096
+
+# Versions of every PokemonTypeSet, unique across sets so a replaced set never reuses a version
+VERSIONS = itertools.count(1)
+
+class PokemonTypeSet(set):
+    """Set of allowed types that takes a new version whenever it changes.
+
+    The parse cache only keeps lines read with one version of the types, so it can key lines on
+    their text alone instead of on the text and a copy of the types. The cost vectors of energy
+    lists the reader worked out with these types are kept with the set and dropped on a change,
+    so reading a line never has to check the version.
+
+    Attributes:
+        version: An int that changes whenever the set does, never shared with another set.
+        costs: A dictionary of tuple of energy names -> cost vector, see PokemonFileReader.energy_cost.
+    """
+
+    def __init__(self, names=()):
+        """Initializes the set with the given type names and a new version."""
+        super().__init__(names)
+        self.version = next(VERSIONS)
+        self.costs = dict()
+
+    def changed(self):
+        """Gives the set a new version and drops the cost vectors."""
+        self.version = next(VERSIONS)
+        self.costs.clear()
+
+    def add(self, name):
+        if name not in self:
+            super().add(name)
+            self.changed()
+
+    def discard(self, name):
+        if name in self:
+            super().discard(name)
+            self.changed()
+
+    def remove(self, name):
+        super().remove(name)
+        self.changed()
+
+    def pop(self):
+        name = super().pop()
+        self.changed()
+        return name
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+    def update(self, *others):
+        super().update(*others)
+        self.changed()
+
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self.changed()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self.changed()
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(other)
+        self.changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+class PokemonParseCache:
+    """Approximately least recently used cache of the records read from move and ability lines.
+
+    Entries are keyed on the kind of record and the line without its line ending. Since the
+    allowed types decide whether a move is valid, the cache only holds lines read with one
+    version of the types, see PokemonTypeSet, and is cleared when the version changes. Each entry
+    holds the record, a read-only pokemon_move or pokemon_ability shared by every line with the
+    same text, and the errors the line produced, so they can be reported again on a hit.
+
+    Entries are kept in two generations of plain dictionaries of up to max_size entries each.
+    New entries go into the current generation; when it is full it becomes the previous
+    generation and the old previous one is dropped, and a hit in the previous generation moves
+    the entry back into the current one. So the max_size lines stored last are always cached,
+    and at most twice as many are. A miss costs two dictionary lookups and one store, where an
+    ordered dictionary would also have to keep its order on every store.
+
+    Files of unique lines never hit, and looking them up and keeping their records only costs
+    time, so once max_size lookups in a row have missed the cache is cold, and the reader reads
+    lines without it until it is warmed, before the next file, see PokemonFileReader.use_cache.
+
+    The cache only holds the entries and counters; PokemonFileReader.read_cached looks lines up,
+    stores them and decides when the cache goes cold, since it runs for every line.
+
+    Attributes:
+        max_size: An int that holds the number of entries of each generation, 0 to disable the cache.
+        types_version: The version of the PokemonTypeSet the entries were read with, None while empty.
+        entries: A dictionary of key -> (record or None, tuple of (description, column) errors), the current generation.
+        previous: A dictionary like entries, the previous generation.
+        hits: An int that holds the number of lookups that found an entry.
+        misses: An int that holds the number of lookups that did not.
+        misses_since_hit: An int that holds the number of lookups that missed since the last hit.
+        cold: A bool, True if lines are read without the cache, once more than max_size lookups in a row have missed or if it is disabled.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        """Initializes an empty cache."""
+        self.max_size = max_size
+        self.types_version = None
+        self.entries = dict()
+        self.previous = dict()
+        self.hits = 0
+        self.misses = 0
+        self.misses_since_hit = 0
+        self.cold = max_size <= 0
+
+    def __len__(self):
+        return len(self.entries) + len(self.previous)
+
+    def use_types(self, version):
+        """Clears the cache if its entries were read with another version of the allowed types."""
+        if version != self.types_version:
+            self.clear()
+            self.types_version = version
+
+    def warm(self):
+        """Looks lines up again after the cache went cold, unless it is disabled."""
+        self.misses_since_hit = 0
+        self.cold = self.max_size <= 0
+
+    def store(self, key, entry):
+        """Adds an entry to the current generation, starting a new generation when it is full."""
+        if len(self.entries) >= self.max_size:
+            self.previous = self.entries
+            self.entries = dict()
+
+        self.entries[key] = entry
+
+    def hit_rate(self):
+        """Returns the share of lookups that found an entry, 0.0 if there were none."""
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def clear(self):
+        """Drops every entry, for example after effect modules are reloaded. The counters are kept."""
+        self.entries.clear()
+        self.previous.clear()
@@ -0,0 +1,158 @@
+import marshal
+from time import perf_counter_ns
+
+# Phases timed by the reader and emulator, in report order
+PARSE = "parse"
+EFFECT_RESOLUTION = "effect_resolution"
+DRAW = "draw"
+ENERGY_ATTACH = "energy_attach"
+ATTACK = "attack"
+EFFECT = "effect"
+ABILITY_CHECK = "ability_check"
+KNOCKOUT = "knockout"
+PHASES = (PARSE, EFFECT_RESOLUTION, DRAW, ENERGY_ATTACH, ATTACK, EFFECT, ABILITY_CHECK, KNOCKOUT)
+
+# File name of the phases in pstats files, so they sort apart from real functions
+STATS_FILE = "<phase>"
+
+class PokemonProfiler:
+    """Cumulative wall time and call counts per phase of reading data and playing games.
+
+    Each counter is a [nanoseconds, calls] list added to with time.perf_counter_ns. Phases are
+    timed by wrapping the methods that run them, see timed, and effect functions and activation
+    conditions are also counted by function name, see call, so the report shows which card
+    effects take the most time. Phases nest: attack includes the effects of moves and parse
+    includes effect resolution.
+
+    The reader and emulator only time anything once enable_profiling is called on them; until
+    then no wrapper is installed and profiling costs nothing. Profilers of several worker
+    processes can be merged, and written as a pstats file with dump_stats.
+
+    Attributes:
+        phases: A dictionary of phase -> [nanoseconds, calls].
+        functions: A dictionary of (phase, function name) -> [nanoseconds, calls], for effect functions and activation conditions.
+    """
+
+    def __init__(self):
+        """Initializes the profiler with every counter at zero."""
+        self.phases = {phase: [0, 0] for phase in PHASES}
+        self.functions = dict()
+
+    def counter(self, phase):
+        """Returns the [nanoseconds, calls] counter of a phase, creating it the first time."""
+        counter = self.phases.get(phase)
+
+        if counter is None:
+            counter = self.phases[phase] = [0, 0]
+
+        return counter
+
+    def timed(self, phase, function):
+        """Returns a wrapper of function that adds the time and call of every call to a phase."""
+        counter = self.counter(phase)
+
+        def timed_function(*args, **kwargs):
+            start = perf_counter_ns()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counter[0] += perf_counter_ns() - start
+                counter[1] += 1
+
+        timed_function.__wrapped__ = function
+
+        return timed_function
+
+    def call(self, phase, function, *args):
+        """Calls function with args and adds the time to a phase and to the function's own counter.
+
+        Returns:
+            The value function returns.
+        """
+        key = (phase, getattr(function, "__qualname__", repr(function)))
+        counter = self.functions.get(key)
+
+        if counter is None:
+            counter = self.functions[key] = [0, 0]
+
+        phase_counter = self.counter(phase)
+        start = perf_counter_ns()
+
+        try:
+            return function(*args)
+        finally:
+            elapsed = perf_counter_ns() - start
+            counter[0] += elapsed
+            counter[1] += 1
+            phase_counter[0] += elapsed
+            phase_counter[1] += 1
+
+    def reset(self):
+        """Sets every counter back to zero."""
+        for counter in list(self.phases.values()) + list(self.functions.values()):
+            counter[0] = 0
+            counter[1] = 0
+
+    def merge(self, other):
+        """Adds the counters of another profiler, for example one returned by a worker process."""
+        for phase, (elapsed, calls) in other.phases.items():
+            counter = self.counter(phase)
+            counter[0] += elapsed
+            counter[1] += calls
+
+        for key, (elapsed, calls) in other.functions.items():
+            counter = self.functions.setdefault(key, [0, 0])
+            counter[0] += elapsed
+            counter[1] += calls
+
+    def report(self):
+        """Returns the counters with at least one call as a list of dictionaries, phases first, each sorted by time.
+
+        Each dictionary has the keys "phase", "function" (None for a whole phase), "calls",
+        "seconds" and "mean_ns".
+        """
+        rows = []
+
+        for entries in ([((phase, None), counter) for phase, counter in self.phases.items()], list(self.functions.items())):
+            for (phase, function), (elapsed, calls) in sorted(entries, key=lambda entry: -entry[1][0]):
+                if calls > 0:
+                    rows.append({"phase": phase, "function": function, "calls": calls, "seconds": elapsed / 1e9, "mean_ns": elapsed // calls})
+
+        return rows
+
+    def format_report(self):
+        """Returns the report as a text table."""
+        lines = [f"{'phase':<18} {'function':<40} {'calls':>10} {'seconds':>10} {'mean ns':>10}"]
+
+        for row in self.report():
+            lines.append(f"{row['phase']:<18} {row['function'] or '':<40} {row['calls']:>10} {row['seconds']:>10.4f} {row['mean_ns']:>10}")
+
+        return "\n".join(lines)
+
+    def stats(self):
+        """Returns the counters in the format of pstats.Stats.stats.
+
+        Phases have the file name STATS_FILE, functions the name of their phase, and the
+        functions are listed as called by their phase.
+        """
+        stats = dict()
+
+        for phase, (elapsed, calls) in self.phases.items():
+            if calls > 0:
+                stats[(STATS_FILE, 0, phase)] = (calls, calls, elapsed / 1e9, elapsed / 1e9, dict())
+
+        for (phase, function), (elapsed, calls) in self.functions.items():
+            if calls > 0:
+                callers = {(STATS_FILE, 0, phase): (calls, calls, elapsed / 1e9, elapsed / 1e9)}
+                stats[(phase, 0, function)] = (calls, calls, elapsed / 1e9, elapsed / 1e9, callers)
+
+        return stats
+
+    def dump_stats(self, path):
+        """Writes the counters to a file that pstats.Stats, and tools such as snakeviz, read.
+
+        Files of several workers can be combined with pstats.Stats.add.
+        """
+        with open(path, 'wb') as file:
+            marshal.dump(self.stats(), file)
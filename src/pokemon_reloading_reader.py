@@ -0,0 +1,162 @@
+import hashlib
+import importlib
+import os
+import sys
+from pathlib import Path
+import pokemon_effect_resolver
+import pokemon_file_reader
+
+TYPE_FILES = ("pokemon_standard_types.txt", "pokemon_custom_types.txt")
+
+# Data files of each kind, in the order they are applied (custom entries override standard ones)
+DATA_FILES = {
+    "moves": ("pokemon_standard_moves.txt", "pokemon_custom_moves.txt"),
+    "abilities": ("pokemon_standard_abilities.txt", "pokemon_custom_abilities.txt"),
+    "cards": ("pokemon_standard_cards.txt", "pokemon_custom_cards.txt"),
+}
+
+# Effect modules each kind of record looks its functions up in
+EFFECT_MODULES = {
+    "moves": pokemon_effect_resolver.MOVE_EFFECT_MODULES,
+    "abilities": pokemon_effect_resolver.ABILITY_ACTIVATION_MODULES + pokemon_effect_resolver.ABILITY_EFFECT_MODULES,
+}
+
+class PokemonReloadingReader(pokemon_file_reader.PokemonFileReader):
+    """A long-lived reader that reloads only what changed in its data files and effect modules.
+
+    Each data file and effect module is tracked by its modification time and size, and by a
+    SHA-256 hash of its content when those change. Records are cached by the exact text of their
+    line, so a reload only parses lines that are new or edited; every unchanged line keeps its
+    record object, and cards keep referring to the same move and ability objects.
+
+    A changed effect module is reloaded with importlib.reload and every line of the kind that
+    uses it is parsed again, as are moves when the types change and cards when any move or
+    ability changes. self.types, self.moves, self.abilities and self.cards are updated in place.
+    Type ids are never removed, so energy cost vectors built earlier stay valid.
+
+    Attributes:
+        file_states: A dictionary of file path -> (modification time in ns, size, SHA-256 hex digest).
+        file_lines: A dictionary of data file path -> list of the file's lines.
+        line_records: A dictionary of kind -> dictionary of line text -> the record read from it, or None if it is invalid.
+    """
+
+    def __init__(self):
+        """Initializes the instance with nothing loaded, reload reads every file the first time."""
+        super().__init__()
+        self.file_states = dict()
+        self.file_lines = dict()
+        self.line_records = {kind: dict() for kind in DATA_FILES}
+
+    def file_changed(self, path):
+        """Checks a file against its last known state, and stores its new state and lines if it changed.
+
+        Returns:
+            A boolean, True, if the file's content changed, it appeared or it was removed, else False
+        """
+        if not Path(path).exists():
+            self.file_lines.pop(path, None)
+            return self.file_states.pop(path, None) is not None
+
+        stat = os.stat(path)
+        known = self.file_states.get(path)
+
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.file_states[path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+        if known is not None and known[2] == digest:
+            return False
+
+        self.file_lines[path] = content.decode().splitlines(keepends=True)
+        return True
+
+    def reload(self):
+        """Reloads the types, moves, abilities and cards whose files or effect modules changed.
+
+        Invalid lines that are parsed are collected in self.error_reports; lines that are
+        unchanged since an earlier reload are not reported again.
+
+        Returns:
+            A list of the paths of the data files and effect modules that changed.
+        """
+        changed = [path for path in TYPE_FILES + sum(DATA_FILES.values(), ()) if self.file_changed(path)]
+        stale = set()
+
+        for kind, module_names in EFFECT_MODULES.items():
+            modules = [name for name in module_names if self.file_changed(name + ".py")]
+
+            for name in modules:
+                if name in sys.modules:
+                    importlib.reload(sys.modules[name])
+
+                changed.append(name + ".py")
+                stale.add(kind)
+
+        if len(stale) > 0:
+            self.effect_resolver.clear()
+            self.parse_cache.clear()
+
+        if any(path in changed for path in TYPE_FILES):
+            self.reload_types()
+            stale.add("moves")
+
+        for kind in DATA_FILES:
+            if kind in stale:
+                self.line_records[kind].clear()
+
+            if kind in stale or any(path in changed for path in DATA_FILES[kind]):
+                if self.reload_records(kind) and kind != "cards":
+                    stale.add("cards")
+
+        return changed
+
+    def reload_types(self):
+        """Replaces self.types with the types in the type files, new types are added to self.type_table."""
+        names = [line.strip() for path in TYPE_FILES for line in self.file_lines.get(path, [])]
+
+        self.types.clear()
+        self.types.update(names)
+
+        for name in names:
+            self.type_table.add(name)
+
+    def reload_records(self, kind):
+        """Rebuilds the records of a kind from the cached lines, parsing only lines not seen before.
+
+        Returns:
+            A boolean, True, if any record of the kind was added, removed or replaced, else False
+        """
+        records = {"moves": self.moves, "abilities": self.abilities, "cards": self.cards}[kind]
+        read_line = {"moves": self.read_move, "abilities": self.read_ability, "cards": self.read_card}[kind]
+        cache = self.line_records[kind]
+        new_cache = dict()
+        merged = dict()
+
+        with self.collect_errors(kind) as report:
+            for path in DATA_FILES[kind]:
+                for line_number, line in enumerate(self.file_lines.get(path, []), 1):
+                    if line in new_cache:
+                        record = new_cache[line]
+                    elif line in cache:
+                        record = cache[line]
+                    else:
+                        report.at(path, line_number)
+                        record = read_line(line)
+
+                    new_cache[line] = record
+
+                    if record is not None:
+                        merged[record.name] = record
+
+        self.line_records[kind] = new_cache
+        modified = records.keys() != merged.keys() or any(records[name] is not record for name, record in merged.items())
+
+        records.clear()
+        records.update(merged)
+
+        return modified
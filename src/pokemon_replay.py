@@ -0,0 +1,141 @@
+import bisect
+import pokemon_coin
+import pokemon_state_codec
+import tcg_pocket_emulator
+
+SNAPSHOT_TURNS = 10
+
+class PokemonReplayCoin(pokemon_coin.PokemonCoin):
+    """Coin that gives back the flips of an action log instead of drawing new ones.
+
+    Attributes:
+        recorded: An array.array of the recorded flips, each 0 or 1.
+        index: An int that holds the position of the next flip in recorded.
+    """
+
+    def __init__(self, recorded, index=0):
+        """Initializes the coin at flip index of the recorded flips."""
+        super().__init__()
+        self.recorded = recorded
+        self.index = index
+
+    def flip_coin(self):
+        """Returns the next recorded flip as a CoinSide, also stored in self.state."""
+        self.state = pokemon_coin.CoinSide(self.recorded[self.index])
+        self.index += 1
+        return self.state
+
+    def flip_many(self, count):
+        """Returns the next count recorded flips as an int where bit i is set if flip i was heads."""
+        flips = 0
+
+        for bit in range(max(count, 0)):
+            flips |= self.recorded[self.index + bit] << bit
+
+        self.index += max(count, 0)
+        return flips
+
+class PokemonReplay:
+    """Plays a game again from its pokemon_action_log.PokemonActionLog and seeks to any turn.
+
+    The game is played through once when the replay is created, taking a
+    pokemon_state_codec snapshot at the start of every snapshot_turns-th turn. Seeking to a turn
+    decodes the last snapshot before it and applies only the actions since, without checking
+    that they are legal or recording them again.
+
+    The log holds the decks in their shuffled order, so they are not shuffled again. Games with an
+    int seed get their coin from the seed, as when they were played; any other game gets a
+    PokemonReplayCoin that gives back the recorded flips.
+
+    Attributes:
+        log: The pokemon_action_log.PokemonActionLog that is replayed.
+        registry: The pokemon_card_registry.PokemonCardRegistry the game was played with.
+        snapshot_turns: An int that holds the number of turns between snapshots.
+        snapshots: A list of (turn, action position, flip position, encoded state) tuples, by turn.
+        turns: An int that holds the number of turns in the game.
+    """
+
+    def __init__(self, log, registry, snapshot_turns=SNAPSHOT_TURNS):
+        """Initializes the replay and plays the game through once to take its snapshots."""
+        self.log = log
+        self.registry = registry
+        self.snapshot_turns = snapshot_turns
+        self.snapshots = []
+
+        emulator = self.start()
+        self.snapshot(emulator, 0)
+        self.turns = self.play(emulator, 0, snapshots=True)
+
+    def uses_recorded_flips(self):
+        """Returns True if coin flips come from the log, False if they come from the seed."""
+        return pokemon_state_codec.seed_value(self.log.seed) is None
+
+    def start(self):
+        """Returns an emulator at the start of the game, before the first action."""
+        emulator = tcg_pocket_emulator.PokemonTCGPocketEmulator(self.registry, self.log.seed)
+
+        if self.uses_recorded_flips():
+            emulator.coin = PokemonReplayCoin(self.log.flips)
+
+        emulator.start_game(*self.log.decks, shuffle=False)
+
+        return emulator
+
+    def snapshot(self, emulator, position):
+        """Stores the state of the emulator, which has taken the first position actions of the log."""
+        flip_position = emulator.coin.index if self.uses_recorded_flips() else None
+        self.snapshots.append((emulator.turn, position, flip_position, pokemon_state_codec.encode_state(emulator)))
+
+    def play(self, emulator, position, turn=None, snapshots=False):
+        """Applies the actions from position on until the emulator reaches turn.
+
+        Args:
+            emulator: The tcg_pocket_emulator.PokemonTCGPocketEmulator to apply the actions to.
+            position: An int, the number of actions of the log the emulator has taken.
+            turn: An int, the turn to stop at, None to apply every action left.
+            snapshots: A boolean, True to take a snapshot at the start of every snapshot_turns-th turn.
+
+        Returns:
+            An int, the turn the emulator is at.
+        """
+        actions = self.log.actions
+        last_turn = emulator.turn
+
+        while position < len(actions) and (turn is None or emulator.turn < turn):
+            emulator.apply_action(actions[position])
+            position += 1
+
+            if snapshots and emulator.turn != last_turn and emulator.turn % self.snapshot_turns == 0 and not emulator.finished:
+                self.snapshot(emulator, position)
+
+            last_turn = emulator.turn
+
+        return emulator.turn
+
+    def restore(self, turn):
+        """Returns an emulator in the state of the last snapshot at or before a turn, and the number of actions it has taken."""
+        index = bisect.bisect_right(self.snapshots, turn, key=lambda snapshot: snapshot[0]) - 1
+        _, position, flip_position, encoded = self.snapshots[max(index, 0)]
+        emulator = pokemon_state_codec.decode_state(encoded, self.registry)
+
+        if flip_position is not None:
+            emulator.coin = PokemonReplayCoin(self.log.flips, flip_position)
+
+        return emulator, position
+
+    def seek(self, turn):
+        """Returns an emulator at the start of a turn, after its draw and before its first action.
+
+        Turns after the last turn give the state the game ended in.
+        """
+        emulator, position = self.restore(turn)
+        self.play(emulator, position, turn)
+
+        return emulator
+
+    def final(self):
+        """Returns an emulator in the state the game ended in."""
+        emulator, position = self.restore(self.turns)
+        self.play(emulator, position)
+
+        return emulator
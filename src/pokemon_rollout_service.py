@@ -0,0 +1,295 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pokemon_coin
+import pokemon_mcts
+import pokemon_state_codec
+import tcg_pocket_emulator
+import tcg_pocket_tournament
+from logger import configure_worker_logging, get_logger, logging_options
+
+HEURISTIC = "heuristic"
+RANDOM = "random"
+
+BENCHMARK_WORKERS = (1, 2, 4, 8, 16, 32, 64)
+
+# Card data of a worker process, loaded once by init_worker and shared by every rollout the worker plays
+worker_registry = None
+
+class PokemonRolloutStats:
+    """Aggregated results of rollouts from one state.
+
+    Attributes:
+        games: An int that holds the number of rollouts.
+        wins: A list of the number of rollouts each player won.
+        draws: An int that holds the number of rollouts that ended in a draw.
+        score: A float, the summed pokemon_mcts.score of the rollouts, for player one.
+    """
+
+    __slots__ = ("games", "wins", "draws", "score")
+
+    def __init__(self, games=0, wins=None, draws=0, score=0.0):
+        """Initializes the instance with the given counts."""
+        self.games = games
+        self.wins = [0, 0] if wins is None else wins
+        self.draws = draws
+        self.score = score
+
+    def add(self, emulator):
+        """Counts the result of one rollout that ended in emulator."""
+        self.games += 1
+        self.score += pokemon_mcts.score(emulator)
+
+        if emulator.winner == -1:
+            self.draws += 1
+        elif emulator.winner is not None:
+            self.wins[emulator.winner] += 1
+
+    def merge(self, other):
+        """Adds the counts of other stats to these."""
+        self.games += other.games
+        self.wins = [self.wins[0] + other.wins[0], self.wins[1] + other.wins[1]]
+        self.draws += other.draws
+        self.score += other.score
+
+    def mean(self):
+        """Returns the mean score for player one, 0.5 if there were no rollouts."""
+        return self.score / self.games if self.games > 0 else 0.5
+
+def init_worker(data_directory=None, registry=None, log_options=None):
+    """Process pool initializer, sets up the worker's logging, see logger.configure_worker_logging, and keeps the given registry or loads the card data once per worker."""
+    global worker_registry
+    configure_worker_logging(log_options)
+    worker_registry = tcg_pocket_tournament.load_registry(data_directory) if registry is None else registry
+
+def rollout(emulator, policy, rollout_turns, generator):
+    """Plays a game on until it ends or rollout_turns more turns are played.
+
+    Args:
+        emulator: The tcg_pocket_emulator.PokemonTCGPocketEmulator to play on.
+        policy: HEURISTIC to play whole turns with play_turn, RANDOM to take uniformly random legal actions.
+        rollout_turns: An int that holds the number of turns played, None to play to the end.
+        generator: A random.Random that picks the actions of the RANDOM policy.
+    """
+    last_turn = None if rollout_turns is None else emulator.turn + rollout_turns
+
+    while not emulator.finished and (last_turn is None or emulator.turn < last_turn):
+        if policy == RANDOM:
+            emulator.apply_action(generator.choice(emulator.legal_actions()))
+        else:
+            emulator.play_turn()
+
+def run_rollouts(encoded_states, count, policy, rollout_turns, seed, registry=None):
+    """Plays count rollouts from each state encoded by pokemon_state_codec.encode_state with the worker's card data.
+
+    Each rollout shuffles both decks and flips a coin seeded from seed, the state's position in
+    the batch and the rollout's number, so results do not depend on which worker plays them.
+
+    Args:
+        encoded_states: A list of (position in the batch, encoded state) pairs.
+
+    Returns:
+        A list with a PokemonRolloutStats per state.
+    """
+    registry = worker_registry if registry is None else registry
+    results = []
+
+    for index, encoded in encoded_states:
+        base = pokemon_state_codec.decode_state(encoded, registry)
+        stats = PokemonRolloutStats()
+
+        for game in range(count):
+            generator = random.Random(pokemon_coin.derive_seed(seed, index, game))
+            emulator = base.clone()
+
+            for player in (0, 1):
+                generator.shuffle(emulator.deck(player))
+
+            emulator.coin = pokemon_coin.PokemonCoin(generator.getrandbits(64))
+            rollout(emulator, policy, rollout_turns, generator)
+            stats.add(emulator)
+
+        results.append(stats)
+
+    return results
+
+def search_root(encoded, playouts, seed, exploration, rollout_turns, registry=None):
+    """Runs an independent pokemon_mcts.PokemonMCTSAgent search from an encoded state with the worker's card data.
+
+    Returns:
+        A dictionary of action id -> (visits, summed score for the player to act).
+    """
+    registry = worker_registry if registry is None else registry
+    agent = pokemon_mcts.PokemonMCTSAgent(playouts, exploration, rollout_turns=rollout_turns, seed=seed)
+    root = agent.search(pokemon_state_codec.decode_state(encoded, registry))
+
+    return {action: (visits, value) for action, visits, value in zip(root.actions, root.visits, root.values)}
+
+class PokemonRolloutService:
+    """Pool of warm worker processes that play rollouts and searches for a search agent.
+
+    Every worker gets the card data once when it starts and is kept until close, so a search
+    only sends encoded states (see pokemon_state_codec) and gets aggregated statistics back.
+
+    Two modes are offered: leaf-parallel, where the agent collects a batch of leaves and rollouts
+    evaluates them across the workers (see pokemon_mcts.PokemonMCTSAgent.search_batched), and
+    root-parallel, where root_parallel_search runs an independent tree in each worker and merges
+    the root statistics.
+
+    Attributes:
+        workers: An int that holds the number of worker processes, 0 to play in this process.
+        registry: The pokemon_card_registry.PokemonCardRegistry used when workers is 0.
+        executor: The concurrent.futures.ProcessPoolExecutor of the workers, None when workers is 0.
+    """
+
+    def __init__(self, workers=None, registry=None, data_directory=None):
+        """Initializes the service and starts its workers.
+
+        Args:
+            workers: An int that holds the number of worker processes, os.cpu_count() if None, and 0
+                to play every rollout in this process.
+            registry: A pokemon_card_registry.PokemonCardRegistry sent to each worker once, None to
+                have each worker load the card data from data_directory.
+            data_directory: A string that holds the directory of the card data files, the current directory if None.
+        """
+        self.workers = workers
+        self.registry = registry
+
+        if workers == 0:
+            self.executor = None
+
+            if registry is None:
+                self.registry = tcg_pocket_tournament.load_registry(data_directory)
+        else:
+            self.workers = os.cpu_count() if workers is None else workers
+
+            # Compiles a missing or stale card database once, before the workers map it
+            if registry is None:
+                tcg_pocket_tournament.load_registry(data_directory)
+
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(data_directory, registry, logging_options()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the workers."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def rollouts(self, emulators, count=1, policy=HEURISTIC, rollout_turns=pokemon_mcts.ROLLOUT_TURNS, seed=0):
+        """Plays count rollouts from each of a batch of game states.
+
+        The batch is split into one chunk per worker.
+
+        Args:
+            emulators: A list of tcg_pocket_emulator.PokemonTCGPocketEmulator states.
+            count: An int that holds the number of rollouts per state.
+            policy: HEURISTIC or RANDOM, see rollout.
+            rollout_turns: An int that holds the number of turns per rollout, None to play to the end.
+            seed: The seed every rollout's seed is derived from.
+
+        Returns:
+            A list with a PokemonRolloutStats per state, in the order of emulators.
+        """
+        encoded = list(enumerate(pokemon_state_codec.encode_state(emulator) for emulator in emulators))
+
+        if self.executor is None:
+            return run_rollouts(encoded, count, policy, rollout_turns, seed, self.registry)
+
+        size = max(1, -(-len(encoded) // self.workers))
+        chunks = [encoded[start:start + size] for start in range(0, len(encoded), size)]
+        results = []
+
+        for chunk in self.executor.map(run_rollouts, chunks, *([value] * len(chunks) for value in (count, policy, rollout_turns, seed))):
+            results.extend(chunk)
+
+        return results
+
+    def root_parallel_search(self, emulator, playouts, seed=0, exploration=pokemon_mcts.EXPLORATION, rollout_turns=pokemon_mcts.ROLLOUT_TURNS):
+        """Searches a state with one independent tree per worker and merges their root statistics.
+
+        Args:
+            emulator: The tcg_pocket_emulator.PokemonTCGPocketEmulator to search from.
+            playouts: An int that holds the total number of playouts, split evenly over the trees.
+            seed: The seed every tree's seed is derived from.
+            exploration: A float, the UCT exploration constant.
+            rollout_turns: An int that holds the number of turns per rollout, None to play to the end.
+
+        Returns:
+            A tuple of the action id with the most playouts and a dictionary of action id ->
+            (visits, summed score for the player to act) over every tree.
+        """
+        encoded = pokemon_state_codec.encode_state(emulator)
+        trees = max(1, self.workers)
+        shares = [playouts // trees + (tree < playouts % trees) for tree in range(trees)]
+        tasks = [(encoded, share, pokemon_coin.derive_seed(seed, tree), exploration, rollout_turns) for tree, share in enumerate(shares) if share > 0]
+
+        if self.executor is None:
+            roots = [search_root(*task, self.registry) for task in tasks]
+        else:
+            roots = self.executor.map(search_root, *zip(*tasks))
+
+        merged = dict()
+
+        for root in roots:
+            for action, (visits, value) in root.items():
+                total_visits, total_value = merged.get(action, (0, 0.0))
+                merged[action] = (total_visits + visits, total_value + value)
+
+        return max(merged, key=lambda action: merged[action][0]), merged
+
+def benchmark(deck_one, deck_two, rollouts=1024, worker_counts=BENCHMARK_WORKERS, policy=HEURISTIC, data_directory=None, seed=0):
+    """Measures rollouts per second from the start of a game for each number of workers.
+
+    Worker start up is not timed, since the service keeps its workers warm.
+
+    Args:
+        deck_one: A list of card names for player one's deck.
+        deck_two: A list of card names for player two's deck.
+        rollouts: An int that holds the number of rollouts per measurement, split into one state per worker.
+        worker_counts: A sequence of the numbers of workers to measure.
+        policy: HEURISTIC or RANDOM, see rollout.
+        data_directory: A string that holds the directory of the card data files, the current directory if None.
+        seed: The seed of the game and the rollouts.
+
+    Returns:
+        A dictionary of number of workers -> rollouts per second.
+    """
+    logger = get_logger(__name__)
+    registry = tcg_pocket_tournament.load_registry(data_directory)
+    emulator = tcg_pocket_emulator.PokemonTCGPocketEmulator(registry, seed)
+    emulator.start_game(tcg_pocket_tournament.deck_ids(registry, deck_one), tcg_pocket_tournament.deck_ids(registry, deck_two))
+    results = dict()
+
+    for workers in worker_counts:
+        with PokemonRolloutService(workers, registry) as service:
+            service.rollouts([emulator] * workers, 1, policy, None, seed)
+            start = time.perf_counter()
+            service.rollouts([emulator] * workers, max(1, rollouts // workers), policy, None, seed)
+            results[workers] = max(1, rollouts // workers) * workers / (time.perf_counter() - start)
+
+        logger.info(f"{workers} workers: {results[workers]:.1f} rollouts per second")
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how rollouts scale with the number of worker processes.")
+    parser.add_argument("decks", help="file with one \"Deck Name: [Name], Cards: [Card; Card]\" line per deck, the first two are played")
+    parser.add_argument("--rollouts", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=list(BENCHMARK_WORKERS))
+    parser.add_argument("--policy", choices=(HEURISTIC, RANDOM), default=HEURISTIC)
+    parser.add_argument("--data", default=None, help="directory of the card data files")
+    args = parser.parse_args()
+
+    decks = list(tcg_pocket_tournament.read_decks(args.decks).values())
+    results = benchmark(decks[0], decks[1], args.rollouts, args.workers, args.policy, args.data)
+
+    for workers, rate in results.items():
+        print(f"{workers:>3} workers: {rate:10.1f} rollouts/s, speedup {rate / results[min(results)]:.2f}")
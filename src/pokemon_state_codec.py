@@ -0,0 +1,183 @@
+import struct
+import pokemon_coin
+import pokemon_packed_state
+import tcg_pocket_emulator
+
+MAGIC = b"PTCG"
+FORMAT_VERSION = 1
+
+# Flags in the header
+FLAG_SEED = 1
+FLAG_COIN_SEED = 2
+FLAG_FINISHED = 4
+FLAG_ENERGY_ATTACHED = 8
+
+NO_CARD = 0xFFFF
+NO_SIDE = 2
+MAX_SEED = 1 << 64
+
+HEADER = struct.Struct("<4sBB")
+# Type count, turn, current player, bitmask of the slots whose ability was used, winner and both players' points
+GAME = struct.Struct("<BHBBbBB")
+SEED = struct.Struct("<Q")
+COIN_POSITION = struct.Struct("<QI")
+GENERATOR_STATE = struct.Struct("<625I")
+COUNT = struct.Struct("<H")
+SIDE = struct.Struct("<B")
+
+def seed_value(seed):
+    """Returns seed if it can be stored as an unsigned 64 bit int, else None."""
+    return seed if isinstance(seed, int) and 0 <= seed < MAX_SEED else None
+
+def slot_struct(type_count):
+    """Returns the struct of a board slot: definition id, health, status code, evo ready flag and an energy count per type."""
+    return struct.Struct(f"<HhBB{type_count}B")
+
+def encode_state(emulator):
+    """Encodes the complete state of a game as bytes.
+
+    Cards in decks and hands are stored as definition ids and board slots with their health,
+    status, evo ready flag and energy, so a game takes a few hundred bytes. A seeded coin is
+    stored as its seed and position (see pokemon_coin.PokemonCoin.seek), any other coin with its
+    whole generator state. The shuffle generator is not stored, since decks are stored in their
+    shuffled order; the emulator's seed is, when it is an int.
+
+    Args:
+        emulator: A tcg_pocket_emulator.PokemonTCGPocketEmulator.
+
+    Raises:
+        ValueError: A value does not fit its field, for example more than 255 energy of a type.
+
+    Returns:
+        A bytes object that decode_state reads back.
+    """
+    type_count = emulator.registry.type_count
+    seed = seed_value(emulator.seed)
+    coin_seed = seed_value(emulator.coin.seed)
+
+    flags = 0
+    flags |= FLAG_SEED if seed is not None else 0
+    flags |= FLAG_COIN_SEED if coin_seed is not None else 0
+    flags |= FLAG_FINISHED if emulator.finished else 0
+    flags |= FLAG_ENERGY_ATTACHED if emulator.energy_attached else 0
+
+    abilities_used = sum(1 << slot for slot in emulator.abilities_used)
+    winner = emulator.winner if emulator.winner is not None else 0
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, flags)]
+
+    try:
+        parts.append(GAME.pack(type_count, emulator.turn, emulator.current_player, abilities_used, winner, emulator.points(0), emulator.points(1)))
+
+        if seed is not None:
+            parts.append(SEED.pack(seed))
+
+        if coin_seed is not None:
+            parts.append(COIN_POSITION.pack(coin_seed, emulator.coin.position))
+        else:
+            parts.append(GENERATOR_STATE.pack(*emulator.coin.random.getstate()[1]))
+
+        parts.append(SIDE.pack(NO_SIDE if emulator.coin.state is None else int(emulator.coin.state)))
+
+        slot = slot_struct(type_count)
+
+        for player in (0, 1):
+            for cards in (emulator.deck(player), emulator.hand(player)):
+                parts.append(COUNT.pack(len(cards)))
+                parts.append(struct.pack(f"<{len(cards)}H", *(card.definition_id for card in cards)))
+
+            for index in range(1 + tcg_pocket_emulator.BENCH_SIZE):
+                card = emulator.slot(player, index)
+
+                if card is None:
+                    parts.append(slot.pack(NO_CARD, 0, 0, 0, *([0] * type_count)))
+                else:
+                    energy = list(card.energy) + [0] * (type_count - len(card.energy))
+                    parts.append(slot.pack(card.definition_id, card.health, pokemon_packed_state.STATUS_CODES[card.status], int(bool(card.evo_ready)), *energy))
+    except struct.error as error:
+        raise ValueError(f"Cannot encode game state: {error}") from error
+
+    return b"".join(parts)
+
+def decode_state(data, registry):
+    """Creates an emulator in the state encoded by encode_state.
+
+    Args:
+        data: A bytes object returned by encode_state.
+        registry: The pokemon_card_registry.PokemonCardRegistry the definition ids refer to.
+
+    Raises:
+        ValueError: The data is not an encoded game state, has an unknown version, is cut short,
+            was encoded with a different number of types or refers to an unknown card.
+
+    Returns:
+        A tcg_pocket_emulator.PokemonTCGPocketEmulator.
+    """
+    view = memoryview(data)
+    offset = 0
+
+    def read(layout):
+        nonlocal offset
+        values = layout.unpack_from(view, offset)
+        offset += layout.size
+        return values
+
+    try:
+        magic, version, flags = read(HEADER)
+
+        if magic != MAGIC:
+            raise ValueError("Data is not an encoded game state")
+
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unknown game state version {version}")
+
+        type_count, turn, current_player, abilities_used, winner, points_one, points_two = read(GAME)
+
+        if type_count != registry.type_count:
+            raise ValueError(f"Game state has {type_count} types, the registry has {registry.type_count}")
+
+        seed = read(SEED)[0] if flags & FLAG_SEED else None
+        emulator = tcg_pocket_emulator.PokemonTCGPocketEmulator(registry, seed)
+
+        if flags & FLAG_COIN_SEED:
+            coin_seed, position = read(COIN_POSITION)
+            emulator.coin = pokemon_coin.PokemonCoin(coin_seed)
+            emulator.coin.seek(position)
+        else:
+            emulator.coin = pokemon_coin.PokemonCoin()
+            emulator.coin.random.setstate((3, read(GENERATOR_STATE), None))
+
+        side = read(SIDE)[0]
+        emulator.coin.state = None if side == NO_SIDE else pokemon_coin.CoinSide(side)
+
+        slot = slot_struct(type_count)
+
+        for player in (0, 1):
+            for cards in (emulator.deck(player), emulator.hand(player)):
+                count = read(COUNT)[0]
+                cards.extend(registry.new_instance(definition_id) for definition_id in read(struct.Struct(f"<{count}H")))
+
+            for index in range(1 + tcg_pocket_emulator.BENCH_SIZE):
+                definition_id, health, status, evo_ready, *energy = read(slot)
+
+                if definition_id != NO_CARD:
+                    card = registry.new_instance(definition_id)
+                    card.health = health
+                    card.status = pokemon_packed_state.STATUSES[status]
+                    card.evo_ready = bool(evo_ready)
+                    card.energy = tuple(energy)
+                    emulator.set_slot(player, index, card)
+    except struct.error as error:
+        raise ValueError(f"Game state is cut short: {error}") from error
+    except IndexError as error:
+        raise ValueError("Game state refers to a card that is not in the registry") from error
+
+    emulator.turn = turn
+    emulator.current_player = current_player
+    emulator.points_one = points_one
+    emulator.points_two = points_two
+    emulator.energy_attached = bool(flags & FLAG_ENERGY_ATTACHED)
+    emulator.abilities_used = {index for index in range(1 + tcg_pocket_emulator.BENCH_SIZE) if abilities_used >> index & 1}
+    emulator.finished = bool(flags & FLAG_FINISHED)
+    emulator.winner = winner if emulator.finished else None
+
+    return emulator
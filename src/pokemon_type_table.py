@@ -0,0 +1,117 @@
+from operator import ge
+
+COLORLESS = "Colorless"
+
+class PokemonTypeTable:
+    """Dense integer enumeration of energy types.
+
+    Types get ids in the order they are added, so reading the standard types file and then
+    the custom types file numbers the standard types first. Energy costs and attached energy
+    are stored as count vectors indexed by type id, which turns the energy check for a move
+    into a comparison of two int tuples instead of list and string work.
+
+    Attributes:
+        names: A list of type names, indexed by type id.
+        ids: A dictionary of type name -> type id.
+        colorless_id: An int that holds the id of the Colorless type, None if it has not been added.
+    """
+
+    def __init__(self, names=()):
+        """Initializes the instance with the given type names, in id order."""
+        self.names = []
+        self.ids = dict()
+        self.colorless_id = None
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Adds a type if it is new.
+
+        Returns:
+            An int, the id of the type.
+        """
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+
+            if name == COLORLESS:
+                self.colorless_id = self.ids[name]
+
+        return self.ids[name]
+
+    def cost_vector(self, energies):
+        """Counts energies by type.
+
+        Args:
+            energies: An iterable of type names, for example ["Fire", "Fire", "Colorless"].
+
+        Returns:
+            A tuple of ints of length len(self), the number of energies of each type id.
+
+        Raises:
+            ValueError: If an energy is not a type in the table.
+        """
+        ids = self.ids
+        counts = [0] * len(self.names)
+
+        for energy in energies:
+            type_id = ids.get(energy)
+
+            if type_id is None:
+                raise ValueError(f"Energy type {energy} is not in the type table")
+
+            counts[type_id] += 1
+
+        return tuple(counts)
+
+    def fixed_length(self, vector):
+        """Pads a count vector built before types were added with zeros, to length len(self).
+
+        Raises:
+            ValueError: If the vector has more entries than there are types in the table.
+        """
+        missing = len(self.names) - len(vector)
+
+        if missing < 0:
+            raise ValueError(f"Vector has {len(vector)} entries, the type table has {len(self.names)} types")
+
+        return tuple(vector) + (0,) * missing
+
+    def can_pay(self, cost, attached):
+        """Checks if attached energy can pay for an energy cost.
+
+        Every typed energy in the cost needs an attached energy of the same type, and Colorless
+        energy in the cost can be paid with any attached energy that is left over. Both vectors
+        are compared at length len(self), see fixed_length, so no type is left out of the check.
+
+        Args:
+            cost: A tuple of energy counts by type id, such as PokemonMove.energy_cost.
+            attached: A sequence of attached energy counts by type id.
+
+        Returns:
+            A boolean, True, if the cost can be paid, else False.
+
+        Raises:
+            ValueError: If either vector has more entries than there are types in the table.
+        """
+        if sum(attached) < sum(cost):
+            return False
+
+        width = len(self.names)
+
+        if len(cost) != width:
+            cost = self.fixed_length(cost)
+
+        if len(attached) != width:
+            attached = self.fixed_length(attached)
+
+        colorless_id = self.colorless_id
+
+        if colorless_id is None:
+            return all(map(ge, attached, cost))
+
+        return all(map(ge, attached[:colorless_id], cost[:colorless_id])) and all(map(ge, attached[colorless_id + 1:], cost[colorless_id + 1:]))
@@ -0,0 +1,148 @@
+import pokemon_coin
+
+ZOBRIST_SEED = 0x5eed
+
+# Groups of fields that are hashed together, and the groups each part of the state (see
+# pokemon_ability.STATE_PARTS) changes. Decks only change when a card is drawn, which updates
+# the hash itself (see PokemonZobristHash.card_drawn), or along with anything else.
+GROUPS = ("deck", "hand", "board", "points")
+PART_GROUPS = {
+    "active": ("board",),
+    "bench": ("board",),
+    "energy": ("board",),
+    "health": ("board",),
+    "hand": ("hand",),
+    "coin": (),
+    "points": ("points",),
+    "turn": ("board",),
+}
+
+class PokemonZobristHash:
+    """Zobrist hash of the deck, hand, board and points of a PokemonTCGPocketEmulator.
+
+    Every field value, for example "card 4 is in player one's hand at index 2", has its own
+    random 64 bit key and the hash is the XOR of the keys of the fields that are set. The fields
+    are hashed in groups, and the hash of a group is kept until the emulator reports a change to
+    a part of the state in it (see PokemonTCGPocketEmulator.state_changed), so after an action
+    only the groups it touched are hashed again. Drawing a card only XORs the keys of the card
+    that moved into the deck and hand hashes, see card_drawn.
+
+    Decks are hashed as a multiset of cards, since their order is not known to the players and
+    searches shuffle it; hands are hashed by position, since actions refer to hand indices. The
+    turn, current player and per-turn flags are hashed on every call.
+
+    Attributes:
+        emulator: The PokemonTCGPocketEmulator that is hashed.
+        keys: A dictionary of field tuple -> 64 bit key, shared by copies.
+        group_hashes: A dictionary of group -> hash of its fields, missing for groups that changed.
+        deck_counts: A tuple of one dictionary per player of definition id -> number of copies in
+            the deck, kept with the hash of the "deck" group.
+    """
+
+    def __init__(self, emulator, keys=None):
+        """Initializes the hash with every group out of date."""
+        self.emulator = emulator
+        self.keys = dict() if keys is None else keys
+        self.group_hashes = dict()
+        self.deck_counts = (dict(), dict())
+
+    def copy_for(self, emulator):
+        """Returns a hash of a copy of the emulator, keeping the group hashes that are up to date."""
+        copy = PokemonZobristHash(emulator, self.keys)
+        copy.group_hashes = dict(self.group_hashes)
+        copy.deck_counts = (dict(self.deck_counts[0]), dict(self.deck_counts[1]))
+
+        return copy
+
+    def key(self, *field):
+        """Returns the key of a field value, derived from ZOBRIST_SEED, so keys are the same in every process."""
+        key = self.keys.get(field)
+
+        if key is None:
+            key = pokemon_coin.derive_seed(ZOBRIST_SEED, *field)
+            self.keys[field] = key
+
+        return key
+
+    def state_changed(self, part):
+        """Marks the groups a part of the state is in as out of date, every group if part is None."""
+        if part is None:
+            self.group_hashes.clear()
+            return
+
+        for group in PART_GROUPS[part]:
+            self.group_hashes.pop(group, None)
+
+    def card_drawn(self, player, card):
+        """Updates the hash after the top card of a player's deck was moved to the end of their hand.
+
+        The deck loses the key of its last copy of the card and the hand gains the key of the
+        card at its new index, so neither group is hashed again. Groups that are out of date stay
+        out of date.
+        """
+        definition_id = card.definition_id
+        deck_hash = self.group_hashes.get("deck")
+        hand_hash = self.group_hashes.get("hand")
+
+        if deck_hash is not None:
+            counts = self.deck_counts[player]
+            self.group_hashes["deck"] = deck_hash ^ self.key("deck", player, definition_id, counts[definition_id])
+            counts[definition_id] -= 1
+
+        if hand_hash is not None:
+            self.group_hashes["hand"] = hand_hash ^ self.key("hand", player, len(self.emulator.hand(player)) - 1, definition_id)
+
+    def hash_group(self, group):
+        """Returns the XOR of the keys of the fields in a group, and counts the cards of each deck for card_drawn."""
+        emulator = self.emulator
+        value = 0
+
+        for player in (0, 1):
+            if group == "deck":
+                counts = self.deck_counts[player]
+                counts.clear()
+
+                for card in emulator.deck(player):
+                    counts[card.definition_id] = counts.get(card.definition_id, 0) + 1
+                    value ^= self.key("deck", player, card.definition_id, counts[card.definition_id])
+            elif group == "hand":
+                for index, card in enumerate(emulator.hand(player)):
+                    value ^= self.key("hand", player, index, card.definition_id)
+            elif group == "board":
+                for slot in range(1 + len(emulator.bench(player))):
+                    card = emulator.slot(player, slot)
+
+                    if card is None:
+                        continue
+
+                    value ^= self.key("card", player, slot, card.definition_id)
+                    value ^= self.key("health", player, slot, card.health)
+                    value ^= self.key("status", player, slot, card.status)
+                    value ^= self.key("evo_ready", player, slot, card.evo_ready)
+
+                    for type_id, count in enumerate(card.energy):
+                        if count > 0:
+                            value ^= self.key("energy", player, slot, type_id, count)
+            elif group == "points":
+                value ^= self.key("points", player, emulator.points(player))
+
+        return value
+
+    def value(self):
+        """Returns the 64 bit hash of the emulator's current state, hashing only the groups that changed."""
+        emulator = self.emulator
+        value = self.key("turn", emulator.turn, emulator.current_player, emulator.energy_attached, emulator.finished, emulator.winner)
+
+        for slot in emulator.abilities_used:
+            value ^= self.key("ability_used", slot)
+
+        for group in GROUPS:
+            group_hash = self.group_hashes.get(group)
+
+            if group_hash is None:
+                group_hash = self.hash_group(group)
+                self.group_hashes[group] = group_hash
+
+            value ^= group_hash
+
+        return value
@@ -0,0 +1,280 @@
+import numpy as np
+from logger import get_logger
+from tcg_pocket_emulator import OPENING_HAND_SIZE, POINTS_TO_WIN, MAX_TURNS, WEAKNESS_BONUS
+
+MAX_MOVES = 4
+NO_CARD = -1
+
+class PokemonTCGPocketBatchEmulator:
+    """Plays many games in lockstep, with the state of every game stored as NumPy arrays.
+
+    Every step method applies one phase of a turn (draw, attach energy, attack, knockouts,
+    end of turn) to all games at once with array operations, instead of dispatching each game
+    in Python. Finished games are masked out and no longer change.
+
+    The batch rules are a simplified game: every card is treated as a basic pokemon, the
+    opening hand's first card starts active, drawn cards wait in hand and the first of them is
+    promoted when the active pokemon is knocked out, moves only deal damage (effects, abilities,
+    evolution and trainer cards are not simulated), weakness adds WEAKNESS_BONUS damage, a
+    knockout is worth 2 points for "ex" cards and 1 otherwise, and a player wins with
+    POINTS_TO_WIN points or when the opponent has no pokemon left to promote. Games still
+    running after max_turns end in a draw. Every reset shuffles each deck with the batch's own
+    generator, so games of the same pairing play out differently.
+
+    Attributes:
+        game_count: An int that holds the number of games.
+        type_count: An int that holds the number of types.
+        max_turns: An int that holds the turn after which unfinished games are drawn.
+        decks: An int array (games, 2, longest deck) of definition ids in the order they are drawn,
+            NO_CARD after the last card.
+        deck_size: An int array (games, 2) of the number of cards in each deck.
+        deck_position: An int array (games, 2) of the number of cards drawn from each deck.
+        played: An int array (games, 2) of the number of drawn cards that have been put into play.
+        active: An int array (games, 2) of the definition id of each active pokemon, NO_CARD if none.
+        health: An int array (games, 2) of the health of each active pokemon.
+        energy: An int array (games, 2, type_count) of energy attached to each active pokemon, by type id.
+        points: An int array (games, 2) of each player's points.
+        current_player: An int array (games,) that is 0 on player one's turn and 1 on player two's turn.
+        turn: An int array (games,) of the number of turns played.
+        finished: A boolean array (games,) that is True once a game is over.
+        winner: An int array (games,) of the winning player, -1 for a draw or unfinished game.
+        rng: A numpy.random.Generator that the decks are shuffled with.
+        logger: A general logger passed from logger.py.
+    """
+
+    def __init__(self, registry, type_table, decks, max_turns=MAX_TURNS, seed=None):
+        """Initializes the batch from card definitions and one pair of decks per game.
+
+        Args:
+            registry: A pokemon_card_registry.PokemonCardRegistry that the decks refer to.
+            type_table: The pokemon_type_table.PokemonTypeTable the move energy costs were built with.
+            decks: A sequence with one (deck one, deck two) pair per game, each deck a sequence of
+                definition ids of any length.
+            max_turns: An int that holds the turn after which unfinished games are drawn.
+            seed: The seed of the deck shuffles, None for a seed from the operating system.
+        """
+        self.logger = get_logger(__name__)
+        self.rng = np.random.default_rng(seed)
+
+        self.type_count = len(type_table)
+        self.max_turns = max_turns
+        self.load_definitions(registry, type_table)
+
+        self.game_count = len(decks)
+        longest = max((len(deck) for pair in decks for deck in pair), default=0)
+        self.decks = np.full((self.game_count, 2, longest), NO_CARD, dtype=np.int32)
+
+        for game, pair in enumerate(decks):
+            for player, deck in enumerate(pair):
+                self.decks[game, player, :len(deck)] = deck
+
+        self.reset()
+
+    def load_definitions(self, registry, type_table):
+        """Builds per definition lookup arrays for health, types and move damage and costs."""
+        count = max(len(registry), 1)
+
+        self.max_health = np.zeros(count, dtype=np.int32)
+        self.card_type = np.full(count, -1, dtype=np.int32)
+        self.weakness = np.full(count, -2, dtype=np.int32)
+        self.prize_points = np.ones(count, dtype=np.int32)
+        self.move_count = np.zeros(count, dtype=np.int32)
+        self.move_damage = np.zeros((count, MAX_MOVES), dtype=np.int32)
+        self.move_cost = np.zeros((count, MAX_MOVES, self.type_count), dtype=np.int32)
+
+        for definition_id, definition in enumerate(registry.definitions):
+            self.max_health[definition_id] = definition.health or 0
+            self.card_type[definition_id] = type_table.ids.get(definition.type, -1)
+            self.weakness[definition_id] = type_table.ids.get(definition.weaknesses, -2)
+            self.prize_points[definition_id] = 2 if definition.name.endswith(" ex") else 1
+            self.move_count[definition_id] = min(len(definition.moves), MAX_MOVES)
+
+            for slot, move in enumerate(definition.moves[:MAX_MOVES]):
+                self.move_damage[definition_id, slot] = move.damage
+                self.move_cost[definition_id, slot, :len(move.energy_cost)] = move.energy_cost
+
+        # Colorless costs are paid from the total, so that lane is skipped when comparing typed energy
+        self.typed_lanes = np.ones(self.type_count, dtype=bool)
+
+        if type_table.colorless_id is not None:
+            self.typed_lanes[type_table.colorless_id] = False
+
+    def reset(self):
+        """Starts every game: shuffles the decks, draws the opening hands and puts each hand's first card in play."""
+        games = self.game_count
+
+        self.shuffle()
+
+        self.deck_size = (self.decks != NO_CARD).sum(axis=2).astype(np.int32)
+        self.deck_position = np.minimum(self.deck_size, OPENING_HAND_SIZE).astype(np.int32)
+        self.played = np.zeros((games, 2), dtype=np.int32)
+        self.active = np.full((games, 2), NO_CARD, dtype=np.int32)
+        self.health = np.zeros((games, 2), dtype=np.int32)
+        self.energy = np.zeros((games, 2, self.type_count), dtype=np.int32)
+        self.points = np.zeros((games, 2), dtype=np.int32)
+        self.current_player = np.zeros(games, dtype=np.int32)
+        self.turn = np.zeros(games, dtype=np.int32)
+        self.finished = np.zeros(games, dtype=bool)
+        self.winner = np.full(games, -1, dtype=np.int32)
+
+        for player in (0, 1):
+            self.promote(np.arange(games), np.full(games, player, dtype=np.int32))
+
+    def shuffle(self):
+        """Shuffles the cards of every deck independently, keeping NO_CARD after the last card."""
+        keys = self.rng.random(self.decks.shape)
+        keys[self.decks == NO_CARD] = np.inf
+
+        self.decks = np.take_along_axis(self.decks, keys.argsort(axis=2), axis=2)
+
+    def promote(self, games, players):
+        """Puts the next drawn card of each given player into play, the player loses if there is none.
+
+        Args:
+            games: An int array of game indexes.
+            players: An int array of the player in each of those games.
+        """
+        has_card = self.played[games, players] < self.deck_position[games, players]
+
+        lost_games = games[~has_card]
+        self.active[lost_games, players[~has_card]] = NO_CARD
+        self.finished[lost_games] = True
+        self.winner[lost_games] = 1 - players[~has_card]
+
+        games = games[has_card]
+        players = players[has_card]
+        definitions = self.decks[games, players, self.played[games, players]]
+
+        self.active[games, players] = definitions
+        self.health[games, players] = self.max_health[definitions]
+        self.energy[games, players] = 0
+        self.played[games, players] += 1
+
+    def running(self):
+        """Returns the indexes of the games that are not finished."""
+        return np.flatnonzero(~self.finished)
+
+    def draw(self):
+        """The current player of every running game draws a card, if their deck is not empty."""
+        games = self.running()
+        players = self.current_player[games]
+        can_draw = self.deck_position[games, players] < self.deck_size[games, players]
+
+        self.deck_position[games[can_draw], players[can_draw]] += 1
+
+    def attach_energy(self, energy_types=None):
+        """The current player of every running game attaches one energy to their active pokemon.
+
+        Args:
+            energy_types: An int array (games,) of the type id to attach in each game; each active
+                pokemon's own type if None.
+        """
+        games = self.running()
+        players = self.current_player[games]
+        attackers = self.active[games, players]
+
+        if energy_types is None:
+            types = self.card_type[attackers]
+        else:
+            types = np.asarray(energy_types)[games]
+
+        has_target = (attackers != NO_CARD) & (types >= 0)
+        self.energy[games[has_target], players[has_target], types[has_target]] += 1
+
+    def affordable_moves(self, games, players):
+        """Returns a boolean array (len(games), MAX_MOVES) of the moves each active pokemon can pay for."""
+        attackers = np.maximum(self.active[games, players], 0)
+        energy = self.energy[games, players][:, None, :]
+        cost = self.move_cost[attackers]
+
+        typed = ((energy >= cost) | ~self.typed_lanes).all(axis=2)
+        total = energy.sum(axis=2) >= cost.sum(axis=2)
+        exists = np.arange(MAX_MOVES) < self.move_count[attackers][:, None]
+
+        return typed & total & exists & (self.active[games, players] != NO_CARD)[:, None]
+
+    def best_moves(self):
+        """Returns an int array (games,) of the highest damage affordable move slot in each game, -1 if none."""
+        games = np.arange(self.game_count)
+        affordable = self.affordable_moves(games, self.current_player)
+        damage = np.where(affordable, self.move_damage[np.maximum(self.active[games, self.current_player], 0)], -1)
+
+        return np.where(affordable.any(axis=1), damage.argmax(axis=1), -1)
+
+    def attack(self, move_slots=None):
+        """The active pokemon of the current player of every running game uses a move.
+
+        Moves that are not affordable, or a slot of -1, do nothing. Damage is increased by
+        WEAKNESS_BONUS if the defending pokemon is weak to the attacker's type.
+
+        Args:
+            move_slots: An int array (games,) of the index of the move to use in each game; the
+                highest damage affordable move if None.
+        """
+        if move_slots is None:
+            move_slots = self.best_moves()
+
+        games = self.running()
+        players = self.current_player[games]
+        opponents = 1 - players
+        slots = np.asarray(move_slots)[games]
+
+        attackers = self.active[games, players]
+        defenders = self.active[games, opponents]
+
+        valid = (slots >= 0) & (slots < MAX_MOVES) & (defenders != NO_CARD)
+        safe_slots = np.clip(slots, 0, MAX_MOVES - 1)
+        valid &= self.affordable_moves(games, players)[np.arange(len(games)), safe_slots]
+
+        safe_attackers = np.maximum(attackers, 0)
+        damage = self.move_damage[safe_attackers, safe_slots]
+        damage += WEAKNESS_BONUS * (self.weakness[np.maximum(defenders, 0)] == self.card_type[safe_attackers])
+
+        self.health[games, opponents] -= np.where(valid, damage, 0)
+
+    def resolve_knockouts(self):
+        """Awards points for knocked out defending pokemon, promotes replacements and ends won games."""
+        games = self.running()
+        players = self.current_player[games]
+        opponents = 1 - players
+        defenders = self.active[games, opponents]
+
+        knocked_out = (defenders != NO_CARD) & (self.health[games, opponents] <= 0)
+        self.points[games[knocked_out], players[knocked_out]] += self.prize_points[defenders[knocked_out]]
+
+        won = self.points[games, players] >= POINTS_TO_WIN
+        self.finished[games[won]] = True
+        self.winner[games[won]] = players[won]
+
+        promote = knocked_out & ~won
+        self.promote(games[promote], opponents[promote])
+
+    def end_turn(self):
+        """Passes the turn in every running game and draws games that reached max_turns."""
+        games = self.running()
+
+        self.turn[games] += 1
+        self.current_player[games] = 1 - self.current_player[games]
+
+        self.finished[games[self.turn[games] >= self.max_turns]] = True
+
+    def step(self, energy_types=None, move_slots=None):
+        """Plays one turn in every running game: draw, attach energy, attack, knockouts and end of turn."""
+        self.draw()
+        self.attach_energy(energy_types)
+        self.attack(move_slots)
+        self.resolve_knockouts()
+        self.end_turn()
+
+    def run(self):
+        """Plays every game to the end with the default actions.
+
+        Returns:
+            An int array (games,) of the winning player of each game, -1 for a draw.
+        """
+        while not self.finished.all():
+            self.step()
+
+        self.logger.info(f"Finished {self.game_count} batched games")
+
+        return self.winner
@@ -1,8 +1,71 @@
+import random
+import pokemon_action_index
+import pokemon_action_log
 import pokemon_coin
+import pokemon_profiler
+import pokemon_zobrist
 from logger import get_logger
 
+OPENING_HAND_SIZE = 5
+BENCH_SIZE = 3
+POINTS_TO_WIN = 3
+MAX_TURNS = 100
+WEAKNESS_BONUS = 20
+
+# Methods timed by enable_profiling, with the phase each is counted in
+PROFILED_METHODS = (
+    (pokemon_profiler.DRAW, "draw"),
+    (pokemon_profiler.ENERGY_ATTACH, "attach_energy"),
+    (pokemon_profiler.ATTACK, "attack"),
+    (pokemon_profiler.KNOCKOUT, "resolve_knockouts"),
+)
+
 class PokemonTCGPocketEmulator:
-    def __init__(self):
+    """Holds the state of a single game and plays it.
+
+    A turn is: draw a card, evolve and bench pokemon from hand, attach one energy, use abilities
+    and attack with the active pokemon, which ends the turn, then knocked out pokemon are replaced
+    from the bench. The next player draws as soon as a turn ends. Weakness adds
+    WEAKNESS_BONUS damage, knocking out an "ex" card is worth 2 points and any other card 1, and
+    a player wins with POINTS_TO_WIN points or when the opponent has no pokemon left in play.
+    Games still running after MAX_TURNS turns are a draw.
+
+    Attributes:
+        deck_one: A list of pokemon_card.PokemonCardInstance objects in player one's deck, top card first
+        deck_two: A list of pokemon_card.PokemonCardInstance objects in player two's deck, top card first
+        hand_one: A list of pokemon_card.PokemonCardInstance objects in player one's hand
+        hand_two: A list of pokemon_card.PokemonCardInstance objects in player two's hand
+        board_one_active: A pokemon_card.PokemonCardInstance for player one's active pokemon, None if empty
+        board_one_passive: A list of player one's bench slots, each a pokemon_card.PokemonCardInstance or None
+        board_two_active: A pokemon_card.PokemonCardInstance for player two's active pokemon, None if empty
+        board_two_passive: A list of player two's bench slots, each a pokemon_card.PokemonCardInstance or None
+        coin: A pokemon_coin.PokemonCoin used for coin flips, seeded from seed
+        points_one: An int that holds player one's points
+        points_two: An int that holds player two's points
+        turn: An int that holds the number of turns played
+        current_player: An int that is 0 on player one's turn and 1 on player two's turn
+        registry: A pokemon_card_registry.PokemonCardRegistry that card instances refer to
+        seed: The seed the emulator was created with, None for a seed from the operating system
+        random: A random.Random used to shuffle decks
+        random_state: The getstate() of random kept by clone until start_game shuffles again, None if there is none
+        energy_attached: A boolean that is True once the current player has attached energy this turn
+        abilities_used: A set of the board slots whose ability the current player has used this turn
+        action_index: A pokemon_action_index.PokemonActionIndex, created by the first legal_actions call
+        zobrist: A pokemon_zobrist.PokemonZobristHash, created by the first state_hash call
+        action_log: A pokemon_action_log.PokemonActionLog of the game, None unless start_action_log was called
+        profiler: A pokemon_profiler.PokemonProfiler the phases of the game are timed in, None unless enable_profiling was called
+        finished: A boolean that is True once the game is over
+        winner: An int that holds the winning player, -1 for a draw, None while the game is running
+        logger: A general logger passed from logger.py
+    """
+
+    def __init__(self, registry=None, seed=None):
+        """Initializes the instance with default values.
+
+        Args:
+            registry: A pokemon_card_registry.PokemonCardRegistry, with a type_table, to play games with.
+            seed: A seed for shuffling decks and coin flips; games with the same decks and seed play out the same.
+        """
         self.deck_one = []
         self.deck_two = []
 
@@ -10,14 +73,545 @@ class PokemonTCGPocketEmulator:
         self.hand_two = []
 
         self.board_one_active = None
-        self.board_one_passive = [None] * 3
+        self.board_one_passive = [None] * BENCH_SIZE
 
         self.board_two_active = None
-        self.board_two_passive = [None] * 3
+        self.board_two_passive = [None] * BENCH_SIZE
 
-        self.coin =  pokemon_coin.PokemonCoin()
+        # The coin gets its own stream, so coin flips do not change how decks are shuffled
+        self.coin = pokemon_coin.PokemonCoin(None if seed is None else pokemon_coin.derive_seed(seed, "coin"))
 
         self.points_one = 0
         self.points_two = 0
 
-        self.logger = get_logger(__name__)
\ No newline at end of file
+        self.turn = 0
+        self.current_player = 0
+
+        self.registry = registry
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.random_state = None
+        self.energy_attached = False
+        self.abilities_used = set()
+        self.action_index = None
+        self.zobrist = None
+        self.action_log = None
+        self.profiler = None
+        self.finished = False
+        self.winner = None
+
+        self.logger = get_logger(__name__)
+
+    def deck(self, player):
+        """Returns a player's deck."""
+        return self.deck_one if player == 0 else self.deck_two
+
+    def hand(self, player):
+        """Returns a player's hand."""
+        return self.hand_one if player == 0 else self.hand_two
+
+    def active(self, player):
+        """Returns a player's active pokemon, None if empty."""
+        return self.board_one_active if player == 0 else self.board_two_active
+
+    def set_active(self, player, card):
+        """Replaces a player's active pokemon."""
+        if player == 0:
+            self.board_one_active = card
+        else:
+            self.board_two_active = card
+
+        self.state_changed("active")
+
+    def bench(self, player):
+        """Returns a player's bench slots."""
+        return self.board_one_passive if player == 0 else self.board_two_passive
+
+    def slot(self, player, slot):
+        """Returns the pokemon in a board slot, slot 0 is the active pokemon and 1 to BENCH_SIZE the bench."""
+        return self.active(player) if slot == 0 else self.bench(player)[slot - 1]
+
+    def set_slot(self, player, slot, card):
+        """Replaces the pokemon in a board slot."""
+        if slot == 0:
+            self.set_active(player, card)
+        else:
+            self.bench(player)[slot - 1] = card
+            self.state_changed("bench")
+
+    def points(self, player):
+        """Returns a player's points."""
+        return self.points_one if player == 0 else self.points_two
+
+    def add_points(self, player, points):
+        """Adds points to a player."""
+        if player == 0:
+            self.points_one += points
+        else:
+            self.points_two += points
+
+        self.state_changed("points")
+
+    def definition(self, card):
+        """Returns the pokemon_card.PokemonCardDefinition of a card instance."""
+        return self.registry.get(card.definition_id)
+
+    def start_game(self, deck_one, deck_two, shuffle=True):
+        """Shuffles both decks, draws opening hands and puts each player's first basic pokemon active.
+
+        The action log records the decks in their shuffled order, so a replay does not depend on
+        the shuffle generator.
+
+        Args:
+            deck_one: A list of definition ids for player one's deck.
+            deck_two: A list of definition ids for player two's deck.
+            shuffle: A boolean, False to keep the decks in the given order, top card first.
+        """
+        for player, deck in enumerate((deck_one, deck_two)):
+            cards = [self.registry.new_instance(definition_id) for definition_id in deck]
+
+            if shuffle:
+                self.random.shuffle(cards)
+                self.random_state = None
+
+            self.deck(player)[:] = cards
+            self.state_changed(None)
+
+        if self.action_log is not None:
+            self.action_log.decks = [[card.definition_id for card in self.deck(player)] for player in (0, 1)]
+
+        for player in (0, 1):
+            for _ in range(OPENING_HAND_SIZE):
+                self.draw(player)
+
+        for player in (0, 1):
+            hand = self.hand(player)
+            basics = [index for index, card in enumerate(hand) if self.definition(card).pre_evo is None]
+
+            if len(basics) == 0:
+                self.end_game(1 - player)
+                return
+
+            self.set_active(player, hand.pop(basics[0]))
+
+        self.begin_turn()
+
+    def begin_turn(self):
+        """Starts the current player's turn, they may attach energy and use abilities again and draw a card."""
+        self.energy_attached = False
+        self.abilities_used.clear()
+        self.draw(self.current_player)
+
+    def draw(self, player):
+        """Moves the top card of a player's deck to their hand, if the deck is not empty."""
+        deck = self.deck(player)
+
+        if len(deck) > 0:
+            card = deck.pop(0)
+            self.hand(player).append(card)
+
+            # The hash only XORs in the card that moved, instead of hashing the deck and hand again
+            if self.zobrist is not None:
+                self.zobrist.card_drawn(player, card)
+
+            if self.action_index is not None:
+                self.action_index.state_changed("hand")
+
+    def play_to_bench(self, player, hand_index):
+        """Puts a basic pokemon from hand into the first empty bench slot.
+
+        Returns:
+            A boolean, True, if the card was benched, else False
+        """
+        hand = self.hand(player)
+        bench = self.bench(player)
+
+        if self.definition(hand[hand_index]).pre_evo is not None or None not in bench:
+            return False
+
+        self.set_slot(player, bench.index(None) + 1, hand.pop(hand_index))
+        self.state_changed("hand")
+
+        return True
+
+    def can_evolve(self, player, hand_index, slot):
+        """Returns True if the hand card can evolve the pokemon in a board slot this turn, else False."""
+        target = self.slot(player, slot)
+
+        return target is not None and target.evo_ready and self.definition(self.hand(player)[hand_index]).pre_evo == self.definition(target).name
+
+    def evolve(self, player, hand_index, slot):
+        """Evolves the pokemon in a board slot with a card from hand.
+
+        The evolved pokemon keeps its damage and attached energy and loses its status. It can only
+        evolve if it has been in play since the start of the turn and the hand card evolves from it.
+
+        Returns:
+            A boolean, True, if the pokemon evolved, else False
+        """
+        if not self.can_evolve(player, hand_index, slot):
+            return False
+
+        hand = self.hand(player)
+        target = self.slot(player, slot)
+        evolution = hand.pop(hand_index)
+        self.state_changed("hand")
+        evolution.health = self.definition(evolution).health - (self.definition(target).health - target.health)
+        evolution.energy = target.energy
+        evolution.status = None
+        evolution.evo_ready = False
+        self.set_slot(player, slot, evolution)
+
+        return True
+
+    def attach_energy(self, player, slot, type_id):
+        """Attaches one energy of a type to the pokemon in a board slot.
+
+        Returns:
+            A boolean, True, if there was a pokemon to attach to, else False
+        """
+        card = self.slot(player, slot)
+
+        if card is None:
+            return False
+
+        energy = list(card.energy) + [0] * (self.registry.type_count - len(card.energy))
+        energy[type_id] += 1
+        card.energy = tuple(energy)
+        self.state_changed("energy")
+
+        return True
+
+    def can_use_move(self, player, move_index):
+        """Returns True if the active pokemon has the move and enough energy to use it, else False."""
+        card = self.active(player)
+
+        if card is None:
+            return False
+
+        moves = self.definition(card).moves
+
+        return move_index < len(moves) and self.registry.type_table.can_pay(moves[move_index].energy_cost, card.energy)
+
+    def attack(self, player, move_index):
+        """Uses a move of the active pokemon against the opponent's active pokemon.
+
+        Deals the move's damage, plus WEAKNESS_BONUS if the defender is weak to the attacker's
+        type, then calls the move's effect function with the emulator.
+
+        Returns:
+            A boolean, True, if the move was used, else False
+        """
+        attacker = self.active(player)
+        defender = self.active(1 - player)
+
+        if defender is None or not self.can_use_move(player, move_index):
+            return False
+
+        move = self.definition(attacker).moves[move_index]
+        damage = move.damage
+
+        if self.definition(defender).weaknesses is not None and self.definition(defender).weaknesses == self.definition(attacker).type:
+            damage += WEAKNESS_BONUS
+
+        defender.health -= damage
+        self.state_changed("health")
+
+        if move.effect is not None:
+            if self.profiler is None:
+                move.effect(self)
+            else:
+                self.profiler.call(pokemon_profiler.EFFECT, move.effect, self)
+
+            self.state_changed(None)
+
+        return True
+
+    def resolve_knockouts(self):
+        """Awards points for knocked out active pokemon and replaces them from the bench.
+
+        A player with no pokemon left on the bench to replace their active pokemon loses.
+        """
+        for player in (self.current_player, 1 - self.current_player):
+            card = self.active(player)
+
+            if card is None or card.health > 0:
+                continue
+
+            self.add_points(1 - player, 2 if self.definition(card).name.endswith(" ex") else 1)
+
+            if self.points(1 - player) >= POINTS_TO_WIN:
+                self.end_game(1 - player)
+                return
+
+            bench = self.bench(player)
+            replacements = [slot for slot, bench_card in enumerate(bench) if bench_card is not None]
+
+            if len(replacements) == 0:
+                self.set_active(player, None)
+                self.end_game(1 - player)
+                return
+
+            self.set_active(player, bench[replacements[0]])
+            self.set_slot(player, replacements[0] + 1, None)
+
+    def end_turn(self):
+        """Passes the turn to the other player and begins their turn, the game is a draw once MAX_TURNS turns are played."""
+        for slot in range(1 + BENCH_SIZE):
+            card = self.slot(self.current_player, slot)
+
+            if card is not None:
+                card.evo_ready = True
+
+        self.turn += 1
+        self.state_changed("turn")
+        self.current_player = 1 - self.current_player
+
+        if self.turn >= MAX_TURNS:
+            self.end_game(-1)
+        else:
+            self.begin_turn()
+
+    def end_game(self, winner):
+        """Finishes the game with the given winner, -1 for a draw."""
+        self.finished = True
+        self.winner = winner
+
+    def best_move(self, player):
+        """Returns the index of the highest damage move the active pokemon can use, -1 if none."""
+        card = self.active(player)
+
+        if card is None:
+            return -1
+
+        moves = self.definition(card).moves
+        usable = [index for index in range(len(moves)) if self.can_use_move(player, index)]
+
+        return max(usable, key=lambda index: moves[index].damage, default=-1)
+
+    def play_turn(self):
+        """Plays the rest of the current player's turn with a simple heuristic policy.
+
+        Evolves whatever it can, benches basic pokemon, attaches an energy of the active
+        pokemon's type and attacks with the highest damage usable move. Every step is taken with
+        apply_action, so it is recorded in the action log.
+        """
+        player = self.current_player
+        hand = self.hand(player)
+
+        for hand_index in reversed(range(len(hand))):
+            if self.definition(hand[hand_index]).pre_evo is None:
+                if None in self.bench(player):
+                    self.apply_action(pokemon_action_index.encode_action(pokemon_action_index.BENCH, hand_index))
+
+                continue
+
+            for slot in range(1 + BENCH_SIZE):
+                if self.can_evolve(player, hand_index, slot):
+                    self.apply_action(pokemon_action_index.encode_action(pokemon_action_index.EVOLVE, pokemon_action_index.evolve_argument(hand_index, slot, 1 + BENCH_SIZE)))
+                    break
+
+        active = self.active(player)
+
+        if active is not None and self.energy_type(player, 0) is not None and not self.energy_attached:
+            self.apply_action(pokemon_action_index.encode_action(pokemon_action_index.ATTACH_ENERGY, 0))
+
+        move_index = self.best_move(player)
+
+        if move_index != -1 and self.active(1 - player) is not None:
+            self.apply_action(pokemon_action_index.encode_action(pokemon_action_index.ATTACK, move_index))
+        else:
+            self.apply_action(pokemon_action_index.encode_action(pokemon_action_index.END_TURN))
+
+    def legal_actions(self):
+        """Lists every action the current player can take.
+
+        Returns:
+            An array.array of int action ids, see pokemon_action_index.encode_action.
+        """
+        return self.get_action_index().legal_actions()
+
+    def state_changed(self, part):
+        """Tells the action index that a part of the state changed, see pokemon_ability.STATE_PARTS.
+
+        Args:
+            part: A string, the part that changed, or None if anything may have changed, as after
+                a move or ability effect.
+        """
+        if self.action_index is not None:
+            self.action_index.state_changed(part)
+
+        if self.zobrist is not None:
+            self.zobrist.state_changed(part)
+
+    def state_hash(self):
+        """Returns a 64 bit hash of the deck, hand, board, points and turn, see pokemon_zobrist.PokemonZobristHash.
+
+        The hash only follows changes made through the emulator's methods, state_changed must be
+        called after changing its lists or cards directly.
+        """
+        if self.zobrist is None:
+            self.zobrist = pokemon_zobrist.PokemonZobristHash(self)
+
+        return self.zobrist.value()
+
+    def clone(self, coin=None):
+        """Returns an independent copy of the game, for example to search or roll out from the current state.
+
+        Card instances, the coin and the shuffle generator are copied; the registry and logger
+        are shared, and so are the action index tables and hash keys, which only depend on the
+        registry. The clone does not record to the action log, but is timed in the same profiler.
+
+        The generators are copied without seeding them, and their states are kept until they
+        draw again, so cloning one game state many times, like a search does, reads them once.
+
+        Args:
+            coin: A pokemon_coin.PokemonCoin the clone flips instead of a copy of this game's coin.
+        """
+        clone = PokemonTCGPocketEmulator.__new__(PokemonTCGPocketEmulator)
+        copy_card = lambda card: None if card is None else card.copy()
+
+        clone.deck_one = [card.copy() for card in self.deck_one]
+        clone.deck_two = [card.copy() for card in self.deck_two]
+        clone.hand_one = [card.copy() for card in self.hand_one]
+        clone.hand_two = [card.copy() for card in self.hand_two]
+        clone.board_one_active = copy_card(self.board_one_active)
+        clone.board_one_passive = [copy_card(card) for card in self.board_one_passive]
+        clone.board_two_active = copy_card(self.board_two_active)
+        clone.board_two_passive = [copy_card(card) for card in self.board_two_passive]
+
+        if self.random_state is None:
+            self.random_state = self.random.getstate()
+
+        clone.coin = self.coin.copy() if coin is None else coin
+        clone.random = pokemon_coin.copy_generator(self.random, self.random_state)
+        clone.random_state = self.random_state
+
+        clone.points_one = self.points_one
+        clone.points_two = self.points_two
+        clone.turn = self.turn
+        clone.current_player = self.current_player
+        clone.registry = self.registry
+        clone.seed = self.seed
+        clone.energy_attached = self.energy_attached
+        clone.abilities_used = set(self.abilities_used)
+        clone.action_index = None if self.action_index is None else self.action_index.copy_for(clone)
+        clone.zobrist = None if self.zobrist is None else self.zobrist.copy_for(clone)
+        clone.action_log = None
+        clone.profiler = None
+        clone.finished = self.finished
+        clone.winner = self.winner
+        clone.logger = self.logger
+
+        if self.profiler is not None:
+            clone.enable_profiling(self.profiler)
+
+        return clone
+
+    def get_action_index(self):
+        """Returns the emulator's pokemon_action_index.PokemonActionIndex, creating it the first time."""
+        if self.action_index is None:
+            self.action_index = pokemon_action_index.PokemonActionIndex(self)
+
+        return self.action_index
+
+    def energy_type(self, player, slot):
+        """Returns the type id of the energy attached to the pokemon in a slot, the pokemon's own type."""
+        return self.registry.type_table.ids.get(self.definition(self.slot(player, slot)).type)
+
+    def apply_action(self, action):
+        """Takes an action id from legal_actions for the current player.
+
+        ATTACK and END_TURN resolve knockouts and end the turn. Energy attached by ATTACH_ENERGY
+        is of the pokemon's own type. Ability effects are called as effect(emulator, player, slot).
+        """
+        kind, argument = pokemon_action_index.decode_action(action)
+        player = self.current_player
+
+        if self.action_log is not None:
+            self.action_log.actions.append(action)
+
+        if kind == pokemon_action_index.ATTACK:
+            self.attack(player, argument)
+        elif kind == pokemon_action_index.ATTACH_ENERGY:
+            self.energy_attached = self.attach_energy(player, argument, self.energy_type(player, argument))
+        elif kind == pokemon_action_index.BENCH:
+            self.play_to_bench(player, argument)
+        elif kind == pokemon_action_index.EVOLVE:
+            self.evolve(player, *divmod(argument, 1 + BENCH_SIZE))
+        elif kind == pokemon_action_index.USE_ABILITY:
+            self.abilities_used.add(argument)
+
+            for ability in self.get_action_index().active_abilities[self.slot(player, argument).definition_id]:
+                if self.profiler is None:
+                    usable = ability.activation_condition is None or ability.activation_condition(self, player, argument)
+                else:
+                    usable = ability.activation_condition is None or self.profiler.call(pokemon_profiler.ABILITY_CHECK, ability.activation_condition, self, player, argument)
+
+                if usable and ability.effect is not None:
+                    if self.profiler is None:
+                        ability.effect(self, player, argument)
+                    else:
+                        self.profiler.call(pokemon_profiler.EFFECT, ability.effect, self, player, argument)
+
+                    self.state_changed(None)
+
+        if kind in (pokemon_action_index.ATTACK, pokemon_action_index.END_TURN):
+            self.resolve_knockouts()
+
+            if not self.finished:
+                self.end_turn()
+
+    def start_action_log(self):
+        """Starts recording the game's decks, actions and coin flips, call it before start_game.
+
+        Returns:
+            The pokemon_action_log.PokemonActionLog that is recorded to, also stored in self.action_log.
+        """
+        self.action_log = pokemon_action_log.PokemonActionLog(self.seed)
+        self.coin.flips = self.action_log.flips
+
+        return self.action_log
+
+    def enable_profiling(self, profiler=None):
+        """Starts timing the draw, energy attach, attack and knockout phases, effect functions and ability checks.
+
+        The phase methods are replaced on this instance by timed wrappers, see
+        pokemon_profiler.PokemonProfiler.timed, so emulators without a profiler run the plain methods.
+
+        Args:
+            profiler: A pokemon_profiler.PokemonProfiler to add to, a new one if None.
+
+        Returns:
+            The profiler, also stored in self.profiler.
+        """
+        self.profiler = pokemon_profiler.PokemonProfiler() if profiler is None else profiler
+
+        for phase, name in PROFILED_METHODS:
+            setattr(self, name, self.profiler.timed(phase, getattr(type(self), name).__get__(self)))
+
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stops timing and removes the timed wrappers, the profiler keeps its counters."""
+        for _, name in PROFILED_METHODS:
+            self.__dict__.pop(name, None)
+
+        self.profiler = None
+
+    def play_game(self, deck_one, deck_two):
+        """Plays a whole game between two decks with play_turn.
+
+        Args:
+            deck_one: A list of definition ids for player one's deck.
+            deck_two: A list of definition ids for player two's deck.
+
+        Returns:
+            An int, the winning player, or -1 for a draw.
+        """
+        self.start_game(deck_one, deck_two)
+
+        while not self.finished:
+            self.play_turn()
+
+        return self.winner
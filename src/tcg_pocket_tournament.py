@@ -0,0 +1,275 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pokemon_card_database
+import pokemon_card_registry
+import pokemon_coin
+import pokemon_file_reader
+import pokemon_line_parser
+import tcg_pocket_emulator
+from logger import configure_worker_logging, get_logger, logging_options
+
+GAMES_PER_PAIRING = 100
+CONFIDENCE_Z = 1.96
+
+DECK_KEYS = ("Deck Name:", "Cards:")
+
+# Card data of a worker process, loaded once by init_worker and shared by every game the worker plays
+worker_registry = None
+
+class PokemonTournamentResult:
+    """Win, loss and draw counts of every deck against every other deck.
+
+    Attributes:
+        deck_names: A list of deck names, indexed by deck index.
+        wins: A matrix (list of lists) where wins[i][j] is the number of games deck i won against deck j.
+        draws: A matrix where draws[i][j] is the number of drawn games between deck i and deck j.
+        games: A matrix where games[i][j] is the number of games played between deck i and deck j.
+    """
+
+    def __init__(self, deck_names):
+        """Initializes the instance with no games played."""
+        self.deck_names = list(deck_names)
+        self.wins = [[0] * len(self.deck_names) for _ in self.deck_names]
+        self.draws = [[0] * len(self.deck_names) for _ in self.deck_names]
+        self.games = [[0] * len(self.deck_names) for _ in self.deck_names]
+
+    def add(self, first, second, first_wins, second_wins, draws):
+        """Records the games of one pairing."""
+        self.wins[first][second] += first_wins
+        self.wins[second][first] += second_wins
+        self.draws[first][second] += draws
+        self.draws[second][first] += draws
+        self.games[first][second] += first_wins + second_wins + draws
+        self.games[second][first] += first_wins + second_wins + draws
+
+    def win_rate(self, first, second):
+        """Returns the share of games deck first won against deck second, draws count as half a win, None if no games were played."""
+        if self.games[first][second] == 0:
+            return None
+
+        return (self.wins[first][second] + 0.5 * self.draws[first][second]) / self.games[first][second]
+
+    def confidence_interval(self, first, second, z=CONFIDENCE_Z):
+        """Returns the Wilson score interval of win_rate(first, second).
+
+        Args:
+            first: An int, the index of the deck the win rate is for.
+            second: An int, the index of the opposing deck.
+            z: A float, the standard normal quantile of the interval, 1.96 for 95%.
+
+        Returns:
+            A tuple of the lower and upper bound, or None if no games were played.
+        """
+        games = self.games[first][second]
+
+        if games == 0:
+            return None
+
+        rate = self.win_rate(first, second)
+        center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+        margin = z / (1 + z * z / games) * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+
+        return max(0.0, center - margin), min(1.0, center + margin)
+
+    def win_rate_matrix(self):
+        """Returns a matrix of win_rate for every pair of decks, None on the diagonal and for unplayed pairs."""
+        return [[self.win_rate(first, second) for second in range(len(self.deck_names))] for first in range(len(self.deck_names))]
+
+def load_registry(data_directory=None):
+    """Reads the types, moves, abilities and cards in a directory into a card registry.
+
+    Types, moves and abilities come from the directory's compiled card database, see
+    pokemon_card_database.load_database, which is compiled first if it is missing or stale, so
+    workers only map it instead of parsing the text files. If the database cannot be written
+    they are read from the text files.
+
+    Args:
+        data_directory: A string that holds the directory of the card data files, the current directory if None.
+
+    Returns:
+        A pokemon_card_registry.PokemonCardRegistry.
+    """
+    working_directory = os.getcwd()
+
+    if data_directory is not None:
+        os.chdir(data_directory)
+
+    try:
+        reader = pokemon_file_reader.PokemonFileReader()
+
+        try:
+            with pokemon_card_database.load_database() as database:
+                database.fill_reader(reader)
+        except OSError as error:
+            get_logger(__name__).warning(f"Cannot use the card database, reading the card data files: {error}")
+            reader.read_all_types()
+            reader.read_all_moves()
+            reader.read_all_abilities()
+
+        reader.read_all_cards()
+    finally:
+        os.chdir(working_directory)
+
+    return pokemon_card_registry.PokemonCardRegistry.from_reader(reader)
+
+def init_worker(data_directory=None, log_options=None):
+    """Process pool initializer, sets up the worker's logging, see logger.configure_worker_logging, and loads the card data once per worker."""
+    global worker_registry
+    configure_worker_logging(log_options)
+    worker_registry = load_registry(data_directory)
+
+def game_seed(seed, first, second, game):
+    """Derives the seed of one game from the tournament seed, the pairing and the game's number.
+
+    The seed only depends on its arguments, so a game plays out the same no matter which worker
+    plays it or in which order.
+
+    Returns:
+        An int, a 64 bit seed.
+    """
+    return pokemon_coin.derive_seed(seed, first, second, game)
+
+def deck_ids(registry, deck):
+    """Converts a list of card names to definition ids.
+
+    Raises:
+        ValueError: A card is not in the registry.
+    """
+    ids = [registry.id_of(name) for name in deck]
+
+    if None in ids:
+        raise ValueError(f"Card {deck[ids.index(None)]} does not exist")
+
+    return ids
+
+def play_single_game(registry, first_deck, second_deck, seed, first, second, game):
+    """Plays one game of a pairing, this is also how any single tournament result is reproduced.
+
+    Deck first goes first in even numbered games and second in odd numbered games.
+
+    Args:
+        registry: A pokemon_card_registry.PokemonCardRegistry with the cards of both decks.
+        first_deck: A list of card names for deck first.
+        second_deck: A list of card names for deck second.
+        seed: The tournament seed.
+        first: An int, the index of the first deck of the pairing.
+        second: An int, the index of the second deck of the pairing.
+        game: An int, the number of the game within the pairing.
+
+    Returns:
+        An int, 0 if deck first won, 1 if deck second won, -1 for a draw.
+    """
+    decks = (deck_ids(registry, first_deck), deck_ids(registry, second_deck))
+    swapped = game % 2
+
+    emulator = tcg_pocket_emulator.PokemonTCGPocketEmulator(registry, game_seed(seed, first, second, game))
+    winner = emulator.play_game(decks[swapped], decks[1 - swapped])
+
+    if winner == -1:
+        return -1
+
+    return winner ^ swapped
+
+def play_pairing(first_deck, second_deck, seed, first, second, games, registry=None):
+    """Plays every game of a pairing with the worker's card data.
+
+    Returns:
+        A tuple of first, second, the number of games won by each deck and the number of draws.
+    """
+    registry = worker_registry if registry is None else registry
+    # Deck first wins, deck second wins and draws, indexed by the result of play_single_game
+    results = [0, 0, 0]
+
+    for game in range(games):
+        results[play_single_game(registry, first_deck, second_deck, seed, first, second, game)] += 1
+
+    return first, second, results[0], results[1], results[-1]
+
+def run_tournament(decks, games=GAMES_PER_PAIRING, seed=0, workers=None, data_directory=None):
+    """Plays every pair of decks against each other across a process pool.
+
+    Each pairing is one task and its counts are added to the result as soon as it finishes. Every
+    worker loads the card data once when it starts, from the card database this process compiled.
+
+    Args:
+        decks: A dictionary of deck name -> list of card names.
+        games: An int that holds the number of games per pairing.
+        seed: The tournament seed that every game's seed is derived from.
+        workers: An int that holds the number of worker processes, os.cpu_count() if None, and 0
+            to play every game in this process.
+        data_directory: A string that holds the directory of the card data files, the current directory if None.
+
+    Returns:
+        A PokemonTournamentResult.
+    """
+    logger = get_logger(__name__)
+    names = list(decks)
+    result = PokemonTournamentResult(names)
+    pairings = [(first, second) for first in range(len(names)) for second in range(first + 1, len(names))]
+
+    logger.info(f"Playing {len(pairings)} pairings of {games} games between {len(names)} decks")
+
+    if workers == 0:
+        registry = load_registry(data_directory)
+
+        for first, second in pairings:
+            result.add(*play_pairing(decks[names[first]], decks[names[second]], seed, first, second, games, registry))
+
+        return result
+
+    # Compiles a missing or stale card database once, before the workers map it
+    load_registry(data_directory)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data_directory, logging_options())) as executor:
+        futures = [executor.submit(play_pairing, decks[names[first]], decks[names[second]], seed, first, second, games) for first, second in pairings]
+
+        for future in as_completed(futures):
+            result.add(*future.result())
+
+    logger.info(f"Finished {len(pairings) * games} tournament games")
+
+    return result
+
+def read_decks(path):
+    """Reads decks from a file with lines in the form "Deck Name: [Name], Cards: [Card names seperated by '; ']".
+
+    Raises:
+        ValueError: A line is not in the deck format.
+
+    Returns:
+        A dictionary of deck name -> list of card names, in file order.
+    """
+    decks = dict()
+
+    with open(path, 'r') as file:
+        for line in file:
+            if len(line.strip()) == 0:
+                continue
+
+            values, _, bad_field = pokemon_line_parser.split_fields(line.strip(), DECK_KEYS)
+
+            if bad_field != -1:
+                raise ValueError(f"Error in formatting of deck: {line.strip()}")
+
+            decks[values[0].strip()] = [name.strip() for name in values[1].split(";")]
+
+    return decks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays every pair of decks against each other and prints the win rate matrix.")
+    parser.add_argument("decks", help="file with one \"Deck Name: [Name], Cards: [Card; Card]\" line per deck")
+    parser.add_argument("--games", type=int, default=GAMES_PER_PAIRING)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--data", default=None, help="directory of the card data files")
+    args = parser.parse_args()
+
+    result = run_tournament(read_decks(args.decks), args.games, args.seed, args.workers, args.data)
+
+    for first, name in enumerate(result.deck_names):
+        for second, opponent in enumerate(result.deck_names):
+            if first != second:
+                low, high = result.confidence_interval(first, second)
+                print(f"{name} vs {opponent}: {result.win_rate(first, second):.3f} [{low:.3f}, {high:.3f}]")
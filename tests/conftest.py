@@ -0,0 +1,48 @@
+import pytest
+from pokemon_card import PokemonCardDefinition
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_move import PokemonMove
+from pokemon_type_table import PokemonTypeTable
+
+@pytest.fixture
+def type_table():
+    """Creates a type table with the types of the example cards."""
+
+    return PokemonTypeTable(["Lightning", "Fighting", "Colorless"])
+
+@pytest.fixture
+def add_card(type_table):
+    """Returns a function that adds a pokemon with one move named "[Name] Attack" to a registry.
+
+    The function takes the registry, the card's name, type, health, move damage and move energies,
+    and optionally its pre evolution, weakness, move effect and abilities, and returns the card's id.
+    """
+
+    def add(registry, name, card_type, health, damage, energies, pre_evo=None, weakness=None, effect=None, abilities=()):
+        move = PokemonMove(f"{name} Attack", tuple(energies), type_table.cost_vector(energies), damage, effect)
+
+        definition = PokemonCardDefinition()
+        definition.card_type = "Pokemon"
+        definition.name = name
+        definition.pre_evo = pre_evo
+        definition.type = card_type
+        definition.weaknesses = weakness
+        definition.health = health
+        definition.abilties = tuple(abilities)
+        definition.moves = (move,)
+
+        return registry.add(definition)
+
+    return add
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with a pikachu line and a fighting card."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    add_card(registry, "Pikachu", "Lightning", 60, 30, ["Lightning"])
+    add_card(registry, "Machop", "Fighting", 70, 20, ["Fighting"])
+    add_card(registry, "Raichu", "Lightning", 120, 60, ["Lightning"], pre_evo="Pikachu")
+
+    return registry
@@ -0,0 +1,91 @@
+import logging
+import queue
+import pytest
+from logger import LOG_FORMAT, BatchFileHandler, BatchQueueListener, configure_logging, configure_worker_logging, get_logger, logging_options, settings, stop_logging
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Gives a log file path and restores the default logging setup afterwards."""
+
+    yield tmp_path / "test.log"
+
+    configure_logging()
+
+def test_asynchronous_logging_writes_on_stop(log_path):
+    """Test if records logged through the queue are written once the listener stops"""
+    configure_logging(asynchronous=True, path=log_path)
+    logger = get_logger("test_logger_asynchronous")
+
+    logger.error("Queued record")
+    stop_logging()
+
+    assert "test_logger_asynchronous - ERROR - Queued record" in log_path.read_text()
+
+def test_module_levels(log_path):
+    """Test if a module configured at WARNING skips lower records"""
+    logger = get_logger("test_logger_levels")
+    configure_logging(levels={"test_logger_levels": logging.WARNING}, path=log_path)
+
+    logger.info("Skipped record")
+    logger.warning("Kept record")
+    stop_logging()
+
+    assert logger.level == logging.WARNING
+    assert "Skipped record" not in log_path.read_text()
+    assert "Kept record" in log_path.read_text()
+
+def test_log_file_rotates(log_path):
+    """Test if the log file rotates at max_bytes"""
+    configure_logging(path=log_path, max_bytes=200, backup_count=2)
+    logger = get_logger("test_logger_rotation")
+
+    for index in range(20):
+        logger.error(f"Record {index}")
+
+    stop_logging()
+
+    assert log_path.stat().st_size <= 200
+    assert (log_path.parent / "test.log.1").exists()
+    assert not (log_path.parent / "test.log.3").exists()
+
+def test_listener_writes_in_batches(log_path):
+    """Test if queued records are handed to the file handler in batches of at most batch_size"""
+    records = queue.SimpleQueue()
+    handler = BatchFileHandler(log_path)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    batches = []
+    handle_batch = handler.handle_batch
+    handler.handle_batch = lambda batch: batches.append(len(batch)) or handle_batch(batch)
+
+    for index in range(600):
+        records.put(logging.makeLogRecord({"name": "test_logger_batches", "levelno": logging.ERROR, "levelname": "ERROR", "msg": f"Record {index}"}))
+
+    listener = BatchQueueListener(records, handler, batch_size=256)
+    listener.start()
+    listener.stop()
+    handler.close()
+
+    assert batches == [256, 256, 88]
+    assert len(log_path.read_text().splitlines()) == 600
+
+def test_stop_detaches_queue_handler(log_path):
+    """Test if stopping asynchronous logging removes the queue handler from every logger"""
+    configure_logging(asynchronous=True, path=log_path)
+    logger = get_logger("test_logger_detach")
+    handler = settings["handler"]
+    stop_logging()
+
+    assert handler not in logger.handlers
+
+def test_worker_logging_is_synchronous(log_path):
+    """Test if a worker set up with the parent's options writes straight to the same file at the same levels"""
+    configure_logging(levels={"test_logger_worker": logging.WARNING}, asynchronous=True, path=log_path)
+    configure_worker_logging(logging_options())
+    logger = get_logger("test_logger_worker")
+
+    logger.info("Skipped record")
+    logger.warning("Worker record")
+
+    assert settings["listener"] is None
+    assert "Worker record" in log_path.read_text()
+    assert "Skipped record" not in log_path.read_text()
@@ -0,0 +1,89 @@
+import pytest
+from pokemon_ability import PokemonAbility, depends_on
+from pokemon_action_index import USE_ABILITY, decode_action
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_file_reader import PokemonFileReader
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@depends_on("energy")
+def charged(emulator, player, slot):
+    """Example condition that is true once the pokemon has two energy."""
+    return sum(emulator.slot(player, slot).energy) >= 2
+
+def anything(emulator, player, slot):
+    """Example condition without a declaration."""
+    return True
+
+@pytest.fixture
+def emulator(type_table, add_card):
+    """Creates an emulator with three pokemon using a declared condition and one using an undeclared one."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    for name, condition in (("Pikachu", charged), ("Magnemite", anything)):
+        ability = PokemonAbility(f"{name} Ability", False, condition, False, None, getattr(condition, "depends_on", None))
+        add_card(registry, name, "Lightning", 60, 10, ["Colorless"], abilities=(ability,))
+
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_one_passive = [registry.new_instance(0), registry.new_instance(0), None]
+    emulator.board_two_active = registry.new_instance(0)
+    emulator.deck_one = [registry.new_instance(1) for _ in range(5)]
+
+    return emulator
+
+def usable_slots(emulator):
+    """Returns the slots with a USE_ABILITY action."""
+    return [argument for kind, argument in map(decode_action, emulator.legal_actions()) if kind == USE_ABILITY]
+
+def test_declared_condition_is_only_called_after_its_part_changes(emulator):
+    """Test if drawing and benching do not call an energy condition again, but attaching energy does"""
+    assert usable_slots(emulator) == []
+
+    index = emulator.get_action_index()
+
+    assert index.evaluations == 3
+
+    for _ in range(3):
+        emulator.draw(0)
+        emulator.legal_actions()
+
+    emulator.play_to_bench(0, 0)
+    emulator.legal_actions()
+
+    # Only the newly benched pokemon is checked
+    assert index.evaluations == 4
+
+    emulator.attach_energy(0, 0, 0)
+    emulator.attach_energy(0, 0, 0)
+
+    assert usable_slots(emulator) == [0, 3]
+    assert index.evaluations == 8
+
+def test_undeclared_condition_is_called_after_any_change(emulator):
+    """Test if a condition without a declaration is called again after any change"""
+    emulator.draw(0)
+    emulator.play_to_bench(0, 0)
+
+    assert usable_slots(emulator) == [3]
+
+    index = emulator.get_action_index()
+    evaluations = index.evaluations
+    emulator.draw(0)
+    emulator.legal_actions()
+
+    assert index.evaluations == evaluations + 1
+
+def test_depends_on_rejects_unknown_parts():
+    """Test if declaring an unknown part raises"""
+    with pytest.raises(ValueError):
+        depends_on("weather")
+
+def test_reader_reads_declared_parts(monkeypatch):
+    """Test if read_ability takes the declaration from the activation function"""
+    reader = PokemonFileReader()
+    monkeypatch.setattr(reader.effect_resolver, "resolve", lambda module_names, name: charged)
+
+    ability = reader.read_ability("Ability Name: Charge, Type: Active, Activation Function: charged, Effect Function: None")
+
+    assert ability.depends_on == frozenset(["energy"])
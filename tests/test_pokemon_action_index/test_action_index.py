@@ -0,0 +1,133 @@
+import random
+import pytest
+from pokemon_ability import PokemonAbility
+from pokemon_action_index import ATTACH_ENERGY, ATTACK, BENCH, END_TURN, EVOLVE, USE_ABILITY, PokemonActionIndex, decode_action, encode_action, evolve_argument
+from pokemon_card_registry import PokemonCardRegistry
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with a pikachu line, where raichu has an active ability, and a fighting card."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    charge = PokemonAbility("Charge", False, lambda emulator, player, slot: emulator.slot(player, slot).health > 50, False,
+                            lambda emulator, player, slot: emulator.attach_energy(player, slot, 0))
+
+    add_card(registry, "Pikachu", "Lightning", 60, 30, ["Lightning"])
+    add_card(registry, "Machop", "Fighting", 70, 20, ["Fighting", "Colorless"])
+    add_card(registry, "Raichu", "Lightning", 120, 60, ["Lightning", "Lightning"], pre_evo="Pikachu", abilities=(charge,))
+
+    return registry
+
+@pytest.fixture
+def emulator(registry):
+    """Creates an emulator at the start of player one's turn with pikachu active against machop."""
+
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_two_active = registry.new_instance(1)
+    emulator.hand_one = [registry.new_instance(1), registry.new_instance(2)]
+
+    return emulator
+
+def decoded(actions):
+    """Returns the (kind, argument) pairs of an array of action ids."""
+    return [decode_action(action) for action in actions]
+
+def test_encode_decode_round_trip():
+    """Test if an action id decodes to its kind and argument"""
+    assert decode_action(encode_action(EVOLVE, evolve_argument(3, 2, 4))) == (EVOLVE, 14)
+    assert encode_action(END_TURN) == 0
+    assert decode_action(encode_action(EVOLVE, evolve_argument(2047, 3, 4))) == (EVOLVE, 8191)
+
+def test_argument_overflow_raises():
+    """Test if an argument too large for the action id raises instead of changing its kind"""
+    with pytest.raises(ValueError):
+        encode_action(EVOLVE, evolve_argument(2048, 0, 4))
+
+    with pytest.raises(ValueError):
+        encode_action(BENCH, -1)
+
+def test_start_of_turn_actions(emulator):
+    """Test if the actions are attaching energy, benching basics and ending the turn"""
+    actions = emulator.legal_actions()
+
+    assert actions.typecode == "i"
+    assert decoded(actions) == [(ATTACH_ENERGY, 0), (BENCH, 0), (END_TURN, 0)]
+
+def test_attach_makes_move_affordable(emulator):
+    """Test if attaching energy allows the attack and energy can only be attached once a turn"""
+    emulator.apply_action(encode_action(ATTACH_ENERGY, 0))
+
+    assert emulator.board_one_active.energy == (1, 0, 0)
+    assert decoded(emulator.legal_actions()) == [(ATTACK, 0), (BENCH, 0), (END_TURN, 0)]
+
+    emulator.apply_action(encode_action(ATTACK, 0))
+
+    assert emulator.board_two_active.health == 40
+    assert emulator.current_player == 1
+
+def test_affordable_moves_are_cached(emulator, registry):
+    """Test if pokemon with the same definition and energy share one cached entry"""
+    index = emulator.get_action_index()
+    emulator.board_one_passive[0] = registry.new_instance(0)
+
+    emulator.legal_actions()
+    index.affordable_moves(emulator.board_one_passive[0])
+
+    assert index.affordable == {(0, (0, 0, 0)): 0}
+
+def test_evolve_and_ability_actions(emulator):
+    """Test if evolution is listed once the pokemon is ready and the ability once it is usable"""
+    emulator.board_one_active.evo_ready = True
+
+    assert (EVOLVE, evolve_argument(1, 0, 4)) in decoded(emulator.legal_actions())
+
+    emulator.apply_action(encode_action(EVOLVE, evolve_argument(1, 0, 4)))
+
+    assert emulator.board_one_active.definition_id == 2
+    assert (USE_ABILITY, 0) in decoded(emulator.legal_actions())
+
+    emulator.apply_action(encode_action(USE_ABILITY, 0))
+
+    assert emulator.board_one_active.energy == (1, 0, 0)
+    assert (USE_ABILITY, 0) not in decoded(emulator.legal_actions())
+
+def test_random_legal_actions_finish_game(registry):
+    """Test if a game played with random legal actions ends"""
+    emulator = PokemonTCGPocketEmulator(registry, 3)
+    choices = random.Random(3)
+    emulator.start_game([0] * 8 + [2] * 4, [1] * 12)
+
+    while not emulator.finished:
+        emulator.apply_action(choices.choice(emulator.legal_actions()))
+
+    assert emulator.legal_actions().tolist() == []
+    assert emulator.winner in (-1, 0, 1)
+
+def test_evolutions_follow_hand_changes(emulator, registry):
+    """Test if evolutions are kept between calls and updated when a card is drawn"""
+    index = emulator.get_action_index()
+    emulator.board_one_active.evo_ready = True
+    emulator.deck_one = [registry.new_instance(2)]
+
+    assert index.evolutions(0) == [(1, 0)]
+    assert index.evolutions(0) is index.evolutions(0)
+
+    emulator.draw(0)
+
+    assert index.evolutions(0) == [(1, 0), (2, 0)]
+    assert (EVOLVE, evolve_argument(2, 0, 4)) in decoded(emulator.legal_actions())
+
+def test_kept_evolutions_match_full_scan(registry):
+    """Test if the evolutions kept up to date by state_changed equal a new scan after every action"""
+    emulator = PokemonTCGPocketEmulator(registry, 5)
+    choices = random.Random(5)
+    emulator.start_game([0] * 8 + [2] * 4, [0] * 8 + [2] * 4)
+
+    while not emulator.finished:
+        for player in (0, 1):
+            assert emulator.get_action_index().evolutions(player) == PokemonActionIndex(emulator).evolutions(player)
+
+        emulator.apply_action(choices.choice(emulator.legal_actions()))
@@ -0,0 +1,76 @@
+import pytest
+from pokemon_bulk_import import bulk_import, find_files, read_chunks
+from pokemon_error_report import PokemonImportError
+
+@pytest.fixture
+def data_directory(tmp_path):
+    """Creates a directory with standard files and two expansions, one overriding a standard move."""
+
+    (tmp_path / "pokemon_standard_types.txt").write_text("Fire\nColorless\n")
+    (tmp_path / "expansion_types.txt").write_text("Crystal\n")
+    (tmp_path / "pokemon_standard_moves.txt").write_text(
+        "".join(f"Move Name: Move {index}, Energies: Fire, Damage: {index}, Effect Function: None\n" for index in range(50))
+    )
+    (tmp_path / "a_expansion_moves.txt").write_text(
+        "Move Name: Move 3, Energies: Crystal, Damage: 300, Effect Function: None\n"
+        "Move Name: , Energies: Fire, Damage: 10, Effect Function: None\n"
+    )
+    (tmp_path / "b_expansion_moves.txt").write_text(
+        "Move Name: Move 3, Energies: Crystal; Crystal, Damage: 333, Effect Function: None\n"
+        "Move Name: Shine, Energies: Water, Damage: 10, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_standard_abilities.txt").write_text(
+        "Ability Name: Blaze, Type: Passive, Activation Function: None, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_standard_cards.txt").write_text(
+        "Card Name: Charmander, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Fire, Weakness: None, Abilities: Blaze, Moves: Move 3\n"
+    )
+    (tmp_path / "notes.txt").write_text("Not a data file\n")
+
+    return tmp_path
+
+def test_find_files_orders_standard_first(data_directory):
+    """Test if files are grouped by kind with standard files first"""
+    files = find_files(str(data_directory))
+
+    assert [path.rsplit("/", 1)[1] for path in files["moves"]] == ["pokemon_standard_moves.txt", "a_expansion_moves.txt", "b_expansion_moves.txt"]
+    assert [path.rsplit("/", 1)[1] for path in files["types"]] == ["pokemon_standard_types.txt", "expansion_types.txt"]
+    assert find_files(str(data_directory / "*_cards.txt"))["cards"] == [str(data_directory / "pokemon_standard_cards.txt")]
+
+def test_read_chunks_keeps_line_numbers(data_directory):
+    """Test if chunks hold at most chunk_size lines and the line number they start at"""
+    chunks = list(read_chunks([str(data_directory / "pokemon_standard_moves.txt")], chunk_size=20))
+
+    assert [(first_line, len(lines)) for _, first_line, lines in chunks] == [(1, 20), (21, 20), (41, 10)]
+
+def test_in_process_import_overrides_and_reports(data_directory):
+    """Test if later files override earlier ones and errors keep their file and line"""
+    reader = bulk_import(str(data_directory), workers=0, chunk_size=7)
+
+    assert reader.type_table.names == ["Fire", "Colorless", "Crystal"]
+    assert len(reader.moves) == 50
+    assert reader.moves["Move 3"].damage == 333
+    assert reader.cards["Charmander"].moves[0] is reader.moves["Move 3"]
+    assert reader.cards["Charmander"].abilties[0] is reader.abilities["Blaze"]
+
+    report = reader.error_reports["moves"]
+
+    assert report.counts == {"no_name_is_given_for_move": 1, "illegal_energy_type_used_in_move": 1}
+    assert report.samples["illegal_energy_type_used_in_move"][0].file.endswith("b_expansion_moves.txt")
+    assert report.samples["illegal_energy_type_used_in_move"][0].line == 2
+
+def test_process_pool_matches_in_process(data_directory):
+    """Test if reading across worker processes gives the same result as in process"""
+    expected = bulk_import(str(data_directory), workers=0, chunk_size=7)
+    reader = bulk_import(str(data_directory), workers=2, chunk_size=7)
+
+    assert reader.moves == expected.moves
+    assert list(reader.moves) == list(expected.moves)
+    assert reader.abilities.keys() == expected.abilities.keys()
+    assert reader.moves["Move 3"].energy_cost == expected.moves["Move 3"].energy_cost
+    assert reader.error_reports["moves"].counts == expected.error_reports["moves"].counts
+
+def test_max_errors_stops_import(data_directory):
+    """Test if the import stops when a kind has more than max_errors invalid lines"""
+    with pytest.raises(PokemonImportError):
+        bulk_import(str(data_directory), workers=0, max_errors=1)
@@ -0,0 +1,26 @@
+import pytest
+from pokemon_card import PokemonCardDefinition, PokemonCardInstance
+from pokemon_move import PokemonMove
+from pokemon_ability import PokemonAbility
+
+def test_records_have_no_instance_dict():
+    """Test if card, move and ability records are slotted"""
+    for record in (PokemonCardDefinition(), PokemonCardInstance(), PokemonMove(), PokemonAbility()):
+        assert not hasattr(record, "__dict__")
+
+        with pytest.raises(AttributeError):
+            record.unknown_attribute = None
+
+def test_instance_copy_is_independent():
+    """Test if a copied instance has the same state and can be changed without changing the original"""
+    instance = PokemonCardInstance(3, 60, None, False, (1, 0, 0))
+    copy = instance.copy()
+
+    assert copy == instance
+    assert copy is not instance
+
+    copy.health = 30
+    copy.energy = (2, 0, 0)
+
+    assert instance.health == 60
+    assert instance.energy == (1, 0, 0)
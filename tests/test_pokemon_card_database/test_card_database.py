@@ -0,0 +1,114 @@
+import os
+import pytest
+import pokemon_card_database
+from pokemon_file_reader import PokemonFileReader
+from pokemon_card_database import compile_database, load_database, PokemonCardDatabase
+
+@pytest.fixture
+def card_files(tmp_path, monkeypatch):
+    """Writes example card data files to a temporary directory and makes it the working directory."""
+
+    (tmp_path / "pokemon_standard_types.txt").write_text("Fire\nWater\nColorless\n")
+    (tmp_path / "pokemon_custom_types.txt").write_text("Crystal\n")
+    (tmp_path / "pokemon_standard_moves.txt").write_text(
+        "Move Name: Flamethrower, Energies: Fire; Fire; Colorless, Damage: 90, Effect Function: None\n"
+        "Move Name: Tackle, Energies: None, Damage: 10, Effect Function: None\n"
+        "Move Name: Broken, Energies: Fire, Damage: ten, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_custom_moves.txt").write_text(
+        "Move Name: Crystal Rush, Energies: Crystal; Crystal, Damage: 70, Effect Function: None\n"
+        "Move Name: Tackle, Energies: Colorless, Damage: 20, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_standard_abilities.txt").write_text(
+        "Ability Name: Wash Out, Type: Active, Activation Function: None, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_custom_abilities.txt").write_text(
+        "Ability Name: Pixilate, Type: Passive, Activation Function: None, Effect Function: None\n"
+    )
+
+    monkeypatch.chdir(tmp_path)
+
+    return tmp_path
+
+def test_database_matches_file_reader(card_files):
+    """Test if the compiled database holds the same types, moves and abilities as the file reader"""
+    reader = PokemonFileReader()
+    types = reader.read_all_types()
+    moves = reader.read_all_moves()
+    abilities = reader.read_all_abilities()
+
+    compile_database("cards.bin")
+
+    with PokemonCardDatabase("cards.bin") as database:
+        assert database.read_all_types() == types
+        assert database.read_all_moves() == moves
+        assert database.read_all_abilities() == abilities
+        assert database.find_move("Tackle").damage == 20
+        assert database.find_move("Broken") is None
+        assert database.find_ability("Pixilate").passive == True
+        assert database.find_ability("Solar Power") is None
+        assert not database.is_stale()
+
+def test_database_is_stale_after_source_change(card_files):
+    """Test if changing a source file's contents makes the database stale, but only touching it does not"""
+    compile_database("cards.bin")
+
+    moves_file = card_files / "pokemon_custom_moves.txt"
+    stat = os.stat(moves_file)
+
+    with PokemonCardDatabase("cards.bin") as database:
+        os.utime(moves_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not database.is_stale()
+
+        moves_file.write_text("Move Name: Crystal Rush, Energies: Crystal, Damage: 70, Effect Function: None\n")
+        os.utime(moves_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        assert database.is_stale()
+
+def test_unchanged_sources_are_not_hashed(card_files, monkeypatch):
+    """Test if checking sources whose mtime and size are unchanged does not read them"""
+    compile_database("cards.bin")
+    monkeypatch.setattr(pokemon_card_database, "source_digest", lambda path: pytest.fail(f"{path} was hashed"))
+
+    with PokemonCardDatabase("cards.bin") as database:
+        assert not database.is_stale()
+
+def test_touched_source_is_hashed_once(card_files, monkeypatch):
+    """Test if the new mtime of a touched source is stored, so the next load does not hash it again"""
+    compile_database("cards.bin")
+
+    moves_file = card_files / "pokemon_custom_moves.txt"
+    stat = os.stat(moves_file)
+    os.utime(moves_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with PokemonCardDatabase("cards.bin") as database:
+        assert not database.is_stale()
+
+    monkeypatch.setattr(pokemon_card_database, "source_digest", lambda path: pytest.fail(f"{path} was hashed"))
+
+    with PokemonCardDatabase("cards.bin") as database:
+        assert not database.is_stale()
+
+def test_new_card_file_makes_database_stale(card_files):
+    """Test if creating a cards file after compiling makes the database stale"""
+    compile_database("cards.bin")
+    (card_files / "pokemon_custom_cards.txt").write_text("Card Name: Vulpix, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Fire, Weakness: Water, Abilities: None, Moves: Tackle\n")
+
+    with PokemonCardDatabase("cards.bin") as database:
+        assert database.is_stale()
+
+def test_load_database_recompiles_when_stale(card_files):
+    """Test if load_database compiles a missing database and recompiles a stale one"""
+    with load_database("cards.bin") as database:
+        assert database.find_move("Crystal Rush").energy == ("Crystal", "Crystal")
+
+    (card_files / "pokemon_custom_moves.txt").write_text("Move Name: Crystal Rush, Energies: Crystal, Damage: 70, Effect Function: None\n")
+
+    with load_database("cards.bin") as database:
+        assert database.find_move("Crystal Rush").energy == ("Crystal",)
+
+def test_invalid_file_is_rejected(card_files):
+    """Test if a file that is not a card database cannot be opened"""
+    (card_files / "cards.bin").write_bytes(b"not a card database at all")
+
+    with pytest.raises(ValueError):
+        PokemonCardDatabase("cards.bin")
@@ -0,0 +1,48 @@
+from pokemon_card import PokemonCardDefinition
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_file_reader import PokemonFileReader
+
+def make_definition(name, health):
+    """Creates a card definition with the given name and health."""
+    definition = PokemonCardDefinition()
+    definition.card_type = "Pokemon"
+    definition.name = name
+    definition.health = health
+    definition.type = "Lightning"
+    return definition
+
+def test_ids_are_dense_and_overrides_keep_id():
+    """Test if definitions get dense ids and a definition with a known name replaces the old one"""
+    registry = PokemonCardRegistry(3)
+
+    assert registry.add(make_definition("Pikachu", 60)) == 0
+    assert registry.add(make_definition("Raichu", 120)) == 1
+    assert registry.add(make_definition("Pikachu", 70)) == 0
+    assert len(registry) == 2
+    assert registry.get(0).health == 70
+    assert registry.id_of("Raichu") == 1
+    assert registry.id_of("Zapdos") is None
+
+def test_new_instance_starts_at_full_health():
+    """Test if a new instance refers to its definition and has fresh state"""
+    registry = PokemonCardRegistry(3)
+    registry.add(make_definition("Pikachu", 60))
+
+    instance = registry.new_instance(0)
+
+    assert instance.definition_id == 0
+    assert instance.health == 60
+    assert instance.status is None
+    assert instance.evo_ready == False
+    assert instance.energy == (0, 0, 0)
+
+def test_from_reader_shares_definitions():
+    """Test if a registry built from a reader holds the reader's definitions by reference"""
+    reader = PokemonFileReader()
+    reader.type_table.add("Lightning")
+    reader.cards = {"Pikachu": make_definition("Pikachu", 60)}
+
+    registry = PokemonCardRegistry.from_reader(reader)
+
+    assert registry.get(registry.id_of("Pikachu")) is reader.cards["Pikachu"]
+    assert registry.new_instance(0).energy == (0,)
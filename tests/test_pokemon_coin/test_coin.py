@@ -0,0 +1,85 @@
+import random
+import pytest
+from pokemon_coin import CoinSide, PokemonCoin, derive_seed
+
+def test_flip_coin_returns_side():
+    """Test if a flip returns a CoinSide and stores it"""
+    coin = PokemonCoin(1)
+
+    side = coin.flip_coin()
+
+    assert isinstance(side, CoinSide)
+    assert coin.state is side
+    assert bool(CoinSide.HEADS) and not CoinSide.TAILS
+
+def test_same_seed_flips_the_same():
+    """Test if coins with the same seed give the same flips"""
+    first = PokemonCoin(42)
+    second = PokemonCoin(42)
+
+    assert [first.flip_coin() for _ in range(20)] == [second.flip_coin() for _ in range(20)]
+    assert first.flip_many(32) == second.flip_many(32)
+
+def test_flip_many_packs_bits():
+    """Test if flip_many gives count bits and counts heads"""
+    coin = PokemonCoin(3)
+
+    flips = coin.flip_many(3)
+
+    assert 0 <= flips < 2 ** 3
+    assert PokemonCoin.count_heads(flips) == bin(flips).count("1")
+    assert coin.flip_many(0) == 0
+    assert PokemonCoin.count_heads(0b1011) == 3
+
+def test_split_is_reproducible_and_independent():
+    """Test if split coins depend only on the seed and keys"""
+    coin = PokemonCoin(5)
+
+    assert coin.split("game", 1).flip_many(64) == PokemonCoin(5).split("game", 1).flip_many(64)
+    assert coin.split("game", 1).flip_many(64) != coin.split("game", 2).flip_many(64)
+    assert coin.split("game", 1).seed == derive_seed(5, "game", 1)
+
+def test_setstate_rewinds():
+    """Test if a coin rewound with setstate repeats its flips"""
+    coin = PokemonCoin(9)
+    coin.flip_coin()
+    state = coin.getstate()
+
+    flips = [coin.flip_coin() for _ in range(10)]
+    coin.setstate(state)
+
+    assert [coin.flip_coin() for _ in range(10)] == flips
+
+def test_seek_moves_to_position():
+    """Test if a new coin that seeks to another coin's position flips the same from there"""
+    coin = PokemonCoin(11)
+    coin.flip_coin()
+    coin.flip_many(40)
+
+    other = PokemonCoin(11)
+    other.seek(coin.position)
+
+    assert coin.position == 3
+    assert [other.flip_coin() for _ in range(10)] == [coin.flip_coin() for _ in range(10)]
+
+def test_seek_needs_a_seed():
+    """Test if an unseeded coin cannot seek"""
+    with pytest.raises(ValueError):
+        PokemonCoin().seek(1)
+
+def test_copy_flips_the_same_without_seeding(monkeypatch):
+    """Test if a copy flips like the original from the point it was copied, also after the original flips on, without seeding a generator"""
+    coin = PokemonCoin()
+    coin.flip_many(5)
+    monkeypatch.setattr(random.Random, "seed", lambda self, *args, **kwargs: pytest.fail("generator was seeded"))
+
+    first = coin.copy()
+    second = coin.copy()
+
+    assert [first.flip_coin() for _ in range(20)] == [second.flip_coin() for _ in range(20)]
+
+    coin.flip_coin()
+    third = coin.copy()
+
+    assert [third.flip_coin() for _ in range(20)] == [coin.flip_coin() for _ in range(20)]
+    assert third.position == coin.position
@@ -0,0 +1,123 @@
+import sys
+import pytest
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_data_generator import DECK_SIZE, MAX_COPIES, PokemonDataGenerator, generated_effect_modules
+from pokemon_file_reader import PokemonFileReader
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+from tcg_pocket_tournament import read_decks
+
+def read_directory(directory, monkeypatch):
+    """Reads every data file of a directory, with its effect list modules, with a new reader."""
+    monkeypatch.chdir(directory)
+
+    with generated_effect_modules(directory):
+        reader = PokemonFileReader(cache_size=0)
+        reader.read_all_types()
+        reader.read_all_moves()
+        reader.read_all_abilities()
+        reader.read_all_cards()
+
+    return reader
+
+def test_valid_pool_reads_back(tmp_path, monkeypatch):
+    """Test if a pool without errors reads back without errors, with custom entries overriding standard ones"""
+    generator = PokemonDataGenerator(moves=40, abilities=10, cards=30, types=12, custom_share=0.5, overlap=0.5, effect_share=0, seed=1)
+    counts = generator.write(tmp_path)
+    reader = read_directory(tmp_path, monkeypatch)
+
+    assert counts["pokemon_standard_moves.txt"] == 40
+    assert counts["pokemon_custom_moves.txt"] == 20
+    assert counts["pokemon_custom_types.txt"] == 2
+    assert len(reader.types) == 12
+    assert len(reader.moves) == 40 + 10
+    assert len(reader.abilities) == 10 + 3
+    assert len(reader.cards) == 30 + 15
+    assert all(report.total == 0 for report in reader.error_reports.values())
+
+def test_effect_functions_resolve(tmp_path, monkeypatch):
+    """Test if a pool with effect functions reads back without errors, with the generated functions"""
+    original = sys.modules.get("pokemon_standard_move_effect_list")
+    generator = PokemonDataGenerator(moves=60, abilities=30, cards=40, seed=7)
+    generator.write(tmp_path)
+    reader = read_directory(tmp_path, monkeypatch)
+
+    assert all(report.total == 0 for report in reader.error_reports.values())
+
+    for kind, records in (("moves", reader.moves), ("abilities", reader.abilities), ("cards", reader.cards)):
+        assert set(records) == set(generator.valid[kind])
+
+    effects = [move.effect for move in reader.moves.values() if move.effect is not None]
+
+    assert len(effects) > 0
+    assert all(effect.__code__.co_filename.startswith(str(tmp_path)) for effect in effects)
+    assert any(ability.activation_condition is not None for ability in reader.abilities.values())
+    assert sys.modules.get("pokemon_standard_move_effect_list") is original
+    assert str(tmp_path) not in sys.path
+
+def test_error_rate(tmp_path, monkeypatch):
+    """Test if the reader finds an error in every line the generator made invalid"""
+    generator = PokemonDataGenerator(moves=200, abilities=50, cards=100, error_rate=0.3, custom_share=0, effect_share=0.3, seed=2)
+    generator.write(tmp_path)
+    reader = read_directory(tmp_path, monkeypatch)
+
+    for kind, records in (("moves", reader.moves), ("abilities", reader.abilities), ("cards", reader.cards)):
+        valid = {name for name, is_valid in generator.valid[kind].items() if is_valid}
+
+        assert set(records) == valid
+        assert reader.error_reports[kind].total == len(generator.valid[kind]) - len(valid)
+        assert 0 < reader.error_reports[kind].total < len(generator.valid[kind])
+
+def test_effect_modules_define_functions(tmp_path):
+    """Test if the effect list modules define every function the lines name"""
+    generator = PokemonDataGenerator(moves=50, abilities=20, cards=0, effect_share=0.5, seed=3)
+    generator.write(tmp_path)
+
+    for module, names in generator.functions.items():
+        namespace = dict()
+        exec((tmp_path / f"{module}.py").read_text(), namespace)
+
+        assert all(callable(namespace[name]) for name in names)
+
+    moves = (tmp_path / "pokemon_standard_moves.txt").read_text()
+
+    assert len(generator.functions["pokemon_standard_move_effect_list"]) > 0
+    assert all(f"Effect Function: {name}" in moves for name in generator.functions["pokemon_standard_move_effect_list"])
+
+def test_decks_are_legal_and_playable(tmp_path, monkeypatch):
+    """Test if generated decks follow the deck rules and can be played"""
+    generator = PokemonDataGenerator(moves=60, abilities=10, cards=60, error_rate=0.1, seed=4)
+    generator.write(tmp_path, decks=4)
+    reader = read_directory(tmp_path, monkeypatch)
+    registry = PokemonCardRegistry.from_reader(reader)
+    decks = read_decks(tmp_path / "pokemon_decks.txt")
+
+    assert len(decks) == 4
+
+    for cards in decks.values():
+        assert len(cards) == DECK_SIZE
+        assert all(cards.count(name) <= MAX_COPIES for name in cards)
+        assert all(reader.cards[name].pre_evo is None or reader.cards[name].pre_evo in cards for name in cards)
+
+    first, second = ([registry.id_of(name) for name in cards] for cards in list(decks.values())[:2])
+
+    assert PokemonTCGPocketEmulator(registry, 0).play_game(first, second) in (-1, 0, 1)
+
+def test_deck_needs_enough_cards():
+    """Test if a pool too small for a deck raises"""
+    generator = PokemonDataGenerator(moves=5, abilities=0, cards=2, seed=5)
+    generator.move_lines()
+    generator.ability_lines()
+    generator.card_lines()
+
+    with pytest.raises(ValueError):
+        generator.deck()
+
+def test_same_seed_same_files(tmp_path):
+    """Test if the same seed writes the same files and a scaled pool has the scaled size"""
+    PokemonDataGenerator.scaled(0.1, error_rate=0.2, seed=6).write(tmp_path / "one", decks=2)
+    PokemonDataGenerator.scaled(0.1, error_rate=0.2, seed=6).write(tmp_path / "two", decks=2)
+
+    for path in (tmp_path / "one").iterdir():
+        assert path.read_text() == (tmp_path / "two" / path.name).read_text()
+
+    assert len((tmp_path / "one" / "pokemon_standard_moves.txt").read_text().splitlines()) == 45
@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import MagicMock
+from pokemon_effect_resolver import PokemonEffectResolver, MOVE_EFFECT_MODULES
+
+@pytest.fixture
+def resolver():
+    """Creates an instance of PokemonEffectResolver."""
+
+    return PokemonEffectResolver()
+
+@pytest.fixture
+def import_calls(monkeypatch):
+    """Attaches a mock function for importlib.import_module and returns the list of imported module names."""
+
+    calls = []
+
+    def _mock_import(input_file):
+        """Creates a mock function for importlib.import_module with example module functions."""
+
+        calls.append(input_file)
+
+        mock_standard = MagicMock()
+        mock_custom = MagicMock()
+
+        def mock_effect_function_one():
+            return "Standard Thunderbolt Attack"
+
+        def mock_effect_function_two():
+            return "Custom Thunderbolt Attack"
+
+        def mock_effect_function_three():
+            return "Crystal Rush Attack"
+
+        mock_standard.thunderbolt_effect = mock_effect_function_one
+        mock_custom.thunderbolt_effect = mock_effect_function_two
+        mock_custom.crystal_rush_effect = mock_effect_function_three
+
+        if input_file == "pokemon_standard_move_effect_list":
+            return mock_standard
+        elif input_file == "pokemon_custom_move_effect_list":
+            return mock_custom
+        else:
+            raise Exception("Invalid input file")
+
+    monkeypatch.setattr("importlib.import_module", _mock_import)
+
+    return calls
+
+@pytest.fixture
+def mock_files(monkeypatch):
+    """Returns a dynamic version of a mock for if each file exists."""
+
+    def _mock_files(file_exists_map):
+        """Creates a mock function for pathlib.Path.exists."""
+
+        def mock_exists(path):
+            """Mimics pathlib.Path.exists using file_exists_map."""
+
+            return file_exists_map.get(str(path), False)
+
+        monkeypatch.setattr("pathlib.Path.exists", mock_exists)
+
+    return _mock_files
+
+def test_standard_has_precedence_over_custom(resolver, import_calls, mock_files):
+    """Test if a function in both modules resolves to the standard function"""
+    mock_files({
+        "pokemon_standard_move_effect_list.py": True,
+        "pokemon_custom_move_effect_list.py": True,
+    })
+
+    assert resolver.resolve(MOVE_EFFECT_MODULES, "thunderbolt_effect")() == "Standard Thunderbolt Attack"
+    assert resolver.resolve(MOVE_EFFECT_MODULES, "crystal_rush_effect")() == "Crystal Rush Attack"
+
+def test_modules_are_imported_once(resolver, import_calls, mock_files):
+    """Test if repeated lookups do not import the modules again"""
+    mock_files({
+        "pokemon_standard_move_effect_list.py": True,
+        "pokemon_custom_move_effect_list.py": True,
+    })
+
+    for _ in range(10):
+        resolver.resolve(MOVE_EFFECT_MODULES, "thunderbolt_effect")
+        resolver.resolve(MOVE_EFFECT_MODULES, "zap_cannon_effect")
+
+    assert sorted(import_calls) == ["pokemon_custom_move_effect_list", "pokemon_standard_move_effect_list"]
+
+def test_missing_function_is_none(resolver, import_calls, mock_files):
+    """Test if a function in neither module resolves to None"""
+    mock_files({
+        "pokemon_standard_move_effect_list.py": True,
+        "pokemon_custom_move_effect_list.py": False,
+    })
+
+    assert resolver.modules_exist(MOVE_EFFECT_MODULES)
+    assert resolver.resolve(MOVE_EFFECT_MODULES, "crystal_rush_effect") is None
+
+def test_no_modules_exist(resolver, import_calls, mock_files):
+    """Test if no modules are imported when none of the files exist"""
+    mock_files({})
+
+    assert not resolver.modules_exist(MOVE_EFFECT_MODULES)
+    assert resolver.resolve(MOVE_EFFECT_MODULES, "thunderbolt_effect") is None
+    assert import_calls == []
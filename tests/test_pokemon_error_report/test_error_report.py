@@ -0,0 +1,55 @@
+import pytest
+from pokemon_error_report import PokemonErrorReport, PokemonImportError, error_code
+
+def test_errors_are_grouped_by_code():
+    """Test if errors are counted per code and located by file, line and field"""
+    report = PokemonErrorReport(sample_size=2)
+
+    for line in range(1, 5):
+        report.at("moves.txt", line)
+        report.add("No name is given for move", "Move Name: , Energies: Fire, Damage: 10, Effect Function: None\n", 11)
+
+    report.add("Move damage value is not digit for move", "Move Name: Tackle, Energies: Fire, Damage: ten, Effect Function: None", 43)
+
+    assert len(report) == 5
+    assert report.counts == {"no_name_is_given_for_move": 4, "move_damage_value_is_not_digit_for_move": 1}
+
+    count, samples = report.summary()["no_name_is_given_for_move"]
+
+    assert count == 4
+    assert [sample.line for sample in samples] == [1, 2]
+    assert samples[0].file == "moves.txt"
+    assert samples[0].field == ""
+    assert samples[0].text.endswith("None")
+    assert report.samples["move_damage_value_is_not_digit_for_move"][0].field == "ten"
+
+def test_fail_fast_threshold():
+    """Test if adding more than max_errors errors raises with the report"""
+    report = PokemonErrorReport(max_errors=2)
+    report.add("No name is given for move", "text")
+    report.add("No name is given for move", "text")
+
+    with pytest.raises(PokemonImportError) as error:
+        report.add("No name is given for move", "text")
+
+    assert error.value.report is report
+    assert report.total == 3
+
+def test_log_writes_one_line_per_code(caplog):
+    """Test if a report logs once per error code"""
+    import logging
+    report = PokemonErrorReport()
+    report.at("moves.txt", 7)
+
+    for _ in range(100):
+        report.add("Error in formatting of move", "bad line")
+
+    with caplog.at_level("DEBUG"):
+        report.log(logging.getLogger("test_error_report"))
+
+    assert len(caplog.records) == 1
+    assert "Error in formatting of move: bad line (100 lines with error_in_formatting_of_move, first at moves.txt:7" in caplog.text
+
+def test_error_code():
+    """Test if error codes are lowercase words joined by underscores"""
+    assert error_code("Illegal energy type used in move") == "illegal_energy_type_used_in_move"
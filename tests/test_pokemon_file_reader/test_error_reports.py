@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import MagicMock
+from pokemon_error_report import PokemonImportError
+from pokemon_file_reader import PokemonFileReader
+
+@pytest.fixture
+def reader():
+    """Creates an instance of PokemonFileReader"""
+
+    reader = PokemonFileReader()
+    reader.types = {"Fire", "Colorless"}
+
+    return reader
+
+@pytest.fixture
+def mock_files(monkeypatch):
+    """Returns a dynamic version of a mock for if each file exists and the contents of each file."""
+
+    def _mock_files(file_content_map):
+        """Creates a mock function for pathlib.Path.exists and builtins.open."""
+
+        def mock_exists(path):
+            """Mimics pathlib.Path.exists using file_content_map."""
+            return str(path) in file_content_map
+
+        monkeypatch.setattr("pathlib.Path.exists", mock_exists)
+
+        def mock_open(path, mode="r"):
+            """Mimics builtins.open by using file_content_map."""
+            mock_file = MagicMock()
+            mock_file.__enter__.return_value = iter(file_content_map[str(path)].splitlines(keepends=True))
+            mock_file.__exit__.return_value = False
+
+            return mock_file
+
+        monkeypatch.setattr("builtins.open", mock_open)
+
+    return _mock_files
+
+BAD_MOVES = """Move Name: Ember, Energies: Fire, Damage: 30, Effect Function: None
+Move Name: , Energies: Fire, Damage: 30, Effect Function: None
+Move Name: Splash, Energies: Water, Damage: 10, Effect Function: None
+Move Name: Tackle, Energies: Colorless, Damage: ten, Effect Function: None
+Move Name: , Energies: Fire, Damage: 30, Effect Function: None
+"""
+
+def test_read_all_moves_collects_errors(reader, mock_files, caplog):
+    """Test if invalid lines are collected in a report with their location and logged once per error"""
+    mock_files({"pokemon_standard_moves.txt": BAD_MOVES, "pokemon_custom_moves.txt": BAD_MOVES})
+
+    with caplog.at_level("DEBUG"):
+        moves = reader.read_all_moves()
+
+    report = reader.error_reports["moves"]
+
+    assert list(moves) == ["Ember"]
+    assert report.total == 8
+    assert report.counts == {"no_name_is_given_for_move": 4, "illegal_energy_type_used_in_move": 2, "move_damage_value_is_not_digit_for_move": 2}
+
+    samples = report.samples["illegal_energy_type_used_in_move"]
+
+    assert [(sample.file, sample.line, sample.field) for sample in samples] == [("pokemon_standard_moves.txt", 3, "Water"), ("pokemon_custom_moves.txt", 3, "Water")]
+    assert report.samples["move_damage_value_is_not_digit_for_move"][0].field == "ten"
+    assert caplog.text.count("No name is given for move") == 1
+    assert reader.error_report is None
+
+def test_read_all_moves_fail_fast(reader, mock_files):
+    """Test if the import stops after max_errors invalid lines"""
+    mock_files({"pokemon_standard_moves.txt": BAD_MOVES})
+
+    with pytest.raises(PokemonImportError) as error:
+        reader.read_all_moves(max_errors=2)
+
+    assert error.value.report.total == 3
+    assert error.value.report.samples["move_damage_value_is_not_digit_for_move"][0].line == 4
+    assert reader.error_report is None
+
+def test_read_move_outside_import_logs(reader, caplog):
+    """Test if a single read_move still logs its error directly"""
+    move_text = "Move Name: , Energies: Fire, Damage: 30, Effect Function: None"
+
+    reader.read_move(move_text)
+
+    assert f"No name is given for move: {move_text}" in caplog.text
@@ -0,0 +1,74 @@
+import gzip
+import io
+import pytest
+from pokemon_error_report import PokemonErrorReport, PokemonImportError, PokemonLineError
+from pokemon_file_reader import PokemonFileReader
+from pokemon_move import PokemonMove
+
+@pytest.fixture
+def reader():
+    """Creates an instance of PokemonFileReader with example types."""
+
+    reader = PokemonFileReader()
+    reader.types = {"Fire", "Colorless"}
+
+    return reader
+
+MOVES = [
+    "Move Name: Ember, Energies: Fire, Damage: 30, Effect Function: None\n",
+    "Move Name: , Energies: Fire, Damage: 30, Effect Function: None\n",
+    "Move Name: Tackle, Energies: Colorless, Damage: 10, Effect Function: None\n",
+]
+
+def test_iter_moves_yields_records_and_errors(reader):
+    """Test if moves and errors are yielded in line order from a list of lines"""
+    records = list(reader.iter_moves(MOVES))
+
+    assert isinstance(records[0], PokemonMove) and records[0].name == "Ember"
+    assert isinstance(records[1], PokemonLineError)
+    assert records[1].code == "no_name_is_given_for_move"
+    assert records[1].line == 2
+    assert records[2].name == "Tackle"
+    assert reader.moves == dict()
+
+def test_iter_moves_is_lazy(reader):
+    """Test if the first record is yielded before later lines are read"""
+    lines_read = []
+
+    def lines():
+        for line in MOVES:
+            lines_read.append(line)
+            yield line
+
+    records = reader.iter_moves(lines())
+
+    assert next(records).name == "Ember"
+    assert len(lines_read) == 1
+
+def test_iter_moves_from_path_and_stream(reader, tmp_path):
+    """Test if moves are read from a path and from a decompressing byte stream"""
+    path = tmp_path / "moves.txt"
+    path.write_text("".join(MOVES))
+
+    from_path = list(reader.iter_moves(path))
+
+    assert from_path[1].file == str(path)
+
+    data = gzip.compress("".join(MOVES).encode())
+    from_stream = list(reader.iter_moves(gzip.GzipFile(fileobj=io.BytesIO(data))))
+
+    assert [record.name for record in from_stream if isinstance(record, PokemonMove)] == ["Ember", "Tackle"]
+
+def test_iter_abilities_with_report(reader):
+    """Test if errors are added to a given report and the import stops at its limit"""
+    report = PokemonErrorReport(max_errors=1)
+    lines = ["Ability Name: , Type: Active, Activation Function: None, Effect Function: None\n"] * 3
+
+    records = reader.iter_abilities(lines, report)
+
+    assert isinstance(next(records), PokemonLineError)
+
+    with pytest.raises(PokemonImportError):
+        next(records)
+
+    assert report.total == 2
@@ -0,0 +1,87 @@
+import pytest
+from pokemon_file_reader import PokemonFileReader
+from pokemon_move import PokemonMove
+from pokemon_ability import PokemonAbility
+
+@pytest.fixture
+def reader():
+    """Creates an instance of PokemonFileReader with example types, moves and abilities."""
+
+    reader = PokemonFileReader()
+    reader.types = {"Lightning", "Fighting", "Colorless"}
+
+    thunderbolt = PokemonMove("Thunderbolt")
+    quick_attack = PokemonMove("Quick Attack")
+    static = PokemonAbility("Static")
+
+    reader.moves = {"Thunderbolt": thunderbolt, "Quick Attack": quick_attack}
+    reader.abilities = {"Static": static}
+
+    return reader
+
+def test_perfect_format_card(reader):
+    """Test if format string is perfect"""
+    card_text = "Card Name: Raichu, Card Type: Pokemon, Pre Evolution: Pikachu, Health: 120, Type: Lightning, Weakness: Fighting, Abilities: Static, Moves: Quick Attack; Thunderbolt\n"
+
+    card = reader.read_card(card_text)
+
+    assert card is not None
+    assert card.name == "Raichu"
+    assert card.card_type == "Pokemon"
+    assert card.pre_evo == "Pikachu"
+    assert card.health == 120
+    assert card.type == "Lightning"
+    assert card.weaknesses == "Fighting"
+    assert card.abilties == (reader.abilities["Static"],)
+    assert card.moves == (reader.moves["Quick Attack"], reader.moves["Thunderbolt"])
+    assert card.moves[1] is reader.moves["Thunderbolt"]
+
+def test_perfect_format_basic_card_without_abilities(reader):
+    """Test if None pre evolution, weakness and abilities are read"""
+    card_text = "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Lightning, Weakness: None, Abilities: None, Moves: Quick Attack"
+
+    card = reader.read_card(card_text)
+
+    assert card.pre_evo is None
+    assert card.weaknesses is None
+    assert card.abilties == ()
+
+def test_illegal_type(reader, caplog):
+    """Test if a type that was not read is rejected"""
+    card_text = "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Nuclear, Weakness: None, Abilities: None, Moves: Quick Attack"
+
+    with caplog.at_level("DEBUG"):
+        card = reader.read_card(card_text)
+
+    assert card is None
+    assert f"Illegal type used in card: {card_text}" in caplog.text
+
+def test_move_does_not_exist(reader, caplog):
+    """Test if a move that was not read is rejected"""
+    card_text = "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Lightning, Weakness: None, Abilities: None, Moves: Volt Tackle"
+
+    with caplog.at_level("DEBUG"):
+        card = reader.read_card(card_text)
+
+    assert card is None
+    assert f"Card move does not exist for card: {card_text}" in caplog.text
+
+def test_health_is_not_digit(reader, caplog):
+    """Test if a non numerical health is rejected"""
+    card_text = "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: sixty, Type: Lightning, Weakness: None, Abilities: None, Moves: Quick Attack"
+
+    with caplog.at_level("DEBUG"):
+        card = reader.read_card(card_text)
+
+    assert card is None
+    assert f"Card health value is not digit for card: {card_text}" in caplog.text
+
+def test_input_string_is_invalid(reader, caplog):
+    """Test if input_string doesn't have eight fields"""
+    card_text = "Card Name: Pikachu, Card Type: Pokemon, Health: 60"
+
+    with caplog.at_level("DEBUG"):
+        card = reader.read_card(card_text)
+
+    assert card is None
+    assert f"Error in formatting of card: {card_text}" in caplog.text
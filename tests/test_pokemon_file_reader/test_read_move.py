@@ -78,7 +78,7 @@ def test_perfect_format_standard_move_effect(reader, mock_import, mock_files):
 
     assert move is not None
     assert move.name == "Thunderbolt"
-    assert move.energy == ["Electric", "Electric"]
+    assert move.energy == ("Electric", "Electric")
     assert move.damage == 50
     assert move.effect() == "Thunderbolt Attack"
 
@@ -96,7 +96,7 @@ def test_perfect_format_custom_move_effect(reader, mock_import, mock_files):
 
     assert move is not None
     assert move.name == "Crystal Rush"
-    assert move.energy == ["Crystal", "Crystal", "Colorless"]
+    assert move.energy == ("Crystal", "Crystal", "Colorless")
     assert move.damage == 70
     assert move.effect() == "Crystal Rush Attack"
 
@@ -182,7 +182,7 @@ def test_perfect_format_move_effect_is_none(reader, mock_import, mock_files):
 
     assert move is not None
     assert move.name == "Thunderbolt"
-    assert move.energy == ["Electric", "Electric"]
+    assert move.energy == ("Electric", "Electric")
     assert move.damage == 50
     assert move.effect == None
 
@@ -217,7 +217,7 @@ def test_perfect_format_energy_is_none(reader, mock_import, mock_files):
 
     assert move is not None
     assert move.name == "Thunderbolt"
-    assert move.energy == []
+    assert move.energy == ()
     assert move.damage == 50
     assert move.effect() == "Thunderbolt Attack"
 
@@ -0,0 +1,29 @@
+from pokemon_line_parser import parse_ability_line, PokemonParseError
+
+def test_perfect_format():
+    """Test if a perfectly formatted ability is parsed into its values"""
+    values, error = parse_ability_line("Ability Name: Wash Out, Type: Active, Activation Function: wash_out_activation, Effect Function: wash_out_effect\n")
+
+    assert error is None
+    assert values == ["Wash Out", False, "wash_out_activation", "wash_out_effect"]
+
+def test_functions_are_none():
+    """Test if None activation and effect functions are parsed"""
+    values, error = parse_ability_line("Ability Name: Pixilate, Type: passive, Activation Function: None, Effect Function: None")
+
+    assert error is None
+    assert values == ["Pixilate", True, None, None]
+
+def test_type_invalid_column():
+    """Test if a type that is not passive or active reports the column of the type value"""
+    values, error = parse_ability_line("Ability Name: Wash Out, Type: Hybrid, Activation Function: None, Effect Function: None")
+
+    assert values == ["Wash Out"]
+    assert error == PokemonParseError("Type value for ability is not passive or active in ability", 29)
+
+def test_effect_key_invalid_keeps_earlier_values():
+    """Test if a malformed effect field keeps the values of the fields before it"""
+    values, error = parse_ability_line("Ability Name: Wash Out, Type: Active, Activation Function: wash_out_activation, Effect Ffdasfeffect")
+
+    assert values == ["Wash Out", False, "wash_out_activation"]
+    assert error == PokemonParseError("Error in formatting of ability effect function for ability", 80)
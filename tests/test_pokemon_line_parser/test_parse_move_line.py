@@ -0,0 +1,66 @@
+from pokemon_line_parser import parse_move_line, PokemonParseError
+
+def test_perfect_format():
+    """Test if a perfectly formatted move is parsed into its values"""
+    values, error = parse_move_line("Move Name: Thunderbolt, Energies: Electric; Electric, Damage: 50, Effect Function: thunderbolt_effect\n")
+
+    assert error is None
+    assert values == ["Thunderbolt", ["Electric", "Electric"], 50, "thunderbolt_effect"]
+
+def test_energy_and_effect_are_none():
+    """Test if None energies and effect function are parsed"""
+    values, error = parse_move_line("Move Name: Tackle, Energies: None, Damage: 10, Effect Function: None")
+
+    assert error is None
+    assert values == ["Tackle", [], 10, None]
+
+def test_no_name_column():
+    """Test if an empty name reports the column of the name value"""
+    values, error = parse_move_line("Move Name: , Energies: Electric, Damage: 50, Effect Function: None")
+
+    assert values == []
+    assert error == PokemonParseError("No name is given for move", 10)
+
+def test_damage_not_digit_column():
+    """Test if a non numerical damage reports the column of the damage value and keeps earlier values"""
+    values, error = parse_move_line("Move Name: Zap, Energies: Electric, Damage: 5o, Effect Function: None")
+
+    assert values == ["Zap", ["Electric"]]
+    assert error == PokemonParseError("Move damage value is not digit for move", 43)
+
+def test_field_key_invalid_column():
+    """Test if a malformed field reports the column the field starts at"""
+    values, error = parse_move_line("Move Name: Zap, Energies: Electric, Dadafdsa, Effect Function: None")
+
+    assert values == ["Zap", ["Electric"]]
+    assert error == PokemonParseError("Error in formatting of move damage for move", 36)
+
+def test_too_many_fields_column():
+    """Test if an extra field reports the column of the extra delimiter"""
+    values, error = parse_move_line("Move Name: Zap, Energies: Electric, Damage: 5, Effect Function: None, Extra")
+
+    assert values == []
+    assert error == PokemonParseError("Error in formatting of move", 68)
+
+def test_too_few_fields_column():
+    """Test if a missing field reports the end of the line"""
+    text = "Move Name: Zap, Energies: Electric"
+    values, error = parse_move_line(text)
+
+    assert values == []
+    assert error == PokemonParseError("Error in formatting of move", len(text))
+
+def test_comma_in_field_matches_split():
+    """Test if a field with a comma that is not a delimiter, which the fast path does not match, is parsed the same as before"""
+    values, error = parse_move_line("Move Name: Zap,Zap , Energies:  Electric ;Electric, Damage: 50 , Effect Function: None\n")
+
+    assert error is None
+    assert values == ["Zap,Zap", ["Electric", "Electric"], 50, None]
+
+def test_energy_lists_are_not_shared():
+    """Test if lines with the same energies get their own energy list"""
+    first, _ = parse_move_line("Move Name: Zap, Energies: Electric, Damage: 10, Effect Function: None")
+    second, _ = parse_move_line("Move Name: Jolt, Energies: Electric, Damage: 20, Effect Function: None")
+
+    assert first[1] == second[1]
+    assert first[1] is not second[1]
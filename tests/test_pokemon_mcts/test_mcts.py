@@ -0,0 +1,76 @@
+import pytest
+from pokemon_action_index import ATTACK, END_TURN, decode_action, encode_action
+from pokemon_mcts import PokemonMCTSAgent, PokemonSearchNode, PokemonTranspositionTable, score
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+def test_transposition_table_drops_least_recently_used():
+    """Test if a full table drops the node that was used least recently"""
+    table = PokemonTranspositionTable(2)
+    table.put(1, PokemonSearchNode(0, [0]))
+    table.put(2, PokemonSearchNode(0, [0]))
+    table.get(1)
+    table.put(3, PokemonSearchNode(0, [0]))
+
+    assert table.get(2) is None
+    assert table.get(1) is not None
+    assert len(table) == 2
+    assert table.hits == 2 and table.misses == 1
+
+def test_clone_is_independent(registry):
+    """Test if actions on a clone leave the original unchanged"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.start_game([0] * 15, [1] * 15)
+    before = emulator.state_hash()
+
+    clone = emulator.clone()
+
+    assert clone.state_hash() == before
+
+    clone.apply_action(clone.legal_actions()[0])
+    clone.apply_action(encode_action(END_TURN))
+
+    assert emulator.state_hash() == before
+    assert clone.state_hash() != before
+    assert emulator.board_one_active.energy == registry.no_energy
+
+def test_agent_takes_winning_attack(registry):
+    """Test if the agent attacks when the attack knocks out the last opposing pokemon"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_one_active.energy = (1, 0, 0)
+    emulator.board_two_active = registry.new_instance(1)
+    emulator.board_two_active.health = 20
+    emulator.deck_one = [registry.new_instance(0) for _ in range(5)]
+    emulator.deck_two = [registry.new_instance(1) for _ in range(5)]
+
+    agent = PokemonMCTSAgent(playouts=50, seed=1)
+
+    assert decode_action(agent.choose_action(emulator))[0] == ATTACK
+    assert len(agent.table) > 1
+
+def test_search_is_reproducible(registry):
+    """Test if agents with the same seed pick the same actions"""
+    actions = []
+
+    for _ in range(2):
+        emulator = PokemonTCGPocketEmulator(registry, 2)
+        emulator.start_game([0] * 10 + [2] * 5, [1] * 15)
+        agent = PokemonMCTSAgent(playouts=30, rollout_turns=4, seed=7)
+        actions.append((agent.choose_action(emulator), agent.search(emulator).visits))
+
+    assert actions[0] == actions[1]
+
+def test_agent_plays_a_whole_game(registry):
+    """Test if the agent can play a full game against play_turn"""
+    emulator = PokemonTCGPocketEmulator(registry, 4)
+    emulator.start_game([0] * 10 + [2] * 5, [1] * 15)
+    agent = PokemonMCTSAgent(playouts=10, rollout_turns=2, seed=3)
+
+    while not emulator.finished:
+        if emulator.current_player == 0:
+            agent.play_turn(emulator)
+        else:
+            emulator.play_turn()
+
+    assert emulator.winner in (-1, 0, 1)
+    assert score(emulator) in (0.0, 0.5, 1.0)
@@ -0,0 +1,100 @@
+import pytest
+from pokemon_card import PokemonCardDefinition, PokemonCardInstance
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_packed_state import PokemonPackedState, PokemonStateLayout
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@pytest.fixture
+def registry():
+    """Creates a registry with two example cards and three types."""
+
+    registry = PokemonCardRegistry(3)
+
+    for name, health in (("Pikachu", 60), ("Raichu", 120)):
+        definition = PokemonCardDefinition()
+        definition.name = name
+        definition.health = health
+        registry.add(definition)
+
+    return registry
+
+@pytest.fixture
+def emulator(registry):
+    """Creates an emulator in the middle of a game."""
+
+    emulator = PokemonTCGPocketEmulator()
+    emulator.deck_one = [registry.new_instance(0), registry.new_instance(1)]
+    emulator.deck_two = [registry.new_instance(1)]
+    emulator.hand_one = [registry.new_instance(1)]
+    emulator.board_one_active = PokemonCardInstance(0, 40, "Poisoned", True, (2, 0, 1))
+    emulator.board_one_passive = [None, registry.new_instance(0), None]
+    emulator.board_two_active = PokemonCardInstance(1, 120, None, False, (0, 0, 0))
+    emulator.points_one = 1
+    emulator.turn = 5
+    emulator.current_player = 1
+    emulator.energy_attached = True
+    emulator.abilities_used = {0, 2}
+
+    return emulator
+
+def test_round_trip(registry, emulator):
+    """Test if packing and unpacking an emulator keeps its state"""
+    state = PokemonPackedState.from_emulator(emulator, PokemonStateLayout(3))
+
+    restored = PokemonTCGPocketEmulator()
+    state.to_emulator(restored, registry)
+
+    assert restored.deck_one == emulator.deck_one
+    assert restored.deck_two == emulator.deck_two
+    assert restored.hand_one == emulator.hand_one
+    assert restored.hand_two == []
+    assert restored.board_one_active == emulator.board_one_active
+    assert restored.board_one_passive == emulator.board_one_passive
+    assert restored.board_two_active == emulator.board_two_active
+    assert restored.board_two_passive == [None, None, None]
+    assert (restored.points_one, restored.points_two) == (1, 0)
+    assert (restored.turn, restored.current_player) == (5, 1)
+    assert restored.energy_attached
+    assert restored.abilities_used == {0, 2}
+    assert (restored.finished, restored.winner) == (False, None)
+
+def test_copy_equality_and_hash(emulator):
+    """Test if a copy is equal with the same hash and diverges once changed"""
+    state = PokemonPackedState.from_emulator(emulator, PokemonStateLayout(3))
+    copy = state.copy()
+
+    assert copy == state
+    assert hash(copy) == hash(state)
+
+    copy.set_points(1, 2)
+
+    assert copy != state
+    assert state.points(1) == 0
+
+def test_finished_game_round_trip(registry, emulator):
+    """Test if a finished game and its winner are kept, a draw included"""
+    for winner in (1, -1):
+        emulator.end_game(winner)
+        restored = PokemonTCGPocketEmulator()
+        PokemonPackedState.from_emulator(emulator, PokemonStateLayout(3)).to_emulator(restored, registry)
+
+        assert (restored.finished, restored.winner) == (True, winner)
+
+def test_any_number_of_cards(registry, emulator):
+    """Test if decks and hands of any size are packed, and changing one keeps the others"""
+    emulator.deck_one = [registry.new_instance(index % 2) for index in range(45)]
+    emulator.hand_one = [registry.new_instance(1)] * 25
+    state = PokemonPackedState.from_emulator(emulator, PokemonStateLayout(3))
+
+    assert state.deck(0) == [index % 2 for index in range(45)]
+    assert state.hand(0) == [1] * 25
+    assert state.deck(1) == [1]
+
+    state.set_hand(0, [0, 0])
+    state.set_deck(1, [])
+
+    assert state.deck(0) == [index % 2 for index in range(45)]
+    assert state.hand(0) == [0, 0]
+    assert state.deck(1) == []
+    assert state.hand(1) == []
+    assert len(state.data) == state.layout.size + 47
@@ -0,0 +1,137 @@
+import pytest
+from pokemon_file_reader import PokemonFileReader
+from pokemon_parse_cache import PokemonParseCache
+
+TACKLE = "Move Name: Tackle, Energies: Colorless, Damage: 10, Effect Function: None"
+
+@pytest.fixture
+def reader():
+    """Creates an instance of PokemonFileReader with example types."""
+
+    reader = PokemonFileReader()
+    reader.types = {"Fire", "Colorless"}
+
+    return reader
+
+def test_eviction_and_hit_rate(reader):
+    """Test if lines not read for two generations are dropped, read ones are kept, and hits are counted"""
+    reader.parse_cache = PokemonParseCache(max_size=2)
+    a, b, c, d = (TACKLE.replace("Tackle", name) for name in "ABCD")
+
+    first_a = reader.read_move(a)
+    first_b = reader.read_move(b)
+
+    assert reader.read_move(a) is first_a
+
+    reader.read_move(c)
+
+    assert reader.read_move(a) is first_a
+
+    reader.read_move(d)
+
+    assert reader.read_move(b) is not first_b
+    assert reader.read_move(a) is first_a
+    assert len(reader.parse_cache) == 3
+    assert reader.parse_cache.hit_rate() == pytest.approx(3 / 8)
+
+def test_disabled_cache_stores_nothing():
+    """Test if a reader with cache_size 0 reads every line again and stores nothing"""
+    reader = PokemonFileReader(cache_size=0)
+    reader.types = {"Colorless"}
+
+    assert reader.read_move(TACKLE) is not reader.read_move(TACKLE)
+    assert len(reader.parse_cache) == 0
+    assert reader.parse_cache.hit_rate() == 0.0
+
+def test_shared_records_are_read_only(reader):
+    """Test if a cached move and ability cannot be changed by whoever it is returned to"""
+    move = reader.read_move(TACKLE)
+    ability = reader.read_ability("Ability Name: Blaze, Type: Active, Activation Function: None, Effect Function: None")
+
+    assert move.energy == ("Colorless",)
+
+    with pytest.raises(AttributeError):
+        move.damage = 50
+
+    with pytest.raises(AttributeError):
+        ability.usable = True
+
+    assert reader.read_move(TACKLE).damage == 10
+
+def test_identical_lines_share_one_record(reader):
+    """Test if identical move lines, with or without a line ending, return the same record"""
+    first = reader.read_move(TACKLE + "\n")
+    second = reader.read_move(TACKLE)
+
+    assert first is second
+    assert reader.parse_cache.hits == 1
+    assert reader.parse_cache.misses == 1
+
+def test_type_change_misses(reader):
+    """Test if the same line is read again when the allowed types change"""
+    line = "Move Name: Shine, Energies: Crystal, Damage: 40, Effect Function: None"
+
+    assert reader.read_move(line) is None
+
+    reader.types.add("Crystal")
+
+    assert reader.read_move(line).name == "Shine"
+    assert reader.parse_cache.hits == 0
+
+def test_cached_error_is_logged_again(reader, caplog):
+    """Test if an invalid line that hits the cache logs its error every time"""
+    line = "Move Name: , Energies: Fire, Damage: 10, Effect Function: None"
+
+    reader.read_move(line)
+    reader.read_move(line)
+
+    assert reader.parse_cache.hits == 1
+    assert caplog.text.count(f"No name is given for move: {line}") == 2
+
+def test_cached_error_is_reported_with_location(reader):
+    """Test if an invalid line that hits the cache is added to the error report at its own line"""
+    line = "Ability Name: Blaze, Type: Sometimes, Activation Function: None, Effect Function: None\n"
+
+    records = list(reader.iter_abilities([line, line]))
+
+    assert [record.line for record in records] == [1, 2]
+    assert records[1].code == "type_value_for_ability_is_not_passive_or_active_in_ability"
+    assert reader.parse_cache.hits == 1
+
+def test_assigned_types_clear_cache(reader):
+    """Test if replacing the allowed types drops lines read with the old types"""
+    reader.read_move(TACKLE)
+    reader.types = {"Fire"}
+
+    assert reader.read_move(TACKLE) is None
+    assert reader.parse_cache.hits == 0
+    assert len(reader.parse_cache) == 1
+
+def test_cold_cache_is_bypassed_until_next_file(reader):
+    """Test if a cache that only misses stops looking lines up, and looks them up again when a file is read"""
+    reader.parse_cache = PokemonParseCache(max_size=4)
+    lines = [TACKLE.replace("Tackle", f"Tackle {index}") for index in range(10)]
+
+    for line in lines:
+        reader.read_move(line)
+
+    assert reader.parse_cache.misses == 5
+    assert reader.parse_cache.cold
+    assert len(reader.parse_cache) == 4
+
+    moves = list(reader.iter_moves([lines[9], lines[9]]))
+
+    assert moves[0] is moves[1]
+    assert reader.parse_cache.hits == 1
+    assert not reader.parse_cache.cold
+
+def test_type_change_drops_costs(reader):
+    """Test if cost vectors kept with the types are dropped when the types change"""
+    reader.read_move(TACKLE)
+
+    assert reader.types.costs == {("Colorless",): reader.type_table.cost_vector(["Colorless"])}
+
+    reader.types.discard("Colorless")
+
+    assert reader.types.costs == {}
+    assert reader.parse_move(TACKLE) is None
@@ -0,0 +1,145 @@
+import pstats
+import pytest
+from pokemon_ability import PokemonAbility
+from pokemon_action_index import USE_ABILITY, encode_action
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_file_reader import PokemonFileReader
+from pokemon_profiler import ABILITY_CHECK, ATTACK, DRAW, EFFECT, EFFECT_RESOLUTION, ENERGY_ATTACH, KNOCKOUT, PARSE, PokemonProfiler
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+def extra_damage(emulator):
+    """Example move effect, 10 more damage to the defending pokemon."""
+    emulator.active(1 - emulator.current_player).health -= 10
+
+def always(emulator, player, slot):
+    """Example activation condition that is always true."""
+    return True
+
+def heal(emulator, player, slot):
+    """Example ability effect, heals the pokemon by 10."""
+    emulator.slot(player, slot).health += 10
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with a pikachu whose move has an effect and whose ability heals, and a machop."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    ability = PokemonAbility("Heal", False, always, False, heal)
+
+    add_card(registry, "Pikachu", "Lightning", 70, 20, ["Lightning"], effect=extra_damage, abilities=(ability,))
+    add_card(registry, "Machop", "Fighting", 70, 20, ["Fighting"])
+
+    return registry
+
+def test_timed_and_call_count_calls():
+    """Test if timed wrappers and call add to their phase, and call also to the function's counter"""
+    profiler = PokemonProfiler()
+    timed = profiler.timed(DRAW, lambda value: value + 1)
+
+    assert timed(1) == 2
+    assert profiler.call(EFFECT, always, None, 0, 0) is True
+    assert profiler.phases[DRAW][1] == 1
+    assert profiler.phases[EFFECT][1] == 1
+    assert profiler.functions[(EFFECT, "always")][1] == 1
+    assert profiler.phases[DRAW][0] >= 0
+
+    profiler.reset()
+
+    assert profiler.report() == []
+
+def test_merge_and_report():
+    """Test if merged counters are added and the report lists phases before functions, by time"""
+    first = PokemonProfiler()
+    second = PokemonProfiler()
+    first.phases[ATTACK] = [300, 3]
+    first.phases[DRAW] = [100, 1]
+    second.phases[DRAW] = [500, 4]
+    second.functions[(EFFECT, "heal")] = [50, 2]
+
+    first.merge(second)
+    report = first.report()
+
+    assert [(row["phase"], row["function"], row["calls"]) for row in report] == [(DRAW, None, 5), (ATTACK, None, 3), (EFFECT, "heal", 2)]
+    assert report[0]["mean_ns"] == 120
+    assert "heal" in first.format_report()
+
+def test_dump_stats_reads_with_pstats(tmp_path):
+    """Test if the counters written by dump_stats are read by pstats"""
+    profiler = PokemonProfiler()
+    profiler.call(EFFECT, always, None, 0, 0)
+    profiler.dump_stats(tmp_path / "one.prof")
+    profiler.dump_stats(tmp_path / "two.prof")
+
+    stats = pstats.Stats(str(tmp_path / "one.prof"))
+    stats.add(str(tmp_path / "two.prof"))
+
+    assert stats.stats[("<phase>", 0, EFFECT)][1] == 2
+    assert stats.stats[(EFFECT, 0, "always")][1] == 2
+
+def test_emulator_phases(registry):
+    """Test if a profiled game counts every phase, per effect function, and clones add to the same profiler"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    profiler = emulator.enable_profiling()
+    winner = emulator.play_game([0] * 20, [1] * 20)
+
+    for phase in (DRAW, ENERGY_ATTACH, ATTACK, EFFECT, KNOCKOUT):
+        assert profiler.phases[phase][1] > 0
+
+    assert profiler.functions[(EFFECT, "extra_damage")][1] == profiler.phases[EFFECT][1]
+
+    unprofiled = PokemonTCGPocketEmulator(registry, 1)
+
+    assert unprofiled.play_game([0] * 20, [1] * 20) == winner
+    assert "draw" not in unprofiled.__dict__
+
+    draws = profiler.phases[DRAW][1]
+    emulator.clone().draw(0)
+
+    assert profiler.phases[DRAW][1] == draws + 1
+
+    emulator.disable_profiling()
+    emulator.draw(0)
+
+    assert profiler.phases[DRAW][1] == draws + 1
+    assert emulator.profiler is None
+
+def test_emulator_ability_checks(registry):
+    """Test if activation conditions count as ability checks and ability effects as effects"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_two_active = registry.new_instance(1)
+    profiler = emulator.enable_profiling()
+
+    assert encode_action(USE_ABILITY, 0) in emulator.legal_actions()
+
+    emulator.apply_action(encode_action(USE_ABILITY, 0))
+
+    assert profiler.functions[(ABILITY_CHECK, "always")][1] == 2
+    assert profiler.functions[(EFFECT, "heal")][1] == 1
+
+def test_reader_phases(tmp_path, monkeypatch):
+    """Test if a profiled reader counts every line read as parsing, and effect lookups as effect resolution"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pokemon_standard_types.txt").write_text("Lightning\n")
+    (tmp_path / "pokemon_standard_moves.txt").write_text(
+        "Move Name: Gnaw, Energies: Lightning, Damage: 20, Effect Function: None\n"
+        "Move Name: Zap, Energies: Lightning, Damage: 20, Effect Function: zap_effect\n"
+    )
+
+    reader = PokemonFileReader()
+    profiler = reader.enable_profiling()
+    reader.read_all_types()
+    reader.read_all_moves()
+
+    assert profiler.phases[PARSE][1] == 2
+    assert profiler.phases[EFFECT_RESOLUTION][1] == 0
+
+    reader.effect_resolver.resolve(("pokemon_standard_move_effect_list",), "zap_effect")
+
+    assert profiler.phases[EFFECT_RESOLUTION][1] == 1
+
+    reader.disable_profiling()
+    reader.read_move("Move Name: Gnaw, Energies: Lightning, Damage: 20, Effect Function: None")
+
+    assert profiler.phases[PARSE][1] == 2
@@ -0,0 +1,110 @@
+import sys
+import pytest
+from pokemon_reloading_reader import PokemonReloadingReader
+
+EFFECT_MODULE = "pokemon_standard_move_effect_list"
+
+@pytest.fixture
+def data_directory(tmp_path, monkeypatch):
+    """Creates example data files in a temporary working directory."""
+
+    (tmp_path / "pokemon_standard_types.txt").write_text("Fire\nColorless\n")
+    (tmp_path / "pokemon_standard_moves.txt").write_text(
+        "Move Name: Ember, Energies: Fire, Damage: 30, Effect Function: None\n"
+        "Move Name: Tackle, Energies: Colorless, Damage: 10, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_custom_moves.txt").write_text("Move Name: Tackle, Energies: Colorless, Damage: 20, Effect Function: None\n")
+    (tmp_path / "pokemon_standard_abilities.txt").write_text("")
+    (tmp_path / "pokemon_standard_cards.txt").write_text(
+        "Card Name: Charmander, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Fire, Weakness: None, Abilities: None, Moves: Ember\n"
+    )
+    monkeypatch.chdir(tmp_path)
+
+    return tmp_path
+
+@pytest.fixture
+def effect_module(data_directory, monkeypatch):
+    """Puts a move effect module in the data directory and removes it from sys.modules afterwards."""
+
+    monkeypatch.syspath_prepend(str(data_directory))
+    original = sys.modules.pop(EFFECT_MODULE, None)
+
+    yield data_directory / f"{EFFECT_MODULE}.py"
+
+    sys.modules.pop(EFFECT_MODULE, None)
+
+    if original is not None:
+        sys.modules[EFFECT_MODULE] = original
+
+def test_first_reload_reads_everything(data_directory):
+    """Test if the first reload reads every file with custom entries overriding standard ones"""
+    reader = PokemonReloadingReader()
+
+    changed = reader.reload()
+
+    assert "pokemon_standard_moves.txt" in changed
+    assert reader.types == {"Fire", "Colorless"}
+    assert reader.moves["Tackle"].damage == 20
+    assert reader.cards["Charmander"].moves[0] is reader.moves["Ember"]
+    assert reader.reload() == []
+
+def test_reload_parses_only_changed_lines(data_directory, monkeypatch):
+    """Test if unchanged lines keep their records and are not parsed again"""
+    reader = PokemonReloadingReader()
+    reader.reload()
+    moves = reader.moves
+    ember = reader.moves["Ember"]
+    parsed = []
+    read_move = reader.read_move
+    monkeypatch.setattr(reader, "read_move", lambda line: parsed.append(line) or read_move(line))
+
+    (data_directory / "pokemon_custom_moves.txt").write_text(
+        "Move Name: Tackle, Energies: Colorless, Damage: 20, Effect Function: None\n"
+        "Move Name: Flare, Energies: Fire; Fire, Damage: 70, Effect Function: None\n"
+    )
+
+    assert reader.reload() == ["pokemon_custom_moves.txt"]
+    assert parsed == ["Move Name: Flare, Energies: Fire; Fire, Damage: 70, Effect Function: None\n"]
+    assert reader.moves is moves
+    assert reader.moves["Ember"] is ember
+    assert reader.moves["Flare"].damage == 70
+    assert reader.cards["Charmander"].moves[0] is ember
+
+def test_removed_line_removes_record(data_directory):
+    """Test if removing a line from the custom file restores the standard entry"""
+    reader = PokemonReloadingReader()
+    reader.reload()
+
+    (data_directory / "pokemon_custom_moves.txt").unlink()
+    reader.reload()
+
+    assert reader.moves["Tackle"].damage == 10
+
+def test_type_change_reparses_moves(data_directory):
+    """Test if adding a type makes moves with that type valid"""
+    (data_directory / "pokemon_custom_moves.txt").write_text("Move Name: Shine, Energies: Crystal, Damage: 40, Effect Function: None\n")
+    reader = PokemonReloadingReader()
+    reader.reload()
+
+    assert "Shine" not in reader.moves
+    assert reader.error_reports["moves"].total == 1
+
+    (data_directory / "pokemon_custom_types.txt").write_text("Crystal\n")
+    reader.reload()
+
+    assert reader.moves["Shine"].energy_cost == (0, 0, 1)
+
+def test_changed_effect_module_is_reloaded(effect_module, data_directory):
+    """Test if a changed effect module is reloaded and its moves use the new function"""
+    effect_module.write_text("def burn(board):\n    return 1\n")
+    (data_directory / "pokemon_custom_moves.txt").write_text("Move Name: Burn, Energies: Fire, Damage: 10, Effect Function: burn\n")
+    reader = PokemonReloadingReader()
+    reader.reload()
+
+    assert reader.moves["Burn"].effect(None) == 1
+
+    effect_module.write_text("def burn(board):\n    return 2 + 0\n")
+    changed = reader.reload()
+
+    assert changed == [f"{EFFECT_MODULE}.py"]
+    assert reader.moves["Burn"].effect(None) == 2
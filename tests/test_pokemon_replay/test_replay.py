@@ -0,0 +1,86 @@
+import pytest
+from pokemon_action_log import PokemonActionLog
+from pokemon_card_registry import PokemonCardRegistry
+from pokemon_replay import PokemonReplay
+from pokemon_state_codec import encode_state
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+def flip_damage(emulator):
+    """Example move effect, 10 more damage per heads of 3 coins."""
+    emulator.active(1 - emulator.current_player).health -= 10 * emulator.coin.count_heads(emulator.coin.flip_many(3))
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with a pikachu line whose move flips coins, and a fighting card."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    add_card(registry, "Pikachu", "Lightning", 60, 10, ["Lightning"], effect=flip_damage)
+    add_card(registry, "Machop", "Fighting", 90, 10, ["Fighting"])
+    add_card(registry, "Raichu", "Lightning", 120, 20, ["Lightning", "Lightning"], pre_evo="Pikachu", effect=flip_damage)
+
+    return registry
+
+def play_logged(registry, seed):
+    """Plays a whole game with play_turn while recording it, and returns the emulator."""
+    emulator = PokemonTCGPocketEmulator(registry, seed)
+    emulator.start_action_log()
+    emulator.play_game([0] * 12 + [2] * 8, [1] * 20)
+
+    return emulator
+
+def test_log_records_actions_and_flips(registry):
+    """Test if a game's log holds its decks, one id per action and one entry per flip, and survives encoding"""
+    emulator = play_logged(registry, 3)
+    log = emulator.action_log
+
+    assert [sorted(deck) for deck in log.decks] == [[0] * 12 + [2] * 8, [1] * 20]
+    assert log.decks[0] != [0] * 12 + [2] * 8
+    assert len(log) > emulator.turn
+    assert len(log.flips) > 0 and set(log.flips) <= {0, 1}
+
+    decoded = PokemonActionLog.from_bytes(log.to_bytes())
+
+    assert (decoded.seed, decoded.decks, decoded.actions, decoded.flips) == (log.seed, log.decks, log.actions, log.flips)
+    assert len(log.to_bytes()) < 1024
+
+def test_replay_reaches_the_same_end(registry):
+    """Test if replaying a log ends in the state the game ended in"""
+    emulator = play_logged(registry, 3)
+    replay = PokemonReplay(emulator.action_log, registry, snapshot_turns=4)
+
+    assert replay.turns == emulator.turn
+    assert encode_state(replay.final()) == encode_state(emulator)
+
+def test_seek_matches_playing_from_the_start(registry):
+    """Test if seeking to a turn from a snapshot gives the same state as replaying every action"""
+    log = play_logged(registry, 5).action_log
+    replay = PokemonReplay(log, registry, snapshot_turns=3)
+    full = PokemonReplay(log, registry, snapshot_turns=1000)
+
+    assert len(replay.snapshots) > 1
+
+    for turn in range(replay.turns + 1):
+        assert encode_state(replay.seek(turn)) == encode_state(full.seek(turn))
+        assert replay.seek(turn).turn == turn
+
+def cards_in_play(emulator):
+    """Returns the definition id and health of every card in both players' decks, hands and boards."""
+    slots = [emulator.slot(player, index) for player in (0, 1) for index in range(4)]
+
+    return ([[card.definition_id for card in emulator.deck(player) + emulator.hand(player)] for player in (0, 1)],
+            [None if card is None else (card.definition_id, card.health) for card in slots])
+
+def test_replay_without_seed_uses_recorded_flips(registry):
+    """Test if a game with an unseeded shuffle and coin is replayed with its recorded decks and flips"""
+    for _ in range(5):
+        emulator = PokemonTCGPocketEmulator(registry)
+        emulator.start_action_log()
+        emulator.play_game([0] * 12 + [2] * 8, [1] * 20)
+
+        replay = PokemonReplay(PokemonActionLog.from_bytes(emulator.action_log.to_bytes()), registry, snapshot_turns=2)
+        final = replay.final()
+
+        assert (final.winner, final.turn, final.points_one, final.points_two) == (emulator.winner, emulator.turn, emulator.points_one, emulator.points_two)
+        assert cards_in_play(final) == cards_in_play(emulator)
+        assert len(replay.snapshots) > 1 or final.turn < 2
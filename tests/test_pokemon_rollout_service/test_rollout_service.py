@@ -0,0 +1,56 @@
+import pytest
+from pokemon_action_index import END_TURN, encode_action
+from pokemon_mcts import PokemonMCTSAgent
+from pokemon_rollout_service import RANDOM, PokemonRolloutService
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@pytest.fixture
+def emulator(registry):
+    """Creates an emulator a few actions into a game."""
+    emulator = PokemonTCGPocketEmulator(registry, 2)
+    emulator.start_game([0] * 10 + [2] * 5, [1] * 15)
+    emulator.apply_action(emulator.legal_actions()[0])
+
+    return emulator
+
+def test_rollouts_count_every_game(emulator, registry):
+    """Test if the stats of a batch count every rollout and are reproducible"""
+    service = PokemonRolloutService(0, registry)
+    other = emulator.clone()
+    other.apply_action(encode_action(END_TURN))
+
+    stats = service.rollouts([emulator, other], count=6, policy=RANDOM, rollout_turns=None, seed=4)
+
+    assert [result.games for result in stats] == [6, 6]
+    assert all(sum(result.wins) + result.draws == 6 for result in stats)
+    assert [result.score for result in service.rollouts([emulator, other], 6, RANDOM, None, 4)] == [result.score for result in stats]
+
+def test_workers_give_the_same_stats(emulator, registry):
+    """Test if rollouts across worker processes give the same stats as in this process"""
+    emulators = [emulator] * 3
+    expected = PokemonRolloutService(0, registry).rollouts(emulators, count=4, seed=9)
+
+    with PokemonRolloutService(2, registry) as service:
+        stats = service.rollouts(emulators, count=4, seed=9)
+
+    assert [(result.wins, result.draws, result.score) for result in stats] == [(result.wins, result.draws, result.score) for result in expected]
+
+def test_root_parallel_search_merges_trees(emulator, registry):
+    """Test if root parallel search spreads the playouts over the trees and picks a legal action"""
+    service = PokemonRolloutService(0, registry)
+    service.workers = 3
+
+    action, merged = service.root_parallel_search(emulator, playouts=20, seed=1, rollout_turns=2)
+
+    assert action in emulator.legal_actions()
+    assert sum(visits for visits, _ in merged.values()) == 20
+
+def test_search_batched_uses_every_playout(emulator, registry):
+    """Test if leaf parallel search backs up a result for every playout"""
+    agent = PokemonMCTSAgent(playouts=12, rollout_turns=2, seed=3)
+
+    root = agent.search_batched(emulator, PokemonRolloutService(0, registry), batch_size=4)
+
+    assert root.total == 12
+    assert sum(root.visits) == 12
+    assert 0.0 <= sum(root.values) <= 12.0
@@ -0,0 +1,70 @@
+import random
+import pytest
+from pokemon_coin import PokemonCoin
+from pokemon_state_codec import FORMAT_VERSION, decode_state, encode_state
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@pytest.fixture
+def emulator(registry):
+    """Creates an emulator partway into a game, with a flipped coin and a status."""
+    emulator = PokemonTCGPocketEmulator(registry, 6)
+    emulator.start_game([0] * 10 + [2] * 10, [1] * 20)
+    actions = random.Random(2)
+
+    for _ in range(15):
+        emulator.apply_action(actions.choice(emulator.legal_actions()))
+
+    emulator.coin.flip_many(3)
+    emulator.coin.flip_coin()
+    emulator.board_two_active.status = "Poisoned"
+
+    return emulator
+
+def state(emulator):
+    """Returns every field a snapshot keeps, for comparison."""
+    return (
+        emulator.deck_one, emulator.deck_two, emulator.hand_one, emulator.hand_two,
+        emulator.board_one_active, emulator.board_one_passive, emulator.board_two_active, emulator.board_two_passive,
+        emulator.points_one, emulator.points_two, emulator.turn, emulator.current_player,
+        emulator.energy_attached, emulator.abilities_used, emulator.finished, emulator.winner, emulator.seed, emulator.coin.state,
+    )
+
+def test_round_trip_keeps_state(emulator, registry):
+    """Test if a decoded state has the same fields and is small"""
+    data = encode_state(emulator)
+    decoded = decode_state(data, registry)
+
+    assert state(decoded) == state(emulator)
+    assert len(data) < 300
+
+def test_round_trip_continues_the_same(emulator, registry):
+    """Test if a decoded game plays on exactly like the original, coin flips included"""
+    decoded = decode_state(encode_state(emulator), registry)
+
+    assert [decoded.coin.flip_coin() for _ in range(20)] == [emulator.coin.flip_coin() for _ in range(20)]
+
+    while not emulator.finished:
+        emulator.play_turn()
+        decoded.play_turn()
+
+    assert state(decoded) == state(emulator)
+
+def test_unseeded_coin_keeps_generator_state(emulator, registry):
+    """Test if a coin without a seed is stored with its generator state"""
+    emulator.coin = PokemonCoin()
+    decoded = decode_state(encode_state(emulator), registry)
+
+    assert decoded.coin.flip_many(64) == emulator.coin.flip_many(64)
+
+def test_rejects_bad_data(emulator, registry):
+    """Test if other data, other versions and cut short data raise ValueError"""
+    data = encode_state(emulator)
+
+    with pytest.raises(ValueError, match="not an encoded"):
+        decode_state(b"JUNK" + data[4:], registry)
+
+    with pytest.raises(ValueError, match="version"):
+        decode_state(data[:4] + bytes([FORMAT_VERSION + 1]) + data[5:], registry)
+
+    with pytest.raises(ValueError, match="cut short"):
+        decode_state(data[:-3], registry)
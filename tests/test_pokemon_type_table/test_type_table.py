@@ -0,0 +1,87 @@
+import pytest
+from pokemon_type_table import PokemonTypeTable
+from pokemon_file_reader import PokemonFileReader
+
+def test_ids_are_dense_and_in_insertion_order():
+    """Test if types get ids 0..n-1 in the order they are added and duplicates keep their id"""
+    table = PokemonTypeTable(["Fire", "Water", "Colorless"])
+
+    assert table.add("Water") == 1
+    assert table.add("Crystal") == 3
+    assert table.names == ["Fire", "Water", "Colorless", "Crystal"]
+    assert table.colorless_id == 2
+
+def test_cost_vector_counts_energies():
+    """Test if a cost vector counts energies by type id"""
+    table = PokemonTypeTable(["Fire", "Water", "Colorless"])
+
+    assert table.cost_vector(["Fire", "Fire", "Colorless"]) == (2, 0, 1)
+    assert table.cost_vector([]) == (0, 0, 0)
+
+def test_can_pay_typed_energy():
+    """Test if typed energy must be paid with the same type"""
+    table = PokemonTypeTable(["Fire", "Water", "Colorless"])
+    cost = table.cost_vector(["Fire", "Fire"])
+
+    assert table.can_pay(cost, (2, 0, 0))
+    assert table.can_pay(cost, (3, 1, 0))
+    assert not table.can_pay(cost, (1, 1, 0))
+    assert not table.can_pay(cost, (0, 4, 0))
+
+def test_can_pay_colorless_with_any_energy():
+    """Test if Colorless energy can be paid with any left over energy"""
+    table = PokemonTypeTable(["Fire", "Water", "Colorless"])
+    cost = table.cost_vector(["Fire", "Colorless", "Colorless"])
+
+    assert table.can_pay(cost, (1, 2, 0))
+    assert table.can_pay(cost, (3, 0, 0))
+    assert not table.can_pay(cost, (1, 1, 0))
+    assert not table.can_pay(cost, (0, 3, 0))
+
+def test_read_move_sets_energy_cost():
+    """Test if read_move stores the energy cost vector using the reader's type ids"""
+    reader = PokemonFileReader()
+    reader.types = {"Fire", "Colorless"}
+    reader.type_table.add("Colorless")
+    reader.type_table.add("Fire")
+
+    move = reader.read_move("Move Name: Flamethrower, Energies: Fire; Fire; Colorless, Damage: 90, Effect Function: None")
+
+    assert move.energy == ("Fire", "Fire", "Colorless")
+    assert move.energy_cost == (1, 2)
+
+def test_cost_vector_rejects_unknown_types():
+    """Test if a cost vector with a type that is not in the table raises and does not add the type"""
+    table = PokemonTypeTable(["Fire", "Colorless"])
+
+    with pytest.raises(ValueError):
+        table.cost_vector(["Fire", "Crystal"])
+
+    assert len(table) == 2
+
+def test_can_pay_compares_at_table_length():
+    """Test if vectors built before a type was added are padded, and typed energy of the new type is checked"""
+    table = PokemonTypeTable(["Fire", "Colorless"])
+    old_cost = table.cost_vector(["Fire"])
+    old_attached = (1, 0)
+    table.add("Crystal")
+    cost = table.cost_vector(["Crystal", "Crystal"])
+
+    assert table.can_pay(old_cost, old_attached)
+    assert table.can_pay(old_cost, (0, 0, 1)) is False
+    assert table.can_pay(cost, (0, 0, 2))
+    assert table.can_pay(cost, (1, 1, 0)) is False
+    assert table.can_pay(cost, old_attached + (0,)) is False
+
+    with pytest.raises(ValueError):
+        table.can_pay(old_cost, (1, 0, 0, 0))
+
+def test_assigned_types_get_ids():
+    """Test if types assigned to the reader get ids in name order before a move is read"""
+    reader = PokemonFileReader()
+    reader.types = {"Water", "Fire", "Colorless"}
+
+    move = reader.read_move("Move Name: Splash, Energies: Water; Colorless, Damage: 10, Effect Function: None")
+
+    assert reader.type_table.names == ["Colorless", "Fire", "Water"]
+    assert move.energy_cost == (1, 0, 1)
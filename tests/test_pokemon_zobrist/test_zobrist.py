@@ -0,0 +1,80 @@
+import random
+import pytest
+from pokemon_packed_state import PokemonPackedState, PokemonStateLayout
+from pokemon_zobrist import PokemonZobristHash
+from tcg_pocket_emulator import PokemonTCGPocketEmulator
+
+@pytest.fixture
+def emulator(registry):
+    """Creates an emulator at the start of a game."""
+    emulator = PokemonTCGPocketEmulator(registry, 3)
+    emulator.start_game([0] * 10 + [2] * 5, [1] * 15)
+
+    return emulator
+
+def test_incremental_hash_matches_full_hash(emulator):
+    """Test if the hash kept up to date by state_changed equals a hash computed from scratch after every action"""
+    actions = random.Random(5)
+
+    for _ in range(200):
+        if emulator.finished:
+            break
+
+        emulator.apply_action(actions.choice(emulator.legal_actions()))
+
+        assert emulator.state_hash() == PokemonZobristHash(emulator).value()
+
+def test_deck_order_does_not_change_hash(emulator):
+    """Test if shuffling a deck keeps the hash, but reordering the hand changes it"""
+    before = emulator.state_hash()
+    emulator.deck_one.reverse()
+
+    assert PokemonZobristHash(emulator).value() == before
+
+    emulator.hand_one.reverse()
+
+    assert PokemonZobristHash(emulator).value() != before
+
+def test_hash_changes_with_energy(emulator):
+    """Test if attaching energy changes the hash"""
+    before = emulator.state_hash()
+    emulator.attach_energy(0, 0, 0)
+
+    assert emulator.state_hash() != before
+
+def test_keys_are_reproducible(emulator):
+    """Test if separate hashes of the same state agree"""
+    assert PokemonZobristHash(emulator).value() == PokemonZobristHash(emulator.clone()).value()
+
+def test_restored_state_hash_matches_full_hash(registry, emulator):
+    """Test if the hash of an emulator a packed state was restored into equals a hash computed from scratch"""
+    other = PokemonTCGPocketEmulator(registry, 4)
+    other.start_game([1] * 15, [0] * 10 + [2] * 5)
+    other.state_hash()
+
+    PokemonPackedState.from_emulator(emulator, PokemonStateLayout(registry.type_count)).to_emulator(other, registry)
+
+    assert other.state_hash() == PokemonZobristHash(other).value()
+    assert other.state_hash() == emulator.state_hash()
+
+def test_started_game_hash_matches_full_hash(registry):
+    """Test if a hash computed before the decks are dealt is brought up to date by start_game"""
+    emulator = PokemonTCGPocketEmulator(registry, 3)
+    emulator.state_hash()
+    emulator.start_game([0] * 10 + [2] * 5, [1] * 15)
+
+    assert emulator.state_hash() == PokemonZobristHash(emulator).value()
+
+def test_draw_only_hashes_the_moved_card(emulator, monkeypatch):
+    """Test if drawing updates the deck and hand hashes by the drawn card, without hashing either group again"""
+    emulator.state_hash()
+    monkeypatch.setattr(PokemonZobristHash, "hash_group", lambda self, group: pytest.fail(f"{group} was hashed again"))
+
+    for _ in range(6):
+        emulator.draw(0)
+        emulator.draw(1)
+        emulator.state_hash()
+
+    monkeypatch.undo()
+
+    assert emulator.state_hash() == PokemonZobristHash(emulator).value()
@@ -0,0 +1,99 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pokemon_card_registry import PokemonCardRegistry
+from tcg_pocket_batch_emulator import PokemonTCGPocketBatchEmulator, WEAKNESS_BONUS
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with an electric card weak to fighting and a fighting card."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    add_card(registry, "Pikachu", "Lightning", 60, 30, ["Lightning"], weakness="Fighting")
+    add_card(registry, "Machop", "Fighting", 70, 20, ["Fighting", "Colorless"])
+    add_card(registry, "Mewtwo ex", "Lightning", 10, 10, ["Lightning"])
+
+    return registry
+
+def test_step_applies_damage_with_weakness(registry, type_table):
+    """Test if one turn deals damage in every game and adds the weakness bonus"""
+    batch = PokemonTCGPocketBatchEmulator(registry, type_table, [([1] * 6, [0] * 6), ([0] * 6, [1] * 6)])
+
+    batch.step()
+    batch.step()
+
+    # Machop needs two energies, so only Pikachu attacks in the first two turns
+    assert batch.health[0].tolist() == [70 - 30, 60]
+    assert batch.health[1].tolist() == [60, 70 - 30]
+
+    batch.step()
+
+    assert batch.health[0].tolist() == [40, 60 - 20 - WEAKNESS_BONUS]
+
+def test_knockouts_award_points_and_promote(registry, type_table):
+    """Test if a knockout awards points, promotes the next card and ends the game at three points"""
+    batch = PokemonTCGPocketBatchEmulator(registry, type_table, [([0] * 6, [2] * 6), ([0] * 6, [1] * 6)])
+
+    batch.step()
+
+    assert batch.points[0].tolist() == [2, 0]
+    assert batch.active[0, 1] == 2
+    assert batch.health[0, 1] == 10
+    assert not batch.finished[0]
+
+    batch.step()
+    batch.step()
+
+    assert batch.finished[0]
+    assert batch.winner[0] == 0
+    assert not batch.finished[1]
+
+def test_finished_games_are_masked(registry, type_table):
+    """Test if a finished game no longer changes while others keep playing"""
+    batch = PokemonTCGPocketBatchEmulator(registry, type_table, [([0] * 6, [2] * 2), ([0] * 6, [1] * 6)])
+
+    batch.step()
+    batch.step()
+    batch.step()
+
+    assert batch.finished[0]
+    snapshot = (batch.health[0].copy(), batch.points[0].copy(), batch.turn[0])
+
+    batch.step()
+
+    assert (batch.health[0].tolist(), batch.points[0].tolist(), batch.turn[0]) == (snapshot[0].tolist(), snapshot[1].tolist(), snapshot[2])
+    assert batch.turn[1] == 4
+
+def test_run_finishes_every_game(registry, type_table):
+    """Test if run plays every game to a result"""
+    batch = PokemonTCGPocketBatchEmulator(registry, type_table, [([0] * 20, [1] * 20)] * 50, max_turns=40)
+
+    winners = batch.run()
+
+    assert batch.finished.all()
+    assert winners.shape == (50,)
+    assert set(winners.tolist()) <= {-1, 0, 1}
+
+def test_identical_pairings_play_out_differently(registry, type_table):
+    """Test if games of the same pairing are shuffled into different outcomes, repeatably for a seed"""
+    deck = [0] * 4 + [1] * 4 + [2] * 4
+    games = [(deck, deck)] * 100
+
+    first = PokemonTCGPocketBatchEmulator(registry, type_table, games, max_turns=40, seed=7)
+    second = PokemonTCGPocketBatchEmulator(registry, type_table, games, max_turns=40, seed=7)
+
+    winners = first.run()
+
+    assert len(set(winners.tolist())) > 1
+    assert len(set(first.turn.tolist())) > 1
+    assert second.run().tolist() == winners.tolist()
+
+def test_decks_of_any_length(registry, type_table):
+    """Test if decks longer than twenty cards and of different lengths are dealt"""
+    batch = PokemonTCGPocketBatchEmulator(registry, type_table, [([0] * 30, [1] * 5)], seed=1)
+
+    assert batch.decks.shape == (1, 2, 30)
+    assert batch.deck_size[0].tolist() == [30, 5]
+    assert (batch.decks[0, 1, 5:] == -1).all()
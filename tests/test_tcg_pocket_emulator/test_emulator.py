@@ -0,0 +1,129 @@
+import random
+import pytest
+from pokemon_card_registry import PokemonCardRegistry
+from tcg_pocket_emulator import PokemonTCGPocketEmulator, OPENING_HAND_SIZE, WEAKNESS_BONUS
+
+@pytest.fixture
+def registry(type_table, add_card):
+    """Creates a registry with a pikachu line weak to fighting, a fighting card and an ex card."""
+
+    registry = PokemonCardRegistry(type_table=type_table)
+
+    add_card(registry, "Pikachu", "Lightning", 60, 30, ["Lightning"], weakness="Fighting")
+    add_card(registry, "Machop", "Fighting", 70, 20, ["Fighting", "Colorless"])
+    add_card(registry, "Mewtwo ex", "Lightning", 10, 10, ["Lightning"])
+    add_card(registry, "Raichu", "Lightning", 120, 60, ["Lightning"], pre_evo="Pikachu", weakness="Fighting")
+
+    return registry
+
+def test_start_game_deals_opening_hands(registry):
+    """Test if each player gets an opening hand and a basic pokemon in the active spot, and player one draws for their turn"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+
+    emulator.start_game([0] * 6 + [3] * 4, [1] * 10)
+
+    assert len(emulator.hand_one) == OPENING_HAND_SIZE
+    assert len(emulator.hand_two) == OPENING_HAND_SIZE - 1
+    assert len(emulator.deck_one) == 10 - OPENING_HAND_SIZE - 1
+    assert registry.get(emulator.board_one_active.definition_id).pre_evo is None
+    assert emulator.board_two_active.definition_id == 1
+
+def test_start_game_without_basic_loses(registry):
+    """Test if a player without a basic pokemon in the opening hand loses"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+
+    emulator.start_game([0] * 5, [3] * 5)
+
+    assert emulator.finished
+    assert emulator.winner == 0
+
+def test_attack_adds_weakness_bonus(registry):
+    """Test if a move deals its damage plus the weakness bonus"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(1)
+    emulator.board_two_active = registry.new_instance(0)
+
+    assert not emulator.attack(0, 0)
+
+    emulator.attach_energy(0, 0, registry.type_table.ids["Fighting"])
+    emulator.attach_energy(0, 0, registry.type_table.ids["Lightning"])
+
+    assert emulator.attack(0, 0)
+    assert emulator.board_two_active.health == 60 - 20 - WEAKNESS_BONUS
+
+def test_evolve_keeps_damage_and_energy(registry):
+    """Test if an evolved pokemon keeps its damage and attached energy"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_one_active.health = 50
+    emulator.attach_energy(0, 0, 0)
+    emulator.hand_one = [registry.new_instance(3)]
+
+    assert not emulator.evolve(0, 0, 0)
+
+    emulator.end_turn()
+
+    assert emulator.evolve(0, 0, 0)
+    assert emulator.board_one_active.definition_id == 3
+    assert emulator.board_one_active.health == 110
+    assert emulator.board_one_active.energy == (1, 0, 0)
+    assert emulator.hand_one == []
+
+def test_knockout_awards_points_and_promotes(registry):
+    """Test if a knockout awards two points for an ex card and promotes from the bench"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(2)
+    emulator.board_one_active.health = 0
+    emulator.board_one_passive[1] = registry.new_instance(0)
+    emulator.current_player = 1
+
+    emulator.resolve_knockouts()
+
+    assert emulator.points_two == 2
+    assert emulator.board_one_active.definition_id == 0
+    assert emulator.board_one_passive == [None, None, None]
+    assert not emulator.finished
+
+def test_knockout_with_empty_bench_loses(registry):
+    """Test if a player whose active pokemon is knocked out with an empty bench loses"""
+    emulator = PokemonTCGPocketEmulator(registry, 1)
+    emulator.board_one_active = registry.new_instance(0)
+    emulator.board_one_active.health = -10
+    emulator.current_player = 1
+
+    emulator.resolve_knockouts()
+
+    assert emulator.finished
+    assert emulator.winner == 1
+
+def test_play_game_is_reproducible(registry):
+    """Test if a game ends and plays out the same with the same seed"""
+    deck_one = [0] * 8 + [3] * 4 + [2] * 2
+    deck_two = [1] * 14
+
+    first = PokemonTCGPocketEmulator(registry, 7)
+    second = PokemonTCGPocketEmulator(registry, 7)
+
+    assert first.play_game(deck_one, deck_two) in (-1, 0, 1)
+    assert second.play_game(deck_one, deck_two) == first.winner
+    assert (first.turn, first.points_one, first.points_two) == (second.turn, second.points_one, second.points_two)
+
+def test_clones_play_out_like_the_original(registry, monkeypatch):
+    """Test if every clone of a game plays out like the game itself, without seeding a generator"""
+    emulator = PokemonTCGPocketEmulator(registry, 4)
+    emulator.start_game([0] * 8 + [3] * 4 + [2] * 2, [1] * 14)
+    monkeypatch.setattr(random.Random, "seed", lambda self, *args, **kwargs: pytest.fail("generator was seeded"))
+
+    clones = [emulator.clone(), emulator.clone()]
+    emulator.coin.flip_coin()
+    clones.append(emulator.clone())
+    monkeypatch.undo()
+
+    for clone in clones[:2]:
+        clone.coin.flip_coin()
+
+    for game in [emulator] + clones:
+        while not game.finished:
+            game.play_turn()
+
+    assert len({(game.turn, game.points_one, game.points_two, game.winner) for game in [emulator] + clones}) == 1
@@ -0,0 +1,103 @@
+import pytest
+import pokemon_file_reader
+from pokemon_card_database import DATABASE_FILE
+from tcg_pocket_tournament import PokemonTournamentResult, game_seed, load_registry, play_single_game, read_decks, run_tournament
+
+DECKS = {
+    "Pikachu": ["Pikachu"] * 10,
+    "Machop": ["Machop"] * 10,
+    "Mixed": ["Pikachu"] * 5 + ["Machop"] * 5,
+}
+
+@pytest.fixture
+def data_directory(tmp_path):
+    """Creates a directory with example card data files."""
+
+    (tmp_path / "pokemon_standard_types.txt").write_text("Lightning\nFighting\nColorless\n")
+    (tmp_path / "pokemon_standard_moves.txt").write_text(
+        "Move Name: Thundershock, Energies: Lightning, Damage: 30, Effect Function: None\n"
+        "Move Name: Low Kick, Energies: Fighting; Colorless, Damage: 40, Effect Function: None\n"
+    )
+    (tmp_path / "pokemon_standard_abilities.txt").write_text("")
+    (tmp_path / "pokemon_standard_cards.txt").write_text(
+        "Card Name: Pikachu, Card Type: Pokemon, Pre Evolution: None, Health: 60, Type: Lightning, Weakness: Fighting, Abilities: None, Moves: Thundershock\n"
+        "Card Name: Machop, Card Type: Pokemon, Pre Evolution: None, Health: 70, Type: Fighting, Weakness: None, Abilities: None, Moves: Low Kick\n"
+    )
+
+    return tmp_path
+
+def test_result_win_rate_and_interval():
+    """Test if win rates count draws as half a win and the interval contains the win rate"""
+    result = PokemonTournamentResult(["A", "B"])
+
+    result.add(0, 1, 6, 3, 1)
+
+    assert result.games[1][0] == 10
+    assert result.win_rate(0, 1) == pytest.approx(0.65)
+    assert result.win_rate(1, 0) == pytest.approx(0.35)
+    assert result.win_rate(0, 0) is None
+
+    low, high = result.confidence_interval(0, 1)
+
+    assert 0 <= low < 0.65 < high <= 1
+    assert result.confidence_interval(0, 0) is None
+
+def test_game_seed_depends_on_game():
+    """Test if game seeds are stable and differ between games"""
+    assert game_seed(0, 0, 1, 0) == game_seed(0, 0, 1, 0)
+    assert game_seed(0, 0, 1, 0) != game_seed(0, 0, 1, 1)
+    assert game_seed(0, 0, 1, 0) != game_seed(1, 0, 1, 0)
+
+def test_read_decks(tmp_path):
+    """Test if decks are read in file order"""
+    path = tmp_path / "decks.txt"
+    path.write_text("Deck Name: Sparks, Cards: Pikachu; Pikachu\n\nDeck Name: Punch, Cards: Machop\n")
+
+    assert read_decks(path) == {"Sparks": ["Pikachu", "Pikachu"], "Punch": ["Machop"]}
+
+def test_read_decks_bad_format(tmp_path):
+    """Test if a malformed deck line raises"""
+    path = tmp_path / "decks.txt"
+    path.write_text("Deck: Sparks, Cards: Pikachu\n")
+
+    with pytest.raises(ValueError):
+        read_decks(path)
+
+def test_registry_is_loaded_from_card_database(data_directory, monkeypatch):
+    """Test if load_registry compiles the card database once and later loads moves from it without parsing the text files"""
+    first = load_registry(data_directory)
+
+    assert (data_directory / DATABASE_FILE).exists()
+
+    monkeypatch.setattr(pokemon_file_reader.PokemonFileReader, "read_all_moves", lambda self: pytest.fail("moves were parsed"))
+    second = load_registry(data_directory)
+
+    assert [definition.name for definition in second.definitions] == [definition.name for definition in first.definitions]
+    assert second.get(second.id_of("Machop")).moves[0].damage == 40
+    assert second.get(second.id_of("Machop")).moves[0].energy_cost == first.get(first.id_of("Machop")).moves[0].energy_cost
+
+def test_in_process_tournament_reproduces_single_games(data_directory):
+    """Test if every pairing is played and any game can be replayed from its seed"""
+    result = run_tournament(DECKS, games=4, seed=3, workers=0, data_directory=data_directory)
+
+    assert result.games == [[0, 4, 4], [4, 0, 4], [4, 4, 0]]
+
+    registry = load_registry(data_directory)
+    outcomes = [play_single_game(registry, DECKS["Pikachu"], DECKS["Machop"], 3, 0, 1, game) for game in range(4)]
+
+    assert result.wins[0][1] == outcomes.count(0)
+    assert result.wins[1][0] == outcomes.count(1)
+    assert result.draws[0][1] == outcomes.count(-1)
+
+def test_process_pool_matches_in_process(data_directory):
+    """Test if the process pool gives the same matrix as playing in process"""
+    expected = run_tournament(DECKS, games=4, seed=5, workers=0, data_directory=data_directory)
+    result = run_tournament(DECKS, games=4, seed=5, workers=2, data_directory=data_directory)
+
+    assert result.wins == expected.wins
+    assert result.draws == expected.draws
+
+def test_unknown_card_raises(data_directory):
+    """Test if a deck with a card that does not exist raises"""
+    with pytest.raises(ValueError):
+        run_tournament({"A": ["Pikachu"], "B": ["Mew"]}, games=1, workers=0, data_directory=data_directory)